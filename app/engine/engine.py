@@ -1,22 +1,53 @@
-import itertools
 import logging
 import random
+from array import array
 from enum import Enum
 
-from app.engine.weapons import Laser
-from app.utils.constants import RED, BLUE
-from app.utils.math import V2
+from app.engine.cache import LRUCache
+from app.engine.events import EventBus
+from app.engine.fleet import Fleet, ShipList
+from app.engine.hashing import mix64
+from app.engine.journal import (
+    Action,
+    ActionType,
+    Attacked,
+    Journal,
+    Moved,
+    Removed,
+    TurnPassed,
+    Won,
+)
+from app.engine.los import LineOfSight
+from app.engine.reachability import (
+    OBSTACLE,
+    BitboardGrid,
+    ReachabilityGrid,
+    ReachMap,
+    bits_to_cells,
+)
+from app.engine.threat import ThreatMap
+from app.engine.visibility import VisibilityMap
+from app.engine.weapons import Laser, Weapon
+from app.level.level import BLOCKING_TILES, TileType
+from app.utils.constants import PLAYER_COLORS
+from app.utils.math import Direction, V2
 from app.engine.player import Player
 from app.engine.ship import Ship
+from app.engine.stencils import reflect
 
 logger = logging.getLogger(__name__)
 
+# first value mixed into the state hash key of the current player
+PLAYER_KEY = 0x504C4159
+
 
 class Event(Enum):
     SHIP_MOVED = 1
     NEXT_TURN = 2
     SHIP_DESTROYED = 3
     GAME_OVER = 4
+    SHIP_ADDED = 5
+    TILE_CHANGED = 6
 
 
 # TODO proper ship types
@@ -24,19 +55,28 @@ def generate_random_ships(
     topleft: V2,
     bottomright: V2,
     limit: int = 1,
+    rng: random.Random | None = None,
+    blocked: set[V2] | None = None,
 ) -> list[Ship]:
-    ships = []
-    for _ in range(limit):
-        ships.append(
-            Ship(
-                position=V2(
-                    random.randint(topleft.x, bottomright.x),
-                    random.randint(topleft.y, bottomright.y),
-                ),
-                weapons=[Laser()],
-            )
+    if topleft.x > bottomright.x or topleft.y > bottomright.y:
+        raise ValueError(f"Invalid zone: {topleft} - {bottomright}")
+    # ships never share a cell, so positions are sampled without replacement
+    width = bottomright.x - topleft.x + 1
+    height = bottomright.y - topleft.y + 1
+    cells = range(width * height)
+    if blocked:
+        cells = [
+            i
+            for i in cells
+            if V2(topleft.x + i % width, topleft.y + i // width) not in blocked
+        ]
+    return [
+        Ship(
+            position=V2(topleft.x + i % width, topleft.y + i // width),
+            weapons=[Laser()],
         )
-    return ships
+        for i in (rng or random).sample(cells, limit)
+    ]
 
 
 class GameEngine:
@@ -45,168 +85,621 @@ class GameEngine:
         width_tiles: int,
         height_tiles: int,
         starting_zones: list[list[tuple[int, int]]],
+        ships_per_player: int = 1,
+        array_fleets: bool = False,
+        seed: int | None = None,
+        ai_players: tuple[int, ...] = (),
+        terrain: list[list[str]] | None = None,
+        teams: list[int] | None = None,
+        bitboards: bool = False,
     ):
+        # everything random in a match comes from this generator, a match
+        # is reproduced from the seed and the actions in the journal
+        if seed is None:
+            seed = random.randrange(2**63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.ships_per_player = ships_per_player
+        self.array_fleets = array_fleets
+
         self.min_point = V2(0, 0)
         self.max_point = V2(width_tiles, height_tiles)
 
         self.width = width_tiles
         self.height = height_tiles
 
-        # Specific implementation: randomized ships, 2 players.
-        # Will be generalized later.
+        # one player per starting zone, with randomized ships
         self.players = [
-            Player("Player 1", RED),
-            Player("Player 2", BLUE),
+            Player(
+                f"Player {i + 1}",
+                PLAYER_COLORS[i % len(PLAYER_COLORS)],
+                is_ai=i in ai_players,
+            )
+            for i in range(len(starting_zones))
         ]
+        if teams is None:
+            teams = list(range(len(self.players)))
+        elif len(teams) != len(self.players):
+            raise ValueError(f"{len(teams)} teams for {len(self.players)} players")
+        self.teams = dict(zip(self.players, teams))
+        # allies include the player itself
+        self._allies = {
+            p: tuple(q for q in self.players if self.teams[q] == self.teams[p])
+            for p in self.players
+        }
+        self._enemies = {
+            p: tuple(q for q in self.players if self.teams[q] != self.teams[p])
+            for p in self.players
+        }
+        # live ships per team and teams with any, kept by add/remove_ship
+        self._team_ships = dict.fromkeys(teams, 0)
+        self._teams_alive = 0
+        # delivered when the owner flushes, usually once per frame
+        self.events = EventBus()
+        # every state change goes through it as a reversible delta
+        self.journal = Journal()
+
         # there should be map-specific places to put ships for each player
         prepared_starting_zones = self.prepare_starting_zones(starting_zones)
         logger.debug(f"Starting zones defined: {prepared_starting_zones}")
-        self.ships = {
-            p: generate_random_ships(
+        # array_fleets stores each fleet as columns, ships become row views
+        fleet_type = Fleet if array_fleets else ShipList
+        self.ships: dict[Player, ShipList | Fleet] = {
+            p: fleet_type() for p in self.players
+        }
+        # cell -> (ship, owner), kept in sync by add_ship/remove_ship/move_ship
+        self._occupancy: dict[V2, tuple[Ship, Player]] = {}
+        # same occupancy as owner slots on a flat grid, used by flood fills
+        self._slots = {p: i + 1 for i, p in enumerate(self.players)}
+        self._allied_slots = {
+            p: tuple(self._slots[q] for q in self._allies[p]) for p in self.players
+        }
+        # bitboards make flood fills and destination queries a few big-int
+        # operations over the whole level, only worth it on small levels
+        grid_type = BitboardGrid if bitboards else ReachabilityGrid
+        self.grid = grid_type(width_tiles, height_tiles)
+        # bumped on every occupancy change, part of the reach cache key
+        self.occupancy_version = 0
+        self.reach_cache: LRUCache[ReachMap] = LRUCache(maxsize=256)
+        # blocking terrain, rows of level tiles
+        self.los = LineOfSight(width_tiles, height_tiles)
+        obstacles = set()
+        for y, row in enumerate(terrain or []):
+            for x, tile in enumerate(row):
+                if TileType(tile) in BLOCKING_TILES:
+                    obstacles.add(V2(x, y))
+                    self.los.set_blocking(V2(x, y), True)
+                    self.grid.occupy(V2(x, y), OBSTACLE)
+        # (path, index of the start cell), an empty path if there is none
+        self.path_cache: LRUCache[tuple[tuple[V2, ...], int]] = LRUCache(maxsize=4096)
+        # damage every owner could deal next turn, synced when read
+        self.threats = ThreatMap(
+            self.grid,
+            lambda: (
+                (s, self._slots[p]) for p, ships in self.ships.items() for s in ships
+            ),
+            {self._slots[p]: slots for p, slots in self._allied_slots.items()},
+        )
+        # what each owner's ships see, synced when read
+        self.visibility = VisibilityMap(width_tiles, height_tiles)
+        # xor of a key per ship and one for the current player, updated by
+        # every low-level state change
+        self._hash = 0
+        # ships that spent moves or attacks since their last turn reset,
+        # the only ones whose keys a reset changes
+        self._spent: dict[Player, dict[int, Ship]] = {p: {} for p in self.players}
+        facings = {
+            p: self._facing_to_center(*zone)
+            for p, zone in prepared_starting_zones.items()
+        }
+        for p in self.players:
+            for ship in generate_random_ships(
                 topleft=prepared_starting_zones[p][0],
                 bottomright=prepared_starting_zones[p][1],
-            )
-            for p in self.players
-        }
+                limit=ships_per_player,
+                rng=self.rng,
+                blocked=obstacles,
+            ):
+                ship.facing = facings[p]
+                self.add_ship(ship, p)
         logger.debug(f"Ships generated: {self.ships}")
 
-        self.players_cycle = itertools.cycle(self.players)
-        self.current_player = next(self.players_cycle)
-
-        self.callbacks = {
-            Event.SHIP_MOVED: [],
-            Event.NEXT_TURN: [],
-            Event.SHIP_DESTROYED: [],
-            Event.GAME_OVER: [],
-        }
+        self.current_player = self.players[0]
+        self._hash ^= self._player_key(self.current_player)
         self.turn = 1
+        self.winner: Player | None = None
         logger.debug("Game engine initialized")
 
     def next_turn(self) -> None:
-        self.turn += 1
-        self.current_player = next(self.players_cycle)
-        self.reset_ships_by_player(self.current_player)
-        for callback in self.callbacks[Event.NEXT_TURN]:
-            callback()
+        # players without ships left are skipped
+        index = self.players.index(self.current_player)
+        for step in range(1, len(self.players) + 1):
+            player = self.players[(index + step) % len(self.players)]
+            if len(self.ships[player]):
+                break
+        saved = tuple(
+            (s, s.active_moves, s.selected_weapon.attacks_left)
+            for s in self._spent[player].values()
+        )
+        self.journal.apply(
+            self,
+            TurnPassed(self.current_player, player, saved),
+            Action(ActionType.END_TURN),
+        )
         logger.debug(f"It is now {self.current_player.name}'s turn")
 
+    def state_hash(self) -> int:
+        """
+        64-bit hash of the current player and the position, hp, moves and
+        attacks left of every ship. Kept up to date in O(1) per change, equal
+        states have equal hashes across processes and machines.
+        """
+        return self._hash
+
+    def compute_state_hash(self) -> int:
+        """Same as state_hash, computed from scratch"""
+        result = self._player_key(self.current_player)
+        for player, ships in self.ships.items():
+            for ship in ships:
+                result ^= self._ship_key(ship, player)
+        return result
+
+    def _player_key(self, player: Player) -> int:
+        return mix64(PLAYER_KEY, self._slots[player])
+
+    def _ship_key(self, ship: Ship, player: Player) -> int:
+        return mix64(
+            self._slots[player],
+            ship.position.x,
+            ship.position.y,
+            ship.current_hp,
+            ship.speed - ship.active_moves,
+            ship.attacks - ship.attacks_left,
+        )
+
+    def _mark_spent(self, ship: Ship, player: Player) -> None:
+        if ship.active_moves != ship.speed or ship.attacks_left != ship.attacks:
+            self._spent[player][id(ship)] = ship
+
+    def apply_action(self, action: Action) -> None:
+        """Plays an action recorded in the journal of another engine"""
+        match action.type:
+            case ActionType.MOVE:
+                ship = self.find_current_player_ship_by_pos(action.a)
+                if ship is not None:
+                    self.move_ship(ship, action.b)
+            case ActionType.ATTACK:
+                ship = self.find_current_player_ship_by_pos(action.a)
+                if ship is not None:
+                    self.try_attack_ship(ship, action.b)
+            case ActionType.END_TURN:
+                self.next_turn()
+
+    def undo(self) -> bool:
+        return self.journal.undo(self)
+
+    def redo(self) -> bool:
+        return self.journal.redo(self)
+
+    def rewind_to_turn(self, turn: int) -> None:
+        self.journal.rewind_to_turn(self, turn)
+
     def prepare_starting_zones(
         self, starting_zones: list[list[tuple[int, int]]]
     ) -> dict[Player, list[V2]]:
-        # only works for 2 players for now
         return {
-            self.players[i]: [
-                V2(starting_zones[i][0][0], starting_zones[i][0][1]),
-                V2(starting_zones[i][1][0], starting_zones[i][1][1]),
-            ]
-            for i in range(2)
+            player: [V2(*topleft), V2(*bottomright)]
+            for player, (topleft, bottomright) in zip(self.players, starting_zones)
         }
 
+    def _facing_to_center(self, topleft: V2, bottomright: V2) -> Direction:
+        """Ships of a zone face the middle of the map"""
+        dx = self.width - 1 - topleft.x - bottomright.x
+        dy = self.height - 1 - topleft.y - bottomright.y
+        if abs(dx) > abs(dy):
+            return Direction.RIGHT if dx > 0 else Direction.LEFT
+        return Direction.DOWN if dy > 0 else Direction.UP
+
+    def is_enemy(self, player: Player, other: Player) -> bool:
+        return self.teams[player] != self.teams[other]
+
+    def get_allies(self, player: Player) -> tuple[Player, ...]:
+        """Players of the team of player, player included"""
+        return self._allies[player]
+
+    def get_enemies(self, player: Player) -> tuple[Player, ...]:
+        return self._enemies[player]
+
+    # Low-level state changes below don't validate anything, they are applied
+    # by journal deltas. Game actions are move_ship, try_attack_ship and
+    # next_turn.
+
+    def add_ship(self, ship: Ship, player: Player, index: int | None = None) -> Ship:
+        """Returns the ship as stored by the engine (a view for array fleets)"""
+        if ship.position in self._occupancy or self.los.is_blocking(ship.position):
+            raise ValueError(f"Cell {ship.position} is already occupied")
+        ship = self.ships[player].add(ship, index)
+        self._occupancy[ship.position] = (ship, player)
+        team = self.teams[player]
+        if self._team_ships[team] == 0:
+            self._teams_alive += 1
+        self._team_ships[team] += 1
+        self._hash ^= self._ship_key(ship, player)
+        self._mark_spent(ship, player)
+        self.grid.occupy(ship.position, self._slots[player])
+        self.occupancy_version += 1
+        self.threats.note_change(ship.position)
+        self.visibility.mark(ship, self._slots[player])
+        self.events.publish(Event.SHIP_ADDED, ship)
+        return ship
+
+    def remove_ship(self, ship: Ship) -> int:
+        """Returns the index the ship had in its fleet"""
+        position = ship.position
+        _, player = self._occupancy.pop(position)
+        team = self.teams[player]
+        self._team_ships[team] -= 1
+        if self._team_ships[team] == 0:
+            self._teams_alive -= 1
+        self._hash ^= self._ship_key(ship, player)
+        self._spent[player].pop(id(ship), None)
+        index = self.ships[player].remove(ship)
+        self.grid.vacate(position)
+        self.occupancy_version += 1
+        self.threats.note_change(position)
+        self.visibility.mark(ship, None)
+        self.events.publish(Event.SHIP_DESTROYED, position)
+        return index
+
+    def place_ship(self, ship: Ship, destination: V2, moves_delta: int) -> None:
+        from_point = ship.position
+        ship_player = self._occupancy.pop(from_point)
+        player = ship_player[1]
+        self._hash ^= self._ship_key(ship, player)
+        ship.position = destination
+        self._occupancy[destination] = ship_player
+        self.grid.vacate(from_point)
+        self.grid.occupy(destination, self._slots[player])
+        self.occupancy_version += 1
+        self.threats.note_change(from_point)
+        self.threats.note_change(destination)
+        self.visibility.mark(ship, self._slots[player])
+        ship.active_moves += moves_delta
+        self._hash ^= self._ship_key(ship, player)
+        self._mark_spent(ship, player)
+        self.events.publish(Event.SHIP_MOVED, from_point, destination)
+
+    def damage_ship(self, ship: Ship, player: Player, damage: int) -> None:
+        self._hash ^= self._ship_key(ship, player)
+        self.ships[player].apply_damage([ship], damage)
+        self._hash ^= self._ship_key(ship, player)
+
+    def spend_attack(self, ship: Ship, weapon: Weapon, attacks: int) -> None:
+        player = self._occupancy[ship.position][1]
+        self._hash ^= self._ship_key(ship, player)
+        weapon.attacks_left -= attacks
+        self._hash ^= self._ship_key(ship, player)
+        self._mark_spent(ship, player)
+
+    def restore_ship_counters(
+        self, ship: Ship, active_moves: int, attacks_left: int
+    ) -> None:
+        player = self._occupancy[ship.position][1]
+        self._hash ^= self._ship_key(ship, player)
+        ship.active_moves = active_moves
+        ship.selected_weapon.attacks_left = attacks_left
+        self._hash ^= self._ship_key(ship, player)
+        self._mark_spent(ship, player)
+
+    def set_turn(self, turn: int, player: Player) -> None:
+        self._hash ^= self._player_key(self.current_player)
+        self._hash ^= self._player_key(player)
+        self.turn = turn
+        self.current_player = player
+        self.events.publish(Event.NEXT_TURN)
+
+    def set_winner(self, player: Player | None) -> None:
+        self.winner = player
+        if player is not None:
+            self.events.publish(Event.GAME_OVER, player)
+
+    def set_tile(self, point: V2, tile: TileType) -> None:
+        """Changes terrain, only on cells without a ship"""
+        if point in self._occupancy:
+            raise ValueError(f"Cell {point} is occupied")
+        blocking = tile in BLOCKING_TILES
+        self.los.set_blocking(point, blocking)
+        if blocking:
+            self.grid.occupy(point, OBSTACLE)
+        else:
+            self.grid.vacate(point)
+        self.occupancy_version += 1
+        self.threats.note_change(point)
+        self.events.publish(Event.TILE_CHANGED, point, tile)
+
+    def get_ship_at(self, position: V2) -> tuple[Ship, Player] | None:
+        return self._occupancy.get(position)
+
     def get_all_ships(self) -> list[Ship]:
         return [x for v in self.ships.values() for x in v]
 
-    def get_all_allied_ships(self) -> list[Ship]:
-        # there might be more than one player in an alliance in the future
+    def get_all_allied_ships(self) -> ShipList | Fleet:
+        # ships the current player commands, allies' ships excluded
         return self.ships[self.current_player]
 
     def get_all_enemy_ships(self) -> list[Ship]:
-        return [i for p, s in self.ships.items() for i in s if p != self.current_player]
+        return [s for p in self._enemies[self.current_player] for s in self.ships[p]]
+
+    def get_all_allied_positions(self) -> list[V2]:
+        return [
+            position
+            for p in self._allies[self.current_player]
+            for position in self.ships[p].positions()
+        ]
+
+    def get_all_enemy_positions(self) -> list[V2]:
+        return [
+            position
+            for p in self._enemies[self.current_player]
+            for position in self.ships[p].positions()
+        ]
+
+    def is_visible(self, player: Player, point: V2) -> bool:
+        """Whether a ship of player or of an ally sees the cell"""
+        return any(
+            self.visibility.is_visible(slot, point)
+            for slot in self._allied_slots[player]
+        )
+
+    def get_visible_enemy_positions(self, player: Player) -> list[V2]:
+        layers = [self.visibility.layer(s) for s in self._allied_slots[player]]
+        width = self.width
+        return [
+            position
+            for p in self._enemies[player]
+            for position in self.ships[p].positions()
+            if any(layer[position.y * width + position.x] for layer in layers)
+        ]
 
     def get_player_by_ship(self, ship: Ship) -> Player | None:
-        for player, ships in self.ships.items():
-            if ship in ships:
-                return player
-        return None
+        ship_player = self.get_ship_at(ship.position)
+        if ship_player is None or ship_player[0] is not ship:
+            return None
+        return ship_player[1]
 
     def find_current_player_ship_by_pos(self, position: V2) -> Ship | None:
-        for s in self.ships[self.current_player]:
-            if s.position == position:
-                logger.debug(f"Found ship at {s.position}")
-                return s
+        ship_player = self.get_ship_at(position)
+        if ship_player is not None and ship_player[1] == self.current_player:
+            logger.debug(f"Found ship at {position}")
+            return ship_player[0]
         logger.debug(f"No ship found at {position}")
         return None
 
     def find_enemy_ship_by_pos(self, position: V2) -> tuple[Ship, Player] | None:
-        for player in self.players:
-            if player == self.current_player:
-                continue
-            for s in self.ships[player]:
-                if s.position == position:
-                    logger.debug(f"Found enemy ship at {s.position}")
-                    return s, player
+        ship_player = self.get_ship_at(position)
+        if ship_player is not None and self.is_enemy(
+            ship_player[1], self.current_player
+        ):
+            logger.debug(f"Found enemy ship at {position}")
+            return ship_player
         logger.debug(f"No enemy ship found at {position}")
         return None
 
     def is_enemy_ship(self, position: V2) -> bool:
         return self.find_enemy_ship_by_pos(position) is not None
 
-    def __bfs(self, position: V2, depth: int) -> list[V2]:
-        destinations = [position]
-        queue = [position]
-
-        while queue:
-            current = queue.pop(0)
-            for neighbor in current.get_neighbors():
-                if (
-                    neighbor not in destinations
-                    and neighbor.in_range(self.min_point, self.max_point)
-                    and neighbor.distance(position) <= depth
-                ):
-                    destinations.append(neighbor)
-                    queue.append(neighbor)
-        logger.debug("BFS successful")
-        return destinations
+    def find_reach_by_ship(self, ship: Ship) -> ReachMap | None:
+        player = self.get_player_by_ship(ship)
+        if player is None:
+            return None
+        key = (
+            "move",
+            id(ship),
+            ship.position,
+            ship.active_moves,
+            self.occupancy_version,
+        )
+        # enemy ships block the way, allied ones can be passed through
+        return self.reach_cache.get_or_compute(
+            key,
+            lambda: self.grid.flood(
+                ship.position,
+                ship.active_moves,
+                friendly_slots=self._allied_slots[player],
+            ),
+        )
 
     def find_all_destinations_by_ship(self, ship: Ship) -> list[V2]:
-        if ship not in self.get_all_ships():
+        reach = self.find_reach_by_ship(ship)
+        if reach is None:
             return []
-        all_dest = self.__bfs(ship.position, ship.active_moves)
-        players_to_exclude = [
-            p for p in self.ships.keys() if p != self.get_player_by_ship(ship)
-        ]
-        for player in players_to_exclude:
-            for s in self.ships[player]:
-                if s.position in all_dest:
-                    all_dest.remove(s.position)
-
-        return all_dest
+        # a ship can't end its move on an occupied cell, except its own
+        return self.grid.free_cells(reach, ship.position)
+
+    def find_firing_cells_by_ship(
+        self, ship: Ship, targets: list[Ship]
+    ) -> dict[V2, Ship]:
+        """
+        Destinations of ship from which its selected weapon covers one of
+        targets, each with the weakest one. Line of sight is not checked.
+        """
+        # cells the weapon covers a target from are the target's cells
+        # covered by the reflected stencil
+        stencil = reflect(ship.selected_weapon.stencil(ship.facing))
+        weakest_first = sorted(targets, key=lambda t: t.current_hp)
+        firing: dict[V2, Ship] = {}
+        reach = self.find_reach_by_ship(ship) if ship.active_moves > 0 else None
+        grid = self.grid
+        if isinstance(grid, BitboardGrid):
+            if reach is None:
+                free = grid.cells_to_bits([ship.position])
+            else:
+                free = grid.free_bits(reach, ship.position)
+            for target in weakest_first:
+                hit = free & grid.range_bits(target.position, stencil)
+                if hit:
+                    free ^= hit
+                    for cell in bits_to_cells(hit, grid.stride):
+                        firing[cell] = target
+            return firing
+        if reach is None:
+            free = {ship.position}
+        else:
+            free = set(grid.free_cells(reach, ship.position))
+        for target in weakest_first:
+            x, y = target.position
+            for dx, dy in stencil:
+                cell = V2.interned(x + dx, y + dy)
+                if cell in free:
+                    free.discard(cell)
+                    firing[cell] = target
+        return firing
 
     def find_attack_range_by_ship(self, ship: Ship) -> list[V2]:
-        if ship not in self.get_all_ships():
+        if self.get_player_by_ship(ship) is None:
             return []
-        return self.__bfs(ship.position, ship.selected_weapon.range)
+        x, y = ship.position
+        weapon = ship.selected_weapon
+        stencil = weapon.stencil(ship.facing)
+        # both frozensets, the intersection is a single C-level operation
+        visible = self.los.visible_offsets(ship.position, weapon.range)
+        if visible is not None:
+            stencil = stencil & visible
+        return [
+            V2.interned(x + dx, y + dy)
+            for dx, dy in stencil
+            if 0 <= x + dx < self.width and 0 <= y + dy < self.height
+        ]
+
+    def find_targets_by_player(self, player: Player) -> list[tuple[Ship, list[Ship]]]:
+        """
+        Every ship of player that still has attacks left, paired with the
+        enemy ships its selected weapon can hit right now.
+        """
+        enemies = [
+            (s.position.x, s.position.y, s)
+            for p in self._enemies[player]
+            for s in self.ships[p]
+        ]
+        occupancy = self._occupancy
+        result = []
+        for ship in self.ships[player]:
+            if ship.attacks_left == 0:
+                continue
+            x, y = ship.position.x, ship.position.y
+            stencil = ship.selected_weapon.stencil(ship.facing)
+            # walk whichever is smaller: the stencil or the enemy fleet
+            if len(stencil) < len(enemies):
+                targets = []
+                for dx, dy in stencil:
+                    target = occupancy.get((x + dx, y + dy))
+                    if target is not None and self.is_enemy(target[1], player):
+                        targets.append(target[0])
+            else:
+                targets = [s for ex, ey, s in enemies if (ex - x, ey - y) in stencil]
+            if self.los.obstacles:
+                targets = [
+                    t for t in targets if self.los.is_visible(ship.position, t.position)
+                ]
+            result.append((ship, targets))
+        return result
+
+    def get_threat_map(self, player: Player) -> array:
+        """
+        Damage the enemies of player could deal to each cell (y * width + x)
+        during their next turn
+        """
+        layers = [self.threats.layer(self._slots[p]) for p in self._enemies[player]]
+        if len(layers) == 1:
+            return layers[0]
+        return array("i", map(sum, zip(*layers)))
+
+    def get_threat_at(self, player: Player, point: V2) -> int:
+        return self.get_threat_map(player)[point.y * self.width + point.x]
 
     def is_ship_move_possible(self, ship: Ship, destination: V2) -> bool:
-        destinations = self.find_all_destinations_by_ship(ship)
-        if (
-            destination in destinations
-            and ship.position.distance(destination) <= ship.active_moves
-        ):
-            return True
-        return False
+        return self.get_move_cost(ship, destination) is not None
+
+    def get_move_cost(self, ship: Ship, destination: V2) -> int | None:
+        if destination != ship.position and destination in self._occupancy:
+            return None
+        reach = self.find_reach_by_ship(ship)
+        if reach is None:
+            return None
+        return reach.distance(destination)
+
+    def find_path(self, ship: Ship, destination: V2) -> list[V2] | None:
+        """
+        Cells the ship goes through to reach destination, its own cell
+        first. Enemy ships are avoided, the moves left are not checked:
+        a ship needs len(path) - 1 moves. None if there is no way.
+        """
+        player = self.get_player_by_ship(ship)
+        if player is None:
+            return None
+        if destination != ship.position and destination in self._occupancy:
+            return None
+        slot = self._slots[player]
+        version = self.occupancy_version
+
+        def compute() -> tuple[tuple[V2, ...], int]:
+            path = self.grid.find_path(
+                ship.position, destination, friendly_slots=self._allied_slots[player]
+            )
+            if path is None:
+                return (), 0
+            path = tuple(path)
+            # the rest of a shortest path is a shortest path too, ships
+            # further along the same corridor find theirs in the cache
+            for i in range(1, len(path) - 1):
+                key = ("path", path[i], destination, slot, version)
+                self.path_cache.put(key, (path, i))
+            return path, 0
+
+        path, start = self.path_cache.get_or_compute(
+            ("path", ship.position, destination, slot, version), compute
+        )
+        return list(path[start:]) if path else None
 
     def move_ship(self, ship: Ship, destination: V2) -> None:
+        if self.get_player_by_ship(ship) != self.current_player:
+            logger.debug("Ship doesn't belong to the current player")
+            return
         from_point = ship.position
-        if not self.is_ship_move_possible(ship, destination):
+        cost = self.get_move_cost(ship, destination)
+        if cost is None:
             return
-        ship.position = destination
-        ship.active_moves -= from_point.distance(destination)
-        for callback in self.callbacks[Event.SHIP_MOVED]:
-            callback(from_point, destination)
+        # detours around enemy ships cost more than the straight distance
+        self.journal.apply(
+            self,
+            Moved(ship, from_point, destination, cost),
+            Action(ActionType.MOVE, from_point, destination),
+        )
         logger.debug(
-            f"Ship moved from {from_point} to {destination}, active moves reduced to {ship.active_moves}, callbacks called"
+            f"Ship moved from {from_point} to {destination}, active moves reduced to {ship.active_moves}"
         )
 
     def reset_ships_by_player(self, player: Player) -> None:
-        for s in self.ships[player]:
-            s.active_moves = s.speed
-            s.selected_weapon.attacks_left = s.selected_weapon.attacks
-
-    def subscribe(self, event: Event, callback: callable) -> None:
-        self.callbacks[event].append(callback)
-        logger.debug(f"Subscribed to {event}: {callback.__name__}")
+        spent = self._spent[player]
+        for ship in spent.values():
+            self._hash ^= self._ship_key(ship, player)
+        self.ships[player].reset_turn()
+        for ship in spent.values():
+            self._hash ^= self._ship_key(ship, player)
+        spent.clear()
+
+    def subscribe(
+        self, event: Event, callback: callable, coalesce: bool = False
+    ) -> None:
+        self.events.subscribe(event, callback, coalesce)
+
+    def unsubscribe(self, event: Event, callback: callable) -> None:
+        self.events.unsubscribe(event, callback)
 
     def try_attack_ship(self, attacker: Ship, position: V2) -> None:
+        if self.get_player_by_ship(attacker) != self.current_player:
+            logger.debug("Attacker doesn't belong to the current player")
+            return
         ship_player = self.find_enemy_ship_by_pos(position)
         if not ship_player:
             return
@@ -214,31 +707,40 @@ class GameEngine:
         if attacker.attacks_left == 0:
             logger.debug("No attacks left")
             return
-        if position.distance(attacker.position) > attacker.selected_weapon.range:
+        if not attacker.selected_weapon.covers(
+            attacker.facing,
+            position.x - attacker.position.x,
+            position.y - attacker.position.y,
+        ):
             logger.debug("Attack range exceeded")
             return
-        ship.current_hp -= attacker.selected_weapon.damage
-        attacker.selected_weapon.attacks_left -= 1
-        logger.debug(
-            f"Ship attacked at {position}, damage dealt: {attacker.selected_weapon.damage}, current hp: {ship.current_hp}"
-        )
-        logger.debug(f"Attacks left for attacker ship: {attacker.attacks_left}")
-        if ship.current_hp <= 0:
-            self.ships[player].remove(ship)
-            if self.is_game_over():
-                return
-            for callback in self.callbacks[Event.SHIP_DESTROYED]:
-                callback(position)
-            logger.debug(f"Ship destroyed at {position}")
+        if not self.los.is_visible(attacker.position, position):
+            logger.debug("No line of sight")
+            return
+        damage = attacker.selected_weapon.damage
+        action = Action(ActionType.ATTACK, attacker.position, position)
+        with self.journal.command(self, action):
+            self.journal.apply(
+                self,
+                Attacked(attacker, attacker.selected_weapon, ship, player, damage),
+            )
+            logger.debug(
+                f"Ship attacked at {position}, damage dealt: {damage}, current hp: {ship.current_hp}"
+            )
+            logger.debug(f"Attacks left for attacker ship: {attacker.attacks_left}")
+            if ship.current_hp <= 0:
+                index = self.ships[player].index(ship)
+                self.journal.apply(self, Removed(ship, player, index))
+                logger.debug(f"Ship destroyed at {position}")
+                self.is_game_over()
 
     def is_game_over(self) -> bool:
-        all_ships_count = 0
-        for p, ships in self.ships.items():
-            if p != self.current_player:
-                all_ships_count += len(ships)
-        if all_ships_count == 0 and len(self.ships[self.current_player]) > 0:
-            for callback in self.callbacks[Event.GAME_OVER]:
-                callback(self.current_player)
+        if self.winner is not None:
+            return True
+        # ships per team are counted as they come and go, nothing to recount
+        team = self.teams[self.current_player]
+        if self._teams_alive == 1 and self._team_ships[team] > 0:
+            self.journal.apply(self, Won(self.current_player))
             logger.debug(f"Game over, {self.current_player.name} wins")
             return True
         return False
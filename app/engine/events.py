@@ -0,0 +1,122 @@
+import logging
+import time
+import weakref
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import MethodType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HandlerStats:
+    calls: int = 0
+    total_time: float = 0.0  # seconds
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class Subscription:
+    """Weak reference to a handler, so subscribing never keeps a scene alive"""
+
+    def __init__(self, callback: Callable, coalesce: bool):
+        if isinstance(callback, MethodType):
+            self._ref = weakref.WeakMethod(callback)
+        else:
+            self._ref = weakref.ref(callback)
+        self.coalesce = coalesce
+        self.name = getattr(callback, "__qualname__", repr(callback))
+
+    @property
+    def callback(self) -> Callable | None:
+        return self._ref()
+
+
+class EventBus:
+    """
+    Publish/subscribe hub with deferred delivery.
+    When deferred, published events are queued until flush(), which the
+    owner calls once per frame. Coalescing handlers are called at most once
+    per flush, whatever events triggered them, with the arguments of the
+    last occurrence.
+    """
+
+    def __init__(self, deferred: bool = True):
+        self.deferred = deferred
+        self._subscriptions: dict[Hashable, list[Subscription]] = {}
+        self._queue: list[tuple[Hashable, tuple]] = []
+        self.stats: dict[str, HandlerStats] = {}
+        self._suspended = 0
+
+    def subscribe(
+        self, event: Hashable, callback: Callable, coalesce: bool = False
+    ) -> None:
+        self._subscriptions.setdefault(event, []).append(
+            Subscription(callback, coalesce)
+        )
+        logger.debug(f"Subscribed to {event}: {callback.__name__}")
+
+    def unsubscribe(self, event: Hashable, callback: Callable) -> None:
+        self._subscriptions[event] = [
+            s for s in self._subscriptions.get(event, []) if s.callback != callback
+        ]
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """Drops events published inside, for changes reverted before they end"""
+        self._suspended += 1
+        try:
+            yield
+        finally:
+            self._suspended -= 1
+
+    def publish(self, event: Hashable, *args) -> None:
+        if self._suspended or not self._subscriptions.get(event):
+            return
+        if self.deferred:
+            self._queue.append((event, args))
+        else:
+            self._deliver([(event, args)])
+
+    def flush(self) -> None:
+        # handlers may publish again, those events go to the next flush
+        queue, self._queue = self._queue, []
+        if queue:
+            self._deliver(queue)
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def _deliver(self, queue: list[tuple[Hashable, tuple]]) -> None:
+        coalesced: dict[Callable, tuple[Subscription, tuple]] = {}
+        for event, args in queue:
+            for subscription in self._live(event):
+                if subscription.coalesce:
+                    # one call per handler even if it listens to several events
+                    coalesced[subscription.callback] = (subscription, args)
+                else:
+                    self._call(subscription, args)
+        for subscription, args in coalesced.values():
+            self._call(subscription, args)
+
+    def _live(self, event: Hashable) -> list[Subscription]:
+        subscriptions = self._subscriptions.get(event, [])
+        live = [s for s in subscriptions if s.callback is not None]
+        if len(live) != len(subscriptions):
+            self._subscriptions[event] = live
+        return live
+
+    def _call(self, subscription: Subscription, args: tuple) -> None:
+        callback = subscription.callback
+        if callback is None:
+            return
+        started = time.perf_counter()
+        callback(*args)
+        stats = self.stats.get(subscription.name)
+        if stats is None:
+            stats = self.stats[subscription.name] = HandlerStats()
+        stats.calls += 1
+        stats.total_time += time.perf_counter() - started
@@ -0,0 +1,243 @@
+from array import array
+from collections.abc import Iterable, Iterator
+
+from app.engine.ship import Ship
+from app.engine.weapons import Weapon
+from app.utils.math import Direction, V2
+
+# per-ship columns of a Fleet; weapon stats are those of the selected weapon
+COLUMNS = (
+    "x",
+    "y",
+    "hp",
+    "current_hp",
+    "speed",
+    "active_moves",
+    "damage",
+    "range",
+    "attacks",
+    "attacks_left",
+)
+
+
+class ShipList(list[Ship]):
+    """Default fleet storage: a list of Ship objects"""
+
+    def add(self, ship: Ship, index: int | None = None) -> Ship:
+        if index is None:
+            self.append(ship)
+        else:
+            self.insert(index, ship)
+        return ship
+
+    def index(self, ship: Ship) -> int:
+        # by identity, two ships may compare equal
+        for i, s in enumerate(self):
+            if s is ship:
+                return i
+        raise ValueError(f"{ship} is not in the fleet")
+
+    def remove(self, ship: Ship) -> int:
+        """Returns the index the ship had"""
+        index = self.index(ship)
+        del self[index]
+        return index
+
+    def reset_turn(self) -> None:
+        for s in self:
+            s.active_moves = s.speed
+            s.selected_weapon.attacks_left = s.selected_weapon.attacks
+
+    def positions(self) -> list[V2]:
+        return [s.position for s in self]
+
+    def apply_damage(self, ships: Iterable[Ship], damage: int) -> list[Ship]:
+        """Returns the ships destroyed by the damage"""
+        destroyed = []
+        for s in ships:
+            s.current_hp -= damage
+            if s.current_hp <= 0:
+                destroyed.append(s)
+        return destroyed
+
+
+class Fleet:
+    """
+    Struct-of-arrays fleet storage: one array column per ship stat.
+    Ships are FleetShip views onto a row, so turn resets and position
+    extraction run over whole columns at once.
+    Rows are kept dense and in insertion order, like ShipList.
+    """
+
+    def __init__(self):
+        for name in COLUMNS:
+            setattr(self, name, array("i"))
+        self._ships: list[FleetShip] = []
+
+    def __len__(self) -> int:
+        return len(self._ships)
+
+    def __iter__(self) -> Iterator["FleetShip"]:
+        return iter(self._ships)
+
+    def __getitem__(self, index: int) -> "FleetShip":
+        return self._ships[index]
+
+    def __contains__(self, ship: object) -> bool:
+        return isinstance(ship, FleetShip) and ship.fleet is self
+
+    def __repr__(self) -> str:
+        return f"Fleet({self._ships})"
+
+    def _append_row(self, ship: "FleetShip", values: Iterable[int]) -> None:
+        for name, value in zip(COLUMNS, values):
+            getattr(self, name).append(value)
+        ship.fleet = self
+        ship.row = len(self._ships)
+        self._ships.append(ship)
+
+    def add(self, ship: Ship, index: int | None = None) -> "FleetShip":
+        """
+        Copies ship into a new row at index (at the end by default),
+        the returned view replaces it. A view removed earlier is attached
+        back as is.
+        """
+        if index is None:
+            index = len(self._ships)
+        if isinstance(ship, FleetShip):
+            if ship in self:
+                raise ValueError(f"{ship} is already in the fleet")
+            view = ship
+            values = [getattr(ship.fleet, name)[ship.row] for name in COLUMNS]
+        else:
+            weapon = ship.selected_weapon
+            view = FleetShip(ship.weapons, weapon, ship.facing, ship.sensor_range)
+            values = (
+                ship.position.x,
+                ship.position.y,
+                ship.hp,
+                ship.current_hp,
+                ship.speed,
+                ship.active_moves,
+                weapon.damage,
+                weapon.range,
+                weapon.attacks,
+                weapon.attacks_left,
+            )
+        for name, value in zip(COLUMNS, values):
+            getattr(self, name).insert(index, value)
+        view.fleet = self
+        self._ships.insert(index, view)
+        self._renumber(index)
+        return view
+
+    def index(self, ship: "FleetShip") -> int:
+        if ship not in self:
+            raise ValueError(f"{ship} is not in the fleet")
+        return ship.row
+
+    def remove(self, ship: "FleetShip") -> int:
+        """Returns the row the ship had"""
+        row = self.index(ship)
+        values = [getattr(self, name)[row] for name in COLUMNS]
+        for name in COLUMNS:
+            del getattr(self, name)[row]
+        del self._ships[row]
+        self._renumber(row)
+        # the removed view keeps its last state in a fleet of its own
+        detached = Fleet()
+        for name, value in zip(COLUMNS, values):
+            getattr(detached, name).append(value)
+        ship.fleet = detached
+        ship.row = 0
+        detached._ships.append(ship)
+        return row
+
+    def _renumber(self, start: int) -> None:
+        for i in range(start, len(self._ships)):
+            self._ships[i].row = i
+
+    def reset_turn(self) -> None:
+        self.active_moves[:] = self.speed
+        self.attacks_left[:] = self.attacks
+
+    def positions(self) -> list[V2]:
+        return V2.from_arrays(self.x, self.y)
+
+    def apply_damage(
+        self, ships: Iterable["FleetShip"], damage: int
+    ) -> list["FleetShip"]:
+        """Returns the ships destroyed by the damage"""
+        current_hp = self.current_hp
+        destroyed = []
+        for s in ships:
+            current_hp[s.row] -= damage
+            if current_hp[s.row] <= 0:
+                destroyed.append(s)
+        return destroyed
+
+
+def _column(name: str, owner: str = "") -> property:
+    def get(self):
+        ship = getattr(self, owner) if owner else self
+        return getattr(ship.fleet, name)[ship.row]
+
+    def set(self, value):
+        ship = getattr(self, owner) if owner else self
+        getattr(ship.fleet, name)[ship.row] = value
+
+    return property(get, set)
+
+
+class FleetWeapon(Weapon):
+    """Selected weapon of a FleetShip, its stats live in the fleet columns"""
+
+    damage = _column("damage", "ship")
+    range = _column("range", "ship")
+    attacks = _column("attacks", "ship")
+    attacks_left = _column("attacks_left", "ship")
+
+    def __init__(self, ship: "FleetShip", weapon: Weapon):
+        self.ship = ship
+        self.source = weapon
+        self.ammo = weapon.ammo
+        self.ammo_left = weapon.ammo_left
+        self.shape = weapon.shape
+        self.min_range = weapon.min_range
+
+    @property
+    def name(self) -> str:
+        return self.source.name
+
+
+class FleetShip(Ship):
+    """View onto one row of a Fleet, behaves like a Ship"""
+
+    fleet: Fleet
+    row: int
+
+    hp = _column("hp")
+    current_hp = _column("current_hp")
+    speed = _column("speed")
+    active_moves = _column("active_moves")
+
+    def __init__(
+        self,
+        weapons: list[Weapon],
+        selected: Weapon,
+        facing: Direction,
+        sensor_range: int,
+    ):
+        self.facing = facing
+        self.sensor_range = sensor_range
+        self.selected_weapon = FleetWeapon(self, selected)
+        self.weapons = [self.selected_weapon if w is selected else w for w in weapons]
+
+    @property
+    def position(self) -> V2:
+        return V2(self.fleet.x[self.row], self.fleet.y[self.row])
+
+    @position.setter
+    def position(self, value: V2) -> None:
+        self.fleet.x[self.row] = value.x
+        self.fleet.y[self.row] = value.y
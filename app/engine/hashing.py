@@ -0,0 +1,16 @@
+MASK = 2**64 - 1
+GOLDEN = 0x9E3779B97F4A7C15
+
+
+def mix64(*values: int) -> int:
+    """
+    64-bit hash of a few integers, chained splitmix64 rounds.
+    Unlike hash(), it is the same in every process and on every machine.
+    """
+    h = 0
+    for value in values:
+        h = (h ^ (value & MASK)) + GOLDEN & MASK
+        h = (h ^ (h >> 30)) * 0xBF58476D1CE4E5B9 & MASK
+        h = (h ^ (h >> 27)) * 0x94D049BB133111EB & MASK
+        h ^= h >> 31
+    return h
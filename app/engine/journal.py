@@ -0,0 +1,219 @@
+import logging
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Protocol
+
+from app.engine.player import Player
+from app.engine.ship import Ship
+from app.engine.weapons import Weapon
+from app.utils.math import V2
+
+if TYPE_CHECKING:
+    from app.engine.engine import GameEngine
+
+logger = logging.getLogger(__name__)
+
+
+class ActionType(IntEnum):
+    MOVE = 1  # a: ship position, b: destination
+    ATTACK = 2  # a: attacker position, b: target position
+    END_TURN = 3
+
+
+class Action(NamedTuple):
+    """Player input that produced an entry, enough to play it again"""
+
+    type: ActionType
+    a: V2 = V2(0, 0)
+    b: V2 = V2(0, 0)
+
+
+class Delta(Protocol):
+    """Smallest reversible change of the engine state"""
+
+    def apply(self, engine: "GameEngine") -> None: ...
+
+    def revert(self, engine: "GameEngine") -> None: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Moved:
+    ship: Ship
+    from_point: V2
+    to_point: V2
+    cost: int
+
+    def apply(self, engine: "GameEngine") -> None:
+        engine.place_ship(self.ship, self.to_point, -self.cost)
+
+    def revert(self, engine: "GameEngine") -> None:
+        engine.place_ship(self.ship, self.from_point, self.cost)
+
+
+@dataclass(frozen=True, slots=True)
+class Attacked:
+    attacker: Ship
+    weapon: Weapon
+    target: Ship
+    target_player: Player
+    damage: int
+
+    def apply(self, engine: "GameEngine") -> None:
+        engine.spend_attack(self.attacker, self.weapon, 1)
+        engine.damage_ship(self.target, self.target_player, self.damage)
+
+    def revert(self, engine: "GameEngine") -> None:
+        engine.damage_ship(self.target, self.target_player, -self.damage)
+        engine.spend_attack(self.attacker, self.weapon, -1)
+
+
+@dataclass(frozen=True, slots=True)
+class Removed:
+    ship: Ship
+    player: Player
+    index: int
+
+    def apply(self, engine: "GameEngine") -> None:
+        engine.remove_ship(self.ship)
+
+    def revert(self, engine: "GameEngine") -> None:
+        engine.add_ship(self.ship, self.player, self.index)
+
+
+@dataclass(frozen=True, slots=True)
+class Won:
+    player: Player
+
+    def apply(self, engine: "GameEngine") -> None:
+        engine.set_winner(self.player)
+
+    def revert(self, engine: "GameEngine") -> None:
+        engine.set_winner(None)
+
+
+@dataclass(frozen=True, slots=True)
+class TurnPassed:
+    player_before: Player
+    player_after: Player
+    # (ship, active_moves, attacks_left) before the reset, for the ships of
+    # player_after that had spent any
+    saved: tuple[tuple[Ship, int, int], ...]
+
+    def apply(self, engine: "GameEngine") -> None:
+        engine.set_turn(engine.turn + 1, self.player_after)
+        engine.reset_ships_by_player(self.player_after)
+
+    def revert(self, engine: "GameEngine") -> None:
+        for ship, active_moves, attacks_left in self.saved:
+            engine.restore_ship_counters(ship, active_moves, attacks_left)
+        engine.set_turn(engine.turn - 1, self.player_before)
+
+
+@dataclass(frozen=True, slots=True)
+class Entry:
+    """Deltas of one player action, undone and redone as a unit"""
+
+    turn: int
+    action: Action | None
+    deltas: tuple[Delta, ...]
+
+
+class Journal:
+    """
+    History of engine actions as lists of deltas.
+    Undo and redo replay one entry; a new action after an undo discards
+    the entries that could have been redone.
+    """
+
+    def __init__(self):
+        self._entries: list[Entry] = []
+        # turn of every entry, nondecreasing, for bisecting in rewind_to_turn
+        self._turns: list[int] = []
+        self._cursor = 0
+        self._open: list[Delta] | None = None
+
+    def __len__(self) -> int:
+        return self._cursor
+
+    @contextmanager
+    def command(
+        self, engine: "GameEngine", action: Action | None = None
+    ) -> Iterator[None]:
+        """Groups every delta applied inside into a single entry"""
+        if self._open is not None:
+            yield
+            return
+        self._open = []
+        turn = engine.turn
+        try:
+            yield
+        finally:
+            deltas, self._open = self._open, None
+            if deltas:
+                self._record(Entry(turn, action, tuple(deltas)))
+
+    def apply(
+        self, engine: "GameEngine", delta: Delta, action: Action | None = None
+    ) -> None:
+        if self._open is None:
+            with self.command(engine, action):
+                self.apply(engine, delta)
+            return
+        delta.apply(engine)
+        self._open.append(delta)
+
+    def _record(self, entry: Entry) -> None:
+        del self._entries[self._cursor :]
+        del self._turns[self._cursor :]
+        self._entries.append(entry)
+        self._turns.append(entry.turn)
+        self._cursor += 1
+
+    def actions(self) -> list[Action]:
+        """Actions of the current history, undone ones excluded"""
+        return [e.action for e in self._entries[: self._cursor] if e.action is not None]
+
+    def can_undo(self) -> bool:
+        return self._cursor > 0
+
+    def can_redo(self) -> bool:
+        return self._cursor < len(self._entries)
+
+    def undo_turn(self) -> int | None:
+        """Turn of the entry the next undo would revert"""
+        return self._turns[self._cursor - 1] if self.can_undo() else None
+
+    def redo_turn(self) -> int | None:
+        """Turn of the entry the next redo would replay"""
+        return self._turns[self._cursor] if self.can_redo() else None
+
+    def undo(self, engine: "GameEngine") -> bool:
+        if not self.can_undo():
+            return False
+        self._cursor -= 1
+        for delta in reversed(self._entries[self._cursor].deltas):
+            delta.revert(engine)
+        return True
+
+    def redo(self, engine: "GameEngine") -> bool:
+        if not self.can_redo():
+            return False
+        for delta in self._entries[self._cursor].deltas:
+            delta.apply(engine)
+        self._cursor += 1
+        return True
+
+    def rewind_to_turn(self, engine: "GameEngine", turn: int) -> None:
+        """
+        Moves to the start of turn, backwards or forwards through history,
+        by replaying only the deltas in between.
+        """
+        # the first entry played during turn follows the one that started it
+        target = bisect_left(self._turns, turn)
+        while self._cursor > target:
+            self.undo(engine)
+        while self._cursor < target and self.redo(engine):
+            pass
+        logger.debug(f"Journal rewound to turn {turn}, {self._cursor} entries")
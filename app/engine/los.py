@@ -0,0 +1,106 @@
+from functools import cache
+
+from app.utils.math import V2
+
+
+@cache
+def ray(dx: int, dy: int) -> tuple[tuple[int, int], ...]:
+    """
+    Offsets of the cells whose inside the segment between the centers of
+    (0, 0) and (dx, dy) crosses, both ends excluded. A segment going
+    exactly through a corner touches neither side cell, so the same cells
+    are crossed in both directions and sight is symmetric.
+    """
+    sx = 1 if dx > 0 else -1
+    sy = 1 if dy > 0 else -1
+    ax, ay = abs(dx), abs(dy)
+    x = y = ix = iy = 0
+    cells = []
+    while ix < ax or iy < ay:
+        # compare where the next vertical and horizontal borders are crossed
+        to_x = (2 * ix + 1) * ay
+        to_y = (2 * iy + 1) * ax
+        step_x = iy == ay or (ix < ax and to_x <= to_y)
+        step_y = ix == ax or (iy < ay and to_y <= to_x)
+        if step_x:
+            x += sx
+            ix += 1
+        if step_y:
+            y += sy
+            iy += 1
+        cells.append((x, y))
+    return tuple(cells[:-1])
+
+
+class LineOfSight:
+    """
+    Blocking terrain of the level and the line of sight over it.
+    Cells visible from an origin are cached per origin and only dropped
+    when terrain changes within their radius.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.blocking = bytearray(width * height)
+        self.obstacles = 0
+        # origin -> (radius, visible offsets or None if nothing blocks)
+        self._cache: dict[V2, tuple[int, frozenset[tuple[int, int]] | None]] = {}
+
+    def set_blocking(self, point: V2, blocking: bool) -> None:
+        i = point.y * self.width + point.x
+        if self.blocking[i] == blocking:
+            return
+        self.blocking[i] = blocking
+        self.obstacles += 1 if blocking else -1
+        self._cache = {
+            origin: entry
+            for origin, entry in self._cache.items()
+            if max(abs(origin.x - point.x), abs(origin.y - point.y)) > entry[0]
+        }
+
+    def is_blocking(self, point: V2) -> bool:
+        return bool(self.blocking[point.y * self.width + point.x])
+
+    def is_visible(self, origin: V2, target: V2) -> bool:
+        if not self.obstacles:
+            return True
+        blocking, width = self.blocking, self.width
+        x, y = origin
+        return not any(
+            blocking[(y + dy) * width + x + dx]
+            for dx, dy in ray(target.x - x, target.y - y)
+        )
+
+    def visible_offsets(
+        self, origin: V2, radius: int
+    ) -> frozenset[tuple[int, int]] | None:
+        """
+        Offsets of the cells within radius (Chebyshev) seen from origin,
+        None when nothing blocks around it: everything is visible.
+        """
+        cached = self._cache.get(origin)
+        if cached is not None and cached[0] >= radius:
+            return cached[1]
+        visible = self._compute(origin, radius)
+        self._cache[origin] = (radius, visible)
+        return visible
+
+    def _compute(self, origin: V2, radius: int) -> frozenset[tuple[int, int]] | None:
+        x, y = origin
+        width, blocking = self.width, self.blocking
+        left, right = max(x - radius, 0), min(x + radius, self.width - 1)
+        top, bottom = max(y - radius, 0), min(y + radius, self.height - 1)
+        if all(
+            blocking.find(1, row * width + left, row * width + right + 1) == -1
+            for row in range(top, bottom + 1)
+        ):
+            return None
+        return frozenset(
+            (tx - x, ty - y)
+            for ty in range(top, bottom + 1)
+            for tx in range(left, right + 1)
+            if not any(
+                blocking[(y + dy) * width + x + dx] for dx, dy in ray(tx - x, ty - y)
+            )
+        )
@@ -0,0 +1,378 @@
+import heapq
+from collections.abc import Iterable
+
+from app.utils.math import V2
+
+
+EMPTY = 0
+BLOCKED = 1
+REACHED = 2
+# owner slot of blocking terrain, never friendly
+OBSTACLE = 255
+
+
+class ReachMap:
+    """
+    Cells reachable from an origin within a movement budget.
+    Stored as a mask over a window of the level grid padded by one
+    blocked cell on each side, so the flood fill needs no bounds checks.
+    """
+
+    __slots__ = (
+        "left",
+        "top",
+        "right",
+        "bottom",
+        "stride",
+        "_mask",
+        "_indices",
+        "_layer_ends",
+        "_distances",
+    )
+
+    def __init__(
+        self,
+        left: int,
+        top: int,
+        right: int,
+        bottom: int,
+        mask: bytearray,
+        indices: list[int],
+        layer_ends: list[int],
+    ):
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+        self.stride = right - left + 3
+        self._mask = mask
+        self._indices = indices
+        # _indices[_layer_ends[d - 1]:_layer_ends[d]] are the cells d steps away
+        self._layer_ends = layer_ends
+        self._distances: dict[int, int] | None = None
+
+    def _index(self, point: V2) -> int | None:
+        if not (
+            self.left <= point.x <= self.right and self.top <= point.y <= self.bottom
+        ):
+            return None
+        return (point.y - self.top + 1) * self.stride + point.x - self.left + 1
+
+    def __contains__(self, point: V2) -> bool:
+        i = self._index(point)
+        return i is not None and self._mask[i] == REACHED
+
+    def distance(self, point: V2) -> int | None:
+        """Number of steps needed to reach point, None if it is unreachable"""
+        if point not in self:
+            return None
+        if self._distances is None:
+            self._distances = {}
+            start = 0
+            for d, end in enumerate(self._layer_ends):
+                for i in self._indices[start:end]:
+                    self._distances[i] = d
+                start = end
+        return self._distances[self._index(point)]
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def cells(self) -> list[V2]:
+        """Reachable cells ordered by distance from the origin, then y, then x"""
+        stride = self.stride
+        x0 = self.left - 1
+        y0 = self.top - 1
+        interned = V2.interned
+        return [interned(x0 + i % stride, y0 + i // stride) for i in self._indices]
+
+
+class ReachabilityGrid:
+    """
+    Owner-per-cell grid of the level used for flood fills.
+    Each cell holds 0 if it is empty, the owner slot (1..254) of the ship
+    standing on it or OBSTACLE.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.owners = bytearray(width * height)
+
+    def occupy(self, point: V2, slot: int) -> None:
+        self.owners[point.y * self.width + point.x] = slot
+
+    def vacate(self, point: V2) -> None:
+        self.owners[point.y * self.width + point.x] = EMPTY
+
+    def flood(
+        self,
+        origin: V2,
+        budget: int,
+        friendly_slots: Iterable[int] | None = None,
+    ) -> ReachMap:
+        """
+        Breadth-first flood fill from origin up to budget steps.
+        Cells owned by slots outside friendly_slots block movement;
+        if friendly_slots is None nothing blocks (only map bounds apply).
+        """
+        budget = max(budget, 0)
+        left = max(origin.x - budget, 0)
+        right = min(origin.x + budget, self.width - 1)
+        top = max(origin.y - budget, 0)
+        bottom = min(origin.y + budget, self.height - 1)
+        window_w = right - left + 1
+        stride = window_w + 2
+
+        # owner slot -> 0 (passable) or BLOCKED, applied row by row in C
+        if friendly_slots is None:
+            table = bytes(256)
+        else:
+            lookup = bytearray([BLOCKED]) * 256
+            lookup[EMPTY] = 0
+            for slot in friendly_slots:
+                lookup[slot] = 0
+            table = bytes(lookup)
+
+        mask = bytearray([BLOCKED]) * (stride * (bottom - top + 3))
+        owners = self.owners
+        for row in range(bottom - top + 1):
+            src = (top + row) * self.width + left
+            dst = (row + 1) * stride + 1
+            mask[dst : dst + window_w] = owners[src : src + window_w].translate(table)
+
+        start = (origin.y - top + 1) * stride + origin.x - left + 1
+        mask[start] = REACHED
+        frontier = [start]
+        reached = [start]
+        layer_ends = [1]
+        for _ in range(budget):
+            next_frontier = []
+            for i in frontier:
+                for j in (i - 1, i + 1, i - stride, i + stride):
+                    if not mask[j]:
+                        mask[j] = REACHED
+                        next_frontier.append(j)
+            if not next_frontier:
+                break
+            # row by row within a layer, the order the bitboards give
+            next_frontier.sort()
+            reached.extend(next_frontier)
+            layer_ends.append(len(reached))
+            frontier = next_frontier
+        return ReachMap(left, top, right, bottom, mask, reached, layer_ends)
+
+    def find_path(
+        self,
+        origin: V2,
+        destination: V2,
+        friendly_slots: Iterable[int] | None = None,
+    ) -> list[V2] | None:
+        """
+        Shortest path from origin to destination, both included, found by A*
+        with a Manhattan distance heuristic. Cells block as in flood, the
+        destination too. None if there is no way through.
+        """
+        width, height = self.width, self.height
+        if not (0 <= destination.x < width and 0 <= destination.y < height):
+            return None
+        passable = None if friendly_slots is None else {EMPTY, *friendly_slots}
+        owners = self.owners
+        start = origin.y * width + origin.x
+        goal = destination.y * width + destination.x
+        if passable is not None and goal != start and owners[goal] not in passable:
+            return None
+
+        gx, gy = destination
+        came_from = {start: start}
+        costs = {start: 0}
+        # ties go to the deepest node, it is the closest to the goal
+        heap = [(abs(origin.x - gx) + abs(origin.y - gy), 0, start)]
+        while heap:
+            _, g, i = heapq.heappop(heap)
+            if i == goal:
+                break
+            g = -g
+            if g > costs[i]:
+                continue
+            x, y = i % width, i // width
+            for j, inside in (
+                (i - 1, x > 0),
+                (i + 1, x < width - 1),
+                (i - width, y > 0),
+                (i + width, y < height - 1),
+            ):
+                if not inside or (passable is not None and owners[j] not in passable):
+                    continue
+                if g + 1 < costs.get(j, g + 2):
+                    costs[j] = g + 1
+                    came_from[j] = i
+                    h = abs(j % width - gx) + abs(j // width - gy)
+                    heapq.heappush(heap, (g + 1 + h, -g - 1, j))
+        else:
+            return None
+
+        path = [goal]
+        while path[-1] != start:
+            path.append(came_from[path[-1]])
+        interned = V2.interned
+        return [interned(i % width, i // width) for i in reversed(path)]
+
+    def free_cells(self, reach: ReachMap, origin: V2) -> list[V2]:
+        """Cells of reach a ship from origin can stop on: empty ones and origin"""
+        owners, width = self.owners, self.width
+        return [
+            c for c in reach.cells() if c == origin or not owners[c.y * width + c.x]
+        ]
+
+
+class BitReach:
+    """
+    ReachMap as big-int bitboards over the whole level, one bit per cell
+    at y * (width + 1) + x. The extra column is always empty, it keeps
+    shifted rows from wrapping around.
+    """
+
+    __slots__ = ("left", "top", "right", "bottom", "stride", "bits", "_layers")
+
+    def __init__(self, width: int, height: int, layers: list[int]):
+        self.left = 0
+        self.top = 0
+        self.right = width - 1
+        self.bottom = height - 1
+        self.stride = width + 1
+        # _layers[d] holds the cells d steps away
+        self._layers = layers
+        self.bits = 0
+        for layer in layers:
+            self.bits |= layer
+
+    def __contains__(self, point: V2) -> bool:
+        if not (0 <= point.x <= self.right and 0 <= point.y <= self.bottom):
+            return False
+        return bool(self.bits >> (point.y * self.stride + point.x) & 1)
+
+    def distance(self, point: V2) -> int | None:
+        if point not in self:
+            return None
+        i = point.y * self.stride + point.x
+        for d, layer in enumerate(self._layers):
+            if layer >> i & 1:
+                return d
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def cells(self, mask: int = -1) -> list[V2]:
+        """
+        Reachable cells ordered by distance from the origin, then y, then x,
+        only those in mask
+        """
+        cells = []
+        for layer in self._layers:
+            cells.extend(bits_to_cells(layer & mask, self.stride))
+        return cells
+
+
+def bits_to_cells(bits: int, stride: int) -> list[V2]:
+    interned = V2.interned
+    cells = []
+    while bits:
+        low = bits & -bits
+        i = low.bit_length() - 1
+        bits ^= low
+        cells.append(interned(i % stride, i // stride))
+    return cells
+
+
+class BitboardGrid(ReachabilityGrid):
+    """
+    ReachabilityGrid that also keeps one bitboard per owner slot, for
+    small levels. Flood fills expand the whole frontier at once with
+    shifts and masks, destinations are one and-not with the occupancy.
+    The cost of each operation grows with the level size, not the reach.
+    """
+
+    def __init__(self, width: int, height: int):
+        super().__init__(width, height)
+        self.stride = width + 1
+        row = (1 << width) - 1
+        self.full = 0
+        for y in range(height):
+            self.full |= row << (y * self.stride)
+        self.boards: dict[int, int] = {}
+        self.occupied = 0
+        # (origin, stencil) -> cells covered, terrain and ships don't matter
+        self._ranges: dict[tuple[V2, frozenset[tuple[int, int]]], int] = {}
+
+    def _bit(self, point: V2) -> int:
+        return 1 << (point.y * self.stride + point.x)
+
+    def cells_to_bits(self, cells: Iterable[V2]) -> int:
+        stride = self.stride
+        bits = 0
+        for c in cells:
+            bits |= 1 << (c.y * stride + c.x)
+        return bits
+
+    def range_bits(self, origin: V2, stencil: frozenset[tuple[int, int]]) -> int:
+        """Cells of the level the stencil covers from origin"""
+        key = (origin, stencil)
+        bits = self._ranges.get(key)
+        if bits is None:
+            x, y = origin
+            width, height, stride = self.width, self.height, self.stride
+            bits = 0
+            for dx, dy in stencil:
+                if 0 <= x + dx < width and 0 <= y + dy < height:
+                    bits |= 1 << ((y + dy) * stride + x + dx)
+            self._ranges[key] = bits
+        return bits
+
+    def occupy(self, point: V2, slot: int) -> None:
+        old = self.owners[point.y * self.width + point.x]
+        if old:
+            self.boards[old] &= ~self._bit(point)
+        super().occupy(point, slot)
+        bit = self._bit(point)
+        self.boards[slot] = self.boards.get(slot, 0) | bit
+        self.occupied |= bit
+
+    def vacate(self, point: V2) -> None:
+        old = self.owners[point.y * self.width + point.x]
+        if old:
+            self.boards[old] &= ~self._bit(point)
+        super().vacate(point)
+        self.occupied &= ~self._bit(point)
+
+    def flood(
+        self,
+        origin: V2,
+        budget: int,
+        friendly_slots: Iterable[int] | None = None,
+    ) -> BitReach:
+        passable = self.full
+        if friendly_slots is not None:
+            friendly = set(friendly_slots)
+            for slot, board in self.boards.items():
+                if slot not in friendly:
+                    passable &= ~board
+        stride = self.stride
+        frontier = self._bit(origin)
+        reached = frontier
+        layers = [frontier]
+        for _ in range(max(budget, 0)):
+            spread = frontier << 1 | frontier >> 1
+            spread |= frontier << stride | frontier >> stride
+            frontier = spread & passable & ~reached
+            if not frontier:
+                break
+            reached |= frontier
+            layers.append(frontier)
+        return BitReach(self.width, self.height, layers)
+
+    def free_bits(self, reach: BitReach, origin: V2) -> int:
+        return reach.bits & ~self.occupied | self._bit(origin)
+
+    def free_cells(self, reach: BitReach, origin: V2) -> list[V2]:
+        return reach.cells(self.free_bits(reach, origin))
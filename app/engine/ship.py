@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
-from app.utils.math import V2
+from app.utils.constants import SENSOR_RANGE
+from app.utils.math import Direction, V2
 from app.engine.weapons import Weapon
 
 
@@ -13,6 +14,8 @@ class Ship:
     speed: int = 8
     active_moves: int = speed
     selected_weapon: Weapon | None = None
+    facing: Direction = Direction.UP
+    sensor_range: int = SENSOR_RANGE
 
     def __post_init__(self):
         self.selected_weapon = self.weapons[0]
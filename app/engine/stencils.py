@@ -0,0 +1,70 @@
+from enum import Enum
+from functools import cache
+
+from app.utils.math import Direction
+
+
+class RangeShape(str, Enum):
+    DIAMOND = "diamond"  # Manhattan distance
+    SQUARE = "square"  # Chebyshev distance
+    RING = "ring"  # Manhattan distance, with a blind zone around the ship
+    CONE = "cone"  # 90 degrees wide, in front of the ship
+
+
+# unit vector pointing "forward" for each facing, y grows downwards
+FORWARD = {
+    Direction.UP: (0, -1),
+    Direction.DOWN: (0, 1),
+    Direction.LEFT: (-1, 0),
+    Direction.RIGHT: (1, 0),
+}
+
+
+def in_stencil(
+    shape: RangeShape,
+    radius: int,
+    dx: int,
+    dy: int,
+    min_range: int = 0,
+    facing: Direction = Direction.UP,
+) -> bool:
+    """Closed-form check whether offset (dx, dy) is covered by the shape"""
+    manhattan = abs(dx) + abs(dy)
+    match shape:
+        case RangeShape.DIAMOND:
+            return manhattan <= radius
+        case RangeShape.SQUARE:
+            return max(abs(dx), abs(dy)) <= radius
+        case RangeShape.RING:
+            return min_range <= manhattan <= radius
+        case RangeShape.CONE:
+            fx, fy = FORWARD[facing]
+            forward = dx * fx + dy * fy
+            side = abs(dx * fy - dy * fx)
+            return 0 < forward and side <= forward and manhattan <= radius
+    raise ValueError(f"Unknown range shape: {shape}")
+
+
+@cache
+def get_stencil(
+    shape: RangeShape,
+    radius: int,
+    min_range: int = 0,
+    facing: Direction = Direction.UP,
+) -> frozenset[tuple[int, int]]:
+    """
+    All (dx, dy) offsets covered by the shape, computed once per
+    (shape, radius, min_range, facing) and shared by every weapon.
+    """
+    return frozenset(
+        (dx, dy)
+        for dx in range(-radius, radius + 1)
+        for dy in range(-radius, radius + 1)
+        if in_stencil(shape, radius, dx, dy, min_range, facing)
+    )
+
+
+@cache
+def reflect(stencil: frozenset[tuple[int, int]]) -> frozenset[tuple[int, int]]:
+    """Offsets from which a stencil covers the origin"""
+    return frozenset((-dx, -dy) for dx, dy in stencil)
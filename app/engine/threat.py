@@ -0,0 +1,133 @@
+from array import array
+from collections.abc import Callable, Iterable
+
+from app.engine.reachability import ReachabilityGrid, ReachMap
+from app.engine.ship import Ship
+from app.utils.math import V2
+
+# more changed cells than this since the last sync and the map is rebuilt
+REBUILD_THRESHOLD = 64
+
+
+def cover(
+    reach: ReachMap, stencil: frozenset[tuple[int, int]], width: int, height: int
+) -> list[int]:
+    """
+    Level cell indices hit by the stencil from any cell of reach.
+    The reach is a bitmask over its window padded by the stencil extent,
+    the dilation is one shift and or per stencil offset over the whole mask.
+    """
+    pad = max((max(abs(dx), abs(dy)) for dx, dy in stencil), default=0)
+    stride = reach.right - reach.left + 1 + 2 * pad
+    bits = 0
+    for cell in reach.cells():
+        bits |= 1 << ((cell.y - reach.top + pad) * stride + cell.x - reach.left + pad)
+    covered = 0
+    for dx, dy in stencil:
+        shift = dy * stride + dx
+        covered |= bits << shift if shift >= 0 else bits >> -shift
+
+    x0 = reach.left - pad
+    y0 = reach.top - pad
+    cells = []
+    while covered:
+        low = covered & -covered
+        i = low.bit_length() - 1
+        covered ^= low
+        x = x0 + i % stride
+        y = y0 + i // stride
+        if 0 <= x < width and 0 <= y < height:
+            cells.append(y * width + x)
+    return cells
+
+
+class ThreatMap:
+    """
+    Damage the ships of each owner slot could deal to every cell of the
+    level next turn: full speed moves around blocking ships, then every
+    attack of the selected weapon.
+    Changes are only noted as they happen. Syncing recomputes the ships
+    whose reach contains a changed cell, so the map stays current as
+    ships move and die without rebuilding it.
+    """
+
+    def __init__(
+        self,
+        grid: ReachabilityGrid,
+        ships: Callable[[], Iterable[tuple[Ship, int]]],
+        allied_slots: dict[int, tuple[int, ...]] | None = None,
+    ):
+        self.grid = grid
+        # every live ship with its owner slot
+        self._ships = ships
+        # slots whose ships a slot's ships can pass through, its own by default
+        self._allied_slots = allied_slots or {}
+        self.damage: dict[int, array] = {}
+        # id(ship) -> (ship, slot, origin, cells, amount) as last added
+        self._contributions: dict[int, tuple[Ship, int, V2, list[int], int]] = {}
+        self._changed: set[V2] | None = None  # None means a full rebuild
+
+    def note_change(self, point: V2) -> None:
+        """A ship appeared at, left or moved to or from point"""
+        if self._changed is not None:
+            self._changed.add(point)
+            if len(self._changed) > REBUILD_THRESHOLD:
+                self._changed = None
+
+    def layer(self, slot: int) -> array:
+        """Damage per cell (y * width + x) the ships of slot can deal"""
+        self.sync()
+        return self._layer(slot)
+
+    def _layer(self, slot: int) -> array:
+        layer = self.damage.get(slot)
+        if layer is None:
+            layer = self.damage[slot] = array("i", bytes(4 * len(self.grid.owners)))
+        return layer
+
+    def sync(self) -> None:
+        changed = self._changed
+        if changed is None:
+            self.damage.clear()
+            self._contributions.clear()
+        elif not changed:
+            return
+        else:
+            for key, (ship, slot, origin, cells, amount) in list(
+                self._contributions.items()
+            ):
+                # moved or destroyed, or its reach may have grown or shrunk
+                if ship.position != origin or any(
+                    origin.distance(p) <= ship.speed for p in changed
+                ):
+                    self._subtract(key)
+        live = set()
+        for ship, slot in self._ships():
+            live.add(id(ship))
+            if id(ship) not in self._contributions:
+                self._add(ship, slot)
+        for key in self._contributions.keys() - live:
+            self._subtract(key)
+        self._changed = set()
+
+    def _add(self, ship: Ship, slot: int) -> None:
+        weapon = ship.selected_weapon
+        reach = self.grid.flood(
+            ship.position,
+            ship.speed,
+            friendly_slots=self._allied_slots.get(slot, (slot,)),
+        )
+        cells = cover(
+            reach, weapon.stencil(ship.facing), self.grid.width, self.grid.height
+        )
+        amount = weapon.damage * weapon.attacks
+        layer = self._layer(slot)
+        for i in cells:
+            layer[i] += amount
+        self._contributions[id(ship)] = (ship, slot, ship.position, cells, amount)
+
+    def _subtract(self, key: int) -> None:
+        _, slot, _, cells, amount = self._contributions.pop(key)
+        layer = self.damage[slot]
+        for i in cells:
+            layer[i] -= amount
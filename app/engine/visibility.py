@@ -0,0 +1,66 @@
+from array import array
+
+from app.engine.ship import Ship
+from app.engine.stencils import RangeShape, get_stencil
+from app.utils.math import V2
+
+
+class VisibilityMap:
+    """
+    Number of ships of each owner slot that see every cell of the level.
+    Ships are only marked as they move, appear or die, their vision is
+    taken out and put back on the next read, so a move costs two vision
+    diamonds however many ships and cells there are.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self._layers: dict[int, array] = {}
+        # id(ship) -> (slot, cells) as last added
+        self._vision: dict[int, tuple[int, list[int]]] = {}
+        # id(ship) -> (ship, slot), slot None once the ship is gone
+        self._dirty: dict[int, tuple[Ship, int | None]] = {}
+
+    def mark(self, ship: Ship, slot: int | None) -> None:
+        self._dirty[id(ship)] = (ship, slot)
+
+    def layer(self, slot: int) -> array:
+        """Ships of slot seeing each cell (y * width + x)"""
+        self.sync()
+        return self._layer(slot)
+
+    def is_visible(self, slot: int, point: V2) -> bool:
+        if not (0 <= point.x < self.width and 0 <= point.y < self.height):
+            return False
+        return self.layer(slot)[point.y * self.width + point.x] > 0
+
+    def _layer(self, slot: int) -> array:
+        layer = self._layers.get(slot)
+        if layer is None:
+            layer = self._layers[slot] = array("i", bytes(4 * self.width * self.height))
+        return layer
+
+    def sync(self) -> None:
+        dirty, self._dirty = self._dirty, {}
+        for key, (ship, slot) in dirty.items():
+            old = self._vision.pop(key, None)
+            if old is not None:
+                layer = self._layers[old[0]]
+                for i in old[1]:
+                    layer[i] -= 1
+            if slot is not None:
+                cells = self._cells(ship)
+                layer = self._layer(slot)
+                for i in cells:
+                    layer[i] += 1
+                self._vision[key] = (slot, cells)
+
+    def _cells(self, ship: Ship) -> list[int]:
+        x, y = ship.position
+        width, height = self.width, self.height
+        return [
+            (y + dy) * width + x + dx
+            for dx, dy in get_stencil(RangeShape.DIAMOND, ship.sensor_range)
+            if 0 <= x + dx < width and 0 <= y + dy < height
+        ]
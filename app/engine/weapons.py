@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 
+from app.engine.stencils import RangeShape, get_stencil
 from app.utils.constants import (
     LASER_DAMAGE,
     LASER_RANGE,
@@ -7,9 +8,9 @@ from app.utils.constants import (
     MISSILE_DAMAGE,
     MISSILE_RANGE,
 )
+from app.utils.math import Direction
 
 
-# TODO: implement non-circle range for weapons
 @dataclass
 class Weapon:
     damage: int
@@ -18,11 +19,23 @@ class Weapon:
     attacks_left: int
     ammo: int | None  # None means unlimited ammo
     ammo_left: int | None
+    shape: RangeShape = RangeShape.DIAMOND
+    min_range: int = 0  # only used by RangeShape.RING
+
+    def stencil(self, facing: Direction) -> frozenset[tuple[int, int]]:
+        return get_stencil(self.shape, self.range, self.min_range, facing)
+
+    def covers(self, facing: Direction, dx: int, dy: int) -> bool:
+        return (dx, dy) in self.stencil(facing)
+
+    @property
+    def name(self) -> str:
+        return self.__class__.__name__
 
     def __str__(self):
         ammo_str = f" ({self.ammo_left}/{self.ammo})" if self.ammo else "Unlimited"
         return (
-            f"{self.__class__.__name__}"
+            f"{self.name}"
             f"\nDamage: {self.damage}"
             f"\nRange: {self.range}"
             f"\nAttacks: {self.attacks_left} ({self.attacks})"
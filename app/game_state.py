@@ -4,7 +4,6 @@ from enum import Enum
 from app.engine.engine import GameEngine
 from app.utils.math import V2
 from app.engine.ship import Ship
-from app.utils.point_converter import PointConverter
 
 
 logger = logging.getLogger(__name__)
@@ -18,12 +17,17 @@ class SelectionMode(Enum):
 
 
 class GameState:
-    def __init__(self, engine: GameEngine, point_converter: PointConverter):
+    def __init__(
+        self,
+        engine: GameEngine,
+        fog_of_war: bool = True,
+    ):
         self.engine = engine
-        self.point_converter = point_converter
+        # only what the current player's ships see is shown
+        self.fog_of_war = fog_of_war
         self.selected_ship: Ship | None = None
-        self.selected_ship_destinations: list[V2] | None = None
-        self.selected_ship_attack_range: list[V2] | None = None
+        self.selected_ship_destinations: set[V2] | None = None
+        self.selected_ship_attack_range: set[V2] | None = None
         self.selection_mode: SelectionMode | None = None
 
     def switch_selection_mode(self):
@@ -56,41 +60,43 @@ class GameState:
     def get_selected_ship_position(self) -> V2:
         return self.selected_ship.position
 
-    def reset_selected_ship_destinations(self, *args) -> None:
-        destinations = self.engine.find_all_destinations_by_ship(self.selected_ship)
-        self.selected_ship_destinations = [
-            d for d in destinations if d != self.selected_ship.position
-        ]
+    def invalidate_selected_ship_destinations(self, *args) -> None:
+        self.selected_ship_destinations = None
 
-    def reset_selected_ship_attack_range(self, *args) -> None:
-        attack_range = self.engine.find_attack_range_by_ship(self.selected_ship)
-        self.selected_ship_attack_range = [
-            d for d in attack_range if d != self.selected_ship.position
-        ]
+    def invalidate_selected_ship_attack_range(self, *args) -> None:
+        self.selected_ship_attack_range = None
 
-    def get_selected_ship_destinations(self) -> list[V2]:
+    # both lists are recomputed on read only, the engine caches the flood fills
+    def get_selected_ship_destinations(self) -> set[V2]:
         if self.selected_ship_destinations is None:
-            destinations = self.engine.find_all_destinations_by_ship(self.selected_ship)
-            self.selected_ship_destinations = [
-                d for d in destinations if d != self.selected_ship.position
-            ]
+            destinations = set(
+                self.engine.find_all_destinations_by_ship(self.selected_ship)
+            )
+            destinations.discard(self.selected_ship.position)
+            self.selected_ship_destinations = destinations
         return self.selected_ship_destinations
 
-    def get_selected_ship_attack_range(self) -> list[V2]:
+    def get_selected_ship_attack_range(self) -> set[V2]:
         if self.selected_ship_attack_range is None:
-            attack_range = self.engine.find_attack_range_by_ship(self.selected_ship)
-            self.selected_ship_attack_range = [
-                d for d in attack_range if d != self.selected_ship.position
-            ]
+            attack_range = set(
+                self.engine.find_attack_range_by_ship(self.selected_ship)
+            )
+            attack_range.discard(self.selected_ship.position)
+            self.selected_ship_attack_range = attack_range
         return self.selected_ship_attack_range
 
     def get_all_allied_positions(self) -> list[V2]:
-        ships = self.engine.get_all_allied_ships()
-        return [s.position for s in ships]
+        return self.engine.get_all_allied_positions()
 
     def get_all_enemy_positions(self) -> list[V2]:
-        ships = self.engine.get_all_enemy_ships()
-        return [s.position for s in ships]
+        if self.fog_of_war:
+            return self.engine.get_visible_enemy_positions(self.engine.current_player)
+        return self.engine.get_all_enemy_positions()
+
+    def is_visible(self, point: V2) -> bool:
+        if not self.fog_of_war:
+            return True
+        return self.engine.is_visible(self.engine.current_player, point)
 
     def get_game_info(self) -> str:
         return f"Turn: {self.engine.turn}\nPlayer: {self.engine.current_player}"
@@ -4,13 +4,17 @@ import json
 from pathlib import Path
 
 
-
 # TODO think: levels as png images, pixel color = tile type
 # OR levels as binary
 
 
 class TileType(str, Enum):
     SPACE = "S"
+    ASTEROID = "A"
+
+
+# tiles that can't be crossed, shot or seen through
+BLOCKING_TILES = frozenset({TileType.ASTEROID})
 
 
 @dataclass
@@ -23,6 +27,9 @@ class Level:
     ]  # example: [[(0, 0), (2, 2)], [(3, 3), (5, 5)]] (topleft, bottomright)
 
     data: list[list[TileType]]
+    # team of each starting zone, players of a team are allies;
+    # None means every player for themselves
+    teams: list[int] | None = None
 
 
 def generate_simple_level() -> None:
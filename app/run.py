@@ -1,15 +1,36 @@
 import logging
+import time
+from pathlib import Path
 
 import pygame
 from pygame import SCALED
 
+from app.level.level import load_levels
 from app.scenes.base import Scene
 
+from app.scenes.game import GameScene
 from app.scenes.main_menu import MainMenu
+from app.simulation import Replay, run_batch
+from app.simulation.benchmark import (
+    CASES,
+    MAX_SLOWDOWN,
+    QUICK_CASES,
+    compare,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
 from app.utils.config import ScreenConfig
+from app.ui.frame_stats import FrameStats
 from app.utils.constants import GAME_NAME
+from app.utils.profiler import frame_profiler
 
 logger = logging.getLogger(__name__)
+
+FRAME_STATS_KEY = pygame.K_F3  # toggles the frame time overlay
+FRAME_DUMP_KEY = pygame.K_F12  # writes the recent frame timings to JSON
+FRAME_STATS_REFRESH = 30  # frames between overlay refreshes
+
 logging.basicConfig(
     format="%(asctime)s %(name)-12s %(levelname)-8s %(message)s",
     datefmt="%H:%M:%S",
@@ -22,6 +43,8 @@ class GameRunner:
         self.clock = pygame.time.Clock()
         self.scene = scene
         self.running = True
+        self.frame_stats: FrameStats | None = None
+        self.frame_count = 0
 
         logger.debug("Pygame runner initialized")
 
@@ -29,23 +52,79 @@ class GameRunner:
         while self.running:
             # TODO https://stackoverflow.com/questions/60406647/pygame-how-to-write-event-loop-polymorphically # noqa: 501
             # https://github.com/Mekire/pygame-mutiscene-template-with-movie/blob/master/data/tools.py
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                self.scene.handle_event(event)
-            self.scene.update()
-            self.scene.draw()
+            frame_profiler.start_frame(type(self.scene).__name__)
+            with frame_profiler.section("handle_event"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                    elif event.type == pygame.KEYDOWN and event.key == FRAME_STATS_KEY:
+                        self.toggle_frame_stats()
+                        continue
+                    elif event.type == pygame.KEYDOWN and event.key == FRAME_DUMP_KEY:
+                        frame_profiler.dump(
+                            Path(f"frames-{time.strftime('%Y%m%d-%H%M%S')}.json")
+                        )
+                        continue
+                    self.scene.handle_event(event)
+            with frame_profiler.section("update"):
+                self.scene.update()
+            if (
+                self.frame_stats is not None
+                and self.frame_count % FRAME_STATS_REFRESH == 0
+            ):
+                self.refresh_frame_stats()
+            with frame_profiler.section("draw"):
+                rects = self.scene.draw()
+            if self.frame_stats is not None:
+                self.draw_frame_stats(rects)
             if self.scene.next_scene:
                 self.scene = self.scene.next_scene
-            pygame.display.update()
+            with frame_profiler.section("display"):
+                # only what was drawn on is sent to the display
+                pygame.display.update(rects)
+            frame_profiler.end_frame()
+            self.frame_count += 1
             self.clock.tick(60)
 
+    def toggle_frame_stats(self):
+        if self.frame_stats is not None:
+            self.scene.invalidate(self.frame_stats.bounds)
+            self.frame_stats = None
+            return
+        self.frame_stats = FrameStats(frame_profiler)
+        self.frame_stats.build(
+            pygame.font.SysFont("jetbrainsmononl", size=16),
+            pygame.display.get_surface().get_rect(),
+        )
+        self.refresh_frame_stats()
+
+    def refresh_frame_stats(self):
+        # the old text is drawn over by the scene, then the new one on top
+        self.scene.invalidate(self.frame_stats.bounds)
+        self.frame_stats.update(fps=self.clock.get_fps())
+        self.scene.invalidate(self.frame_stats.bounds)
 
-def run_game(debug: bool = True, screen_resolution: tuple[int, int] | None = None):
+    def draw_frame_stats(self, rects: list[pygame.Rect]):
+        if self.frame_stats.bounds.collidelist(rects) != -1:
+            self.frame_stats.draw(pygame.display.get_surface())
+            rects.append(self.frame_stats.bounds)
+
+
+def set_log_level(debug: bool) -> None:
     if debug:
         logger.root.setLevel(logging.DEBUG)
     else:
         logger.root.setLevel(logging.INFO)
+
+
+def run_game(
+    debug: bool = True,
+    screen_resolution: tuple[int, int] | None = None,
+    replay_path: Path | None = None,
+    record_dir: Path | None = None,
+    ai_players: tuple[int, ...] = (),
+):
+    set_log_level(debug)
     pygame.init()
 
     if not screen_resolution:
@@ -61,6 +140,80 @@ def run_game(debug: bool = True, screen_resolution: tuple[int, int] | None = Non
         config.window_size,
         flags=SCALED,
     )
-    scene = MainMenu(config)
+    if replay_path is not None:
+        replay = Replay.load(replay_path)
+        scene = GameScene(replay.create_engine(), config, replay.level, replay=replay)
+    else:
+        scene = MainMenu(config, record_dir, ai_players)
     runner = GameRunner(scene)
     runner.run()
+
+
+def run_headless(
+    debug: bool = False,
+    matches: int = 1,
+    seed: int = 0,
+    workers: int | None = None,
+    output: Path | None = None,
+    policies: tuple[str, ...] = ("greedy", "greedy"),
+    ships_per_player: int = 1,
+    max_turns: int = 1000,
+    array_fleets: bool = False,
+    bitboards: bool = False,
+    record_dir: Path | None = None,
+):
+    set_log_level(debug)
+    level = load_levels()[0]
+    if record_dir is not None:
+        record_dir.mkdir(parents=True, exist_ok=True)
+    results = run_batch(
+        level,
+        seeds=list(range(seed, seed + matches)),
+        workers=workers,
+        output=output,
+        policies=policies,
+        ships_per_player=ships_per_player,
+        max_turns=max_turns,
+        array_fleets=array_fleets,
+        bitboards=bitboards,
+        record_dir=record_dir,
+    )
+    for r in results:
+        logger.info(
+            f"Seed {r.seed}: winner {r.winner}, {r.turns} turns, {r.wall_time:.3f}s"
+        )
+
+
+def run_replay_headless(replay_path: Path, debug: bool = False):
+    set_log_level(debug)
+    started = time.perf_counter()
+    replay = Replay.load(replay_path)
+    engine = replay.play()
+    winner = engine.winner.name if engine.winner else None
+    logger.info(
+        f"Replayed {len(replay.actions)} actions: winner {winner}, "
+        f"{engine.turn} turns, {time.perf_counter() - started:.3f}s, "
+        f"state hash {engine.state_hash():016x}"
+    )
+
+
+def run_benchmark(
+    baseline: Path,
+    debug: bool = False,
+    save: bool = False,
+    max_slowdown: float = MAX_SLOWDOWN,
+    quick: bool = False,
+) -> bool:
+    """
+    Time the engine operations and compare them to the baseline, or make
+    them the new baseline. False if any is slower than allowed.
+    """
+    set_log_level(debug)
+    results = run_benchmarks(QUICK_CASES if quick else CASES)
+    if save or not baseline.exists():
+        save_baseline(baseline, results)
+        return True
+    regressions = compare(results, load_baseline(baseline), max_slowdown)
+    for regression in regressions:
+        logger.error(f"Slower than the baseline: {regression}")
+    return not regressions
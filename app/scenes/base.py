@@ -1,15 +1,31 @@
 from abc import ABC
 
-from pygame import Event
+import pygame
+from pygame import Event, Rect
 
 
 class Scene(ABC):
     next_scene: "Scene" = None
 
     def __init__(self):
-        pass
+        # screen rects to redraw on the next frame, None for the whole screen
+        self.dirty_rects: list[Rect] | None = None
 
-    def draw(self):
+    def invalidate(self, rect: Rect | None = None) -> None:
+        """Has rect, or the whole screen, redrawn on the next frame"""
+        if rect is None:
+            self.dirty_rects = None
+        elif self.dirty_rects is not None:
+            self.dirty_rects.append(Rect(rect))
+
+    def take_dirty_rects(self) -> list[Rect]:
+        dirty, self.dirty_rects = self.dirty_rects, []
+        if dirty is None:
+            return [pygame.display.get_surface().get_rect()]
+        return dirty
+
+    def draw(self) -> list[Rect]:
+        """Redraws what changed, returns the screen rects it drew on"""
         raise NotImplementedError()
 
     def update(self):
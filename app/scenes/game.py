@@ -1,24 +1,30 @@
 import logging
+from pathlib import Path
 
 import pygame
 from pygame.font import SysFont
 
-from app.engine import Player
+from app.engine import Player, Ship
 from app.engine.engine import Event, GameEngine
 from app.utils.math import V2
 from app.game_state import GameState, SelectionMode
-from app.level.level import Level
+from app.level.level import Level, TileType
 from app.scenes.base import Scene
 from app.scenes.game_over import GameOver
+from app.simulation.replay import Replay
+from app.simulation.search import SearchPolicy
+from app.sprites.camera import Camera
 from app.sprites.groups import CameraGroup
-from app.sprites.ship import ShipSprite
+from app.sprites.highlight import Highlight
+from app.sprites.ship import SHIP_IMAGES, ShipSprite
+from app.sprites.terrain import TerrainLayer
 from app.ui.label import Label
 from app.ui.minimap import Minimap
 from app.ui.panel import VPanel
 from app.utils.config import ScreenConfig
 from app.utils.constants import (
     BLACK,
-    GREY,
+    DANGER_RED,
     LIGHT_BLUE,
     LIGHT_GREEN,
     LIGHT_RED,
@@ -28,11 +34,25 @@ from app.utils.constants import (
     TURN_LABEL_ID,
     HP_LABEL_ID,
     MODE_LABEL_ID,
+    REPLAY_STEP_MS,
+    SENSOR_RANGE,
 )
+from app.utils.assets import assets
 from app.utils.point_converter import PointConverter
+from app.utils.profiler import frame_profiler
 
 logger = logging.getLogger(__name__)
 
+# while a replay or a computer player is playing only these keys are handled
+VIEW_KEYS = (
+    pygame.K_ESCAPE,
+    pygame.K_LEFT,
+    pygame.K_RIGHT,
+    pygame.K_UP,
+    pygame.K_DOWN,
+    pygame.K_t,
+)
+
 
 class GameScene(Scene):
     def __init__(
@@ -40,49 +60,84 @@ class GameScene(Scene):
         game: GameEngine,
         screen_config: ScreenConfig,
         level: Level,
+        replay: Replay | None = None,
+        record_dir: Path | None = None,
     ):
         super().__init__()
         self.screen_config = screen_config
+        self.replay = replay
+        self.replay_step = 0
+        self.replay_next_tick = 0
+        self.record_dir = record_dir
+        self.ai = SearchPolicy()
+        self.show_danger_zone = False
+        # what the right panel shows, it is only rebuilt when this changes
+        self._right_panel_shown: tuple | None = None
 
         self.point_converter = PointConverter(screen_config, level.tile_size)
         self.level = level
         self.screen = pygame.display.get_surface()
         self.game_engine = game
-        self.game_state = GameState(game, self.point_converter)
+        # a replay shows both fleets
+        self.game_state = GameState(game, fog_of_war=replay is None)
 
-        self.ship_group = CameraGroup(screen_config=screen_config)
-        all_ships = self.game_engine.get_all_ships()
-        for ship in all_ships:
-            direction = "up" if ship.position.y > self.level.height / 2 else "down"
-            position = self.point_converter.from_game_to_screen(ship.position)
-            self.ship_group.add(ShipSprite(ship.position, position, direction))
+        self.camera = Camera(
+            screen_config.game_area,
+            level.width * level.tile_size,
+            level.height * level.tile_size,
+        )
+        self.terrain = TerrainLayer(level.data, level.tile_size)
+        self.destinations_highlight = Highlight(self.point_converter, LIGHT_GREEN)
+        self.attack_range_highlight = Highlight(self.point_converter, LIGHT_RED)
+        # all at once, so that with an atlas they share one surface
+        assets.convert(SHIP_IMAGES)
+        self.ship_group = CameraGroup(
+            camera=self.camera,
+            tile_size=level.tile_size,
+            is_visible=self.game_state.is_visible,
+        )
+        for ship in self.game_engine.get_all_ships():
+            self._add_ship_sprite(ship)
 
+        # every sprite has to follow its ship, the rest only needs
+        # to be refreshed once per frame however many events arrived
         self.game_engine.subscribe(Event.SHIP_MOVED, self._move_ship_sprite)
-        self.game_engine.subscribe(Event.SHIP_MOVED, self.update_minimap)
+        self.game_engine.subscribe(Event.SHIP_DESTROYED, self._remove_ship_sprite)
+        self.game_engine.subscribe(Event.SHIP_ADDED, self._add_ship_sprite)
+        self.game_engine.subscribe(Event.GAME_OVER, self.game_over)
+        self.game_engine.subscribe(Event.TILE_CHANGED, self._set_tile)
+        ship_events = (Event.SHIP_MOVED, Event.SHIP_DESTROYED, Event.SHIP_ADDED)
+        for event in (*ship_events, Event.NEXT_TURN):
+            self.game_engine.subscribe(event, self.update_minimap, coalesce=True)
+        for event in ship_events:
+            self.game_engine.subscribe(
+                event,
+                self.game_state.invalidate_selected_ship_destinations,
+                coalesce=True,
+            )
+            self.game_engine.subscribe(
+                event,
+                self.game_state.invalidate_selected_ship_attack_range,
+                coalesce=True,
+            )
         self.game_engine.subscribe(
-            Event.SHIP_MOVED, self.game_state.reset_selected_ship_destinations
+            Event.NEXT_TURN, self.game_state.reset_ship_selection, coalesce=True
         )
         self.game_engine.subscribe(
-            Event.SHIP_MOVED, self.game_state.reset_selected_ship_attack_range
+            Event.NEXT_TURN, self.update_left_panel, coalesce=True
         )
+        # fog of war and the selection change with the player
         self.game_engine.subscribe(
-            Event.NEXT_TURN, self.game_state.reset_ship_selection
+            Event.NEXT_TURN, self.invalidate_board, coalesce=True
         )
-        self.game_engine.subscribe(Event.NEXT_TURN, self.update_left_panel)
-        self.game_engine.subscribe(Event.NEXT_TURN, self.update_minimap)
-
-        self.game_engine.subscribe(Event.SHIP_DESTROYED, self._remove_ship_sprite)
-        self.game_engine.subscribe(Event.GAME_OVER, self.game_over)
 
         self.font = SysFont("jetbrainsmononl", size=24, bold=True)
 
-        self.offset = V2(0, 0)
-
         self.left_panel = VPanel(
             {
                 MINIMAP_ID: Minimap(
-                    self.offset.x,
-                    self.offset.y,
+                    self.camera.view.x,
+                    self.camera.view.y,
                     screen_config,
                     self.level.height * CELL_SIZE,
                     self.level.width * CELL_SIZE,
@@ -125,6 +180,15 @@ class GameScene(Scene):
         )
 
     def update_right_panel(self):
+        ship = self.game_state.selected_ship
+        shown = (
+            (id(ship), ship.current_hp, self.game_state.selection_mode)
+            if ship is not None
+            else None
+        )
+        if shown == self._right_panel_shown:
+            return
+        self._right_panel_shown = shown
         if self.game_state.is_ship_selected():
             ship = self.game_state.selected_ship
             self.right_panel.update(
@@ -140,45 +204,115 @@ class GameScene(Scene):
 
     def update_minimap(self, *_):
         self.left_panel[MINIMAP_ID].update(
-            offset_x=self.offset.x * CELL_SIZE,
-            offset_y=self.offset.y * CELL_SIZE,
+            offset_x=self.camera.view.x,
+            offset_y=self.camera.view.y,
             allies=self.game_state.get_all_allied_positions(),
             enemies=self.game_state.get_all_enemy_positions(),
         )
 
     def game_over(self, player_won: Player):  # temporary
+        self.save_replay()
         self.next_scene = GameOver(
             self.screen_config, player_won, self.game_engine.turn
         )
 
-    def _remove_ship_sprite(self, position: V2) -> None:
-        screen_pos = self.point_converter.from_game_to_screen(position)
-        for sprite in self.ship_group.sprites():
-            if sprite.rect.center == screen_pos.as_tuple():
-                self.ship_group.remove(sprite)
-                logger.debug("Ship sprite removed successfully")
-                return
+    def save_replay(self):
+        if self.record_dir is None or self.replay is not None:
+            return
+        self.record_dir.mkdir(parents=True, exist_ok=True)
+        Replay.from_engine(self.game_engine, self.level).save(
+            self.record_dir / f"{self.game_engine.seed}.replay"
+        )
 
-    def _move_ship_sprite(self, from_point: V2, to_point: V2) -> None:
-        from_pos = self.point_converter.from_game_to_screen(from_point - self.offset)
-        to_pos = self.point_converter.from_game_to_screen(to_point - self.offset)
-        for sprite in self.ship_group.sprites():
-            if sprite.rect.center == from_pos.as_tuple():
-                sprite.rect.center = to_pos.as_tuple()
-                sprite._point = to_point
-                logger.debug("Ship sprite moved successfully")
-                return
+    def play_replay_step(self):
+        if self.replay_step >= len(self.replay.actions):
+            return
+        now = pygame.time.get_ticks()
+        if now < self.replay_next_tick:
+            return
+        self.game_engine.apply_action(self.replay.actions[self.replay_step])
+        self.replay_step += 1
+        self.replay_next_tick = now + REPLAY_STEP_MS
+
+    def play_ai_turn(self):
+        player = self.game_engine.current_player
+        self.ai.play_turn(self.game_engine, player)
+        if self.game_engine.winner is None:
+            self.game_engine.next_turn()
+
+    def invalidate_board(self, *_) -> None:
+        self.invalidate(self.screen_config.game_area)
+
+    def invalidate_cell(self, point: V2, sprite_rect: pygame.Rect | None = None):
+        """A ship or a tile changed at point, sprite_rect is its sprite in the level"""
+        if self.show_danger_zone or self.game_state.is_ship_selected():
+            # threats and highlights may change anywhere
+            self.invalidate_board()
+            return
+        # what the current player sees changes around its ships
+        margin = SENSOR_RANGE if self.game_state.fog_of_war else 0
+        self.invalidate(self.cell_rect(point - V2(margin, margin), 2 * margin + 1))
+        if sprite_rect is not None:
+            self.invalidate(self.camera.to_screen(sprite_rect))
+
+    def _set_tile(self, point: V2, tile: TileType) -> None:
+        self.terrain.set_tile(point, tile)
+        self.invalidate_cell(point)
+
+    def _add_ship_sprite(self, ship: Ship) -> None:
+        position = V2(*self.ship_group.cell_center(ship.position))
+        sprite = ShipSprite(ship.position, position, ship.facing)
+        self.ship_group.add(sprite)
+        self.invalidate_cell(ship.position, sprite.rect)
 
-    def adjust_ships_for_offset(self):
-        for sprite in self.ship_group.sprites():
-            new_point: V2 = sprite._point - self.offset
-            new_pos = self.point_converter.from_game_to_screen(new_point)
+    def _remove_ship_sprite(self, position: V2) -> None:
+        sprite = self.ship_group.sprite_at(position)
+        if sprite is not None:
+            self.ship_group.remove(sprite)
+            self.invalidate_cell(position, sprite.rect)
+            logger.debug("Ship sprite removed successfully")
 
-            sprite.rect.center = new_pos.as_tuple()
+    def _move_ship_sprite(self, from_point: V2, to_point: V2) -> None:
+        sprite = self.ship_group.sprite_at(from_point)
+        if sprite is not None:
+            self.invalidate_cell(from_point, sprite.rect)
+            self.ship_group.move_sprite(sprite, to_point)
+            self.invalidate_cell(to_point, sprite.rect)
+            logger.debug("Ship sprite moved successfully")
+
+    def cell_rect(self, point: V2, cells: int = 1) -> pygame.Rect:
+        """Screen rect of cells x cells cells from point"""
+        size = self.level.tile_size
+        return self.camera.to_screen(
+            pygame.Rect(point.x * size, point.y * size, cells * size, cells * size)
+        )
 
-    def draw(self):
-        self.screen.fill(BLACK)  # instead, draw by tile
-        self.draw_grid()  # todo draw on surface on load, then paint to screen every frame
+    def draw(self) -> list[pygame.Rect]:
+        dirty = self.take_dirty_rects()
+        for rect in dirty:
+            self.screen.fill(BLACK, rect)
+        area = self.screen_config.game_area
+        board = [r.clip(area) for r in dirty if r.colliderect(area)]
+        if board:
+            # one pass over the board, clipped to what changed
+            self.screen.set_clip(board[0].unionall(board[1:]))
+            self.draw_board()
+            self.screen.set_clip(None)
+        with frame_profiler.section("VPanel"):
+            for panel in (self.left_panel, self.right_panel):
+                if panel.is_dirty() or panel.rect.collidelist(dirty) != -1:
+                    panel.draw(self.screen)
+                    dirty.append(panel.rect)
+        return dirty
+
+    def draw_board(self):
+        with frame_profiler.section("terrain"):
+            self.terrain.draw(
+                self.screen, self.screen_config.game_area, self.camera.view
+            )
+        if self.show_danger_zone:
+            with frame_profiler.section("danger zone"):
+                self.draw_danger_zone()
 
         if self.game_state.is_ship_selected():
             self.draw_selected_cell()
@@ -186,11 +320,9 @@ class GameScene(Scene):
                 self.draw_destinations()
             elif self.game_state.selection_mode == SelectionMode.ATTACK:
                 self.draw_attack_range()
-        self.ship_group.draw(self.screen)
-        self.ship_group.update()
-
-        self.left_panel.draw(self.screen)
-        self.right_panel.draw(self.screen)
+        with frame_profiler.section("CameraGroup"):
+            self.ship_group.draw(self.screen)
+            self.ship_group.update()
 
     def draw_cell(
         self,
@@ -208,82 +340,108 @@ class GameScene(Scene):
             self.screen, color, (x, y, width, width), width=0 if fill else 1
         )
 
-    def convert_adjust_point_for_offset(self, point: V2) -> V2:
-        return self.point_converter.from_game_to_screen(
-            point - self.offset, center=False
-        )
-
     def draw_selected_cell(self):
-        selected_cell_pos = self.convert_adjust_point_for_offset(
-            self.game_state.get_selected_ship_position()
-        )
-        self.draw_cell(LIGHT_BLUE, selected_cell_pos.x, selected_cell_pos.y)
+        rect = self.cell_rect(self.game_state.get_selected_ship_position())
+        self.draw_cell(LIGHT_BLUE, rect.x, rect.y)
 
     def draw_destinations(self):
-        point_destinations = self.game_state.get_selected_ship_destinations()
-        destinations = [
-            self.convert_adjust_point_for_offset(p) for p in point_destinations
-        ]
-        for destination in destinations:
-            self.draw_cell(LIGHT_GREEN, destination.x + 1, destination.y + 1, -1)
+        self.destinations_highlight.update(
+            self.game_state.get_selected_ship_destinations()
+        )
+        self.destinations_highlight.draw(
+            self.screen, self.screen_config.game_area, self.camera.view
+        )
 
     def draw_attack_range(self):
-        point_range_cells: list[V2] = self.game_state.get_selected_ship_attack_range()
-        range_cells = [
-            self.convert_adjust_point_for_offset(p) for p in point_range_cells
-        ]
-        for cell in range_cells:
-            self.draw_cell(LIGHT_RED, cell.x + 1, cell.y + 1, -1)
-
-    def draw_grid(self):
-        tiles_width = (self.screen_config.game_area.w + 1) // self.level.tile_size
-        tiles_height = self.screen_config.game_area.h // self.level.tile_size
-        effective_width = min(tiles_width, self.level.width)
-        effective_height = min(tiles_height, self.level.height)
-        for x in range(effective_width):
-            for y in range(effective_height):
-                point = self.point_converter.from_game_to_screen(V2(x, y), False)
-                self.draw_cell(GREY, point.x, point.y, fill=False)
+        self.attack_range_highlight.update(
+            self.game_state.get_selected_ship_attack_range()
+        )
+        self.attack_range_highlight.draw(
+            self.screen, self.screen_config.game_area, self.camera.view
+        )
+
+    def draw_danger_zone(self):
+        """Cells the enemy can hit next turn, the more damage the redder"""
+        threat = self.game_engine.get_threat_map(self.game_engine.current_player)
+        peak = max(threat, default=0)
+        if peak == 0:
+            return
+        tile_size = self.level.tile_size
+        area = self.screen_config.game_area
+        view = self.camera.view
+        overlay = pygame.Surface(area.size, pygame.SRCALPHA)
+        width = self.level.width
+        right = min((view.x + area.w - 1) // tile_size + 1, width)
+        bottom = min((view.y + area.h - 1) // tile_size + 1, self.level.height)
+        for y in range(view.y // tile_size, bottom):
+            for x in range(view.x // tile_size, right):
+                damage = threat[y * width + x]
+                if damage:
+                    overlay.fill(
+                        (*DANGER_RED, 40 + 120 * damage // peak),
+                        (
+                            x * tile_size - view.x,
+                            y * tile_size - view.y,
+                            tile_size,
+                            tile_size,
+                        ),
+                    )
+        self.screen.blit(overlay, area.topleft)
 
     def update(self):
+        if self.replay is not None:
+            self.play_replay_step()
+        elif self.is_ai_turn():
+            with frame_profiler.section("ai"):
+                self.play_ai_turn()
+        with frame_profiler.section("events"):
+            self.game_engine.events.flush()
         self.update_right_panel()
+        if self.camera.update():
+            self.update_minimap()
+            self.invalidate_board()
 
     def update_offset(self, x: int, y: int):
-        if self.offset.x + x < 0 or self.offset.y + y < 0:
-            return
+        """Scrolls by x and y cells, the camera glides there"""
+        self.camera.scroll(x * self.level.tile_size, y * self.level.tile_size)
 
-        tiles_width = self.screen_config.game_area.w // self.level.tile_size
-        tiles_height = self.screen_config.game_area.h // self.level.tile_size
-        max_offset_x = self.level.width - tiles_width
-        max_offset_y = self.level.height - tiles_height
-
-        if max_offset_x <= 0 or max_offset_y <= 0:
-            return
-
-        if self.offset.x + x > max_offset_x or self.offset.y + y > max_offset_y:
-            return
-
-        self.offset.x += x
-        self.offset.y += y
-
-        self.adjust_ships_for_offset()
-        self.update_minimap()
-        self.draw()
+    def is_ai_turn(self) -> bool:
+        return self.game_engine.current_player.is_ai and self.game_engine.winner is None
 
     def handle_event(self, event: pygame.Event):
+        if (self.replay is not None or self.is_ai_turn()) and not (
+            event.type == pygame.KEYDOWN and event.key in VIEW_KEYS
+        ):
+            return
         if event.type == pygame.KEYDOWN:
             match event.key:
                 case pygame.K_SPACE:
+                    # NEXT_TURN is only delivered on the next update, events
+                    # of the same frame must not use the old selection
+                    self.game_state.reset_ship_selection()
+                    self.invalidate_board()
                     self.game_engine.next_turn()
                 case pygame.K_ESCAPE:
+                    self.save_replay()
                     self.next_scene = GameOver(
                         self.screen_config,
                         self.game_engine.current_player,
                         self.game_engine.turn,
                     )
+                case pygame.K_t:
+                    self.show_danger_zone = not self.show_danger_zone
+                    self.invalidate_board()
                 case pygame.K_a:
                     self.game_state.switch_selection_mode()
                     self.update_right_panel()
+                    self.invalidate_board()
+                case pygame.K_z:
+                    # take-backs are limited to the current player's turn
+                    if self.game_engine.journal.undo_turn() == self.game_engine.turn:
+                        self.game_engine.undo()
+                case pygame.K_y:
+                    if self.game_engine.journal.redo_turn() == self.game_engine.turn:
+                        self.game_engine.redo()
                 case pygame.K_LEFT:
                     self.update_offset(-1, 0)
 
@@ -295,14 +453,14 @@ class GameScene(Scene):
                     self.update_offset(0, 1)
         if event.type == pygame.MOUSEBUTTONDOWN:
             mouse_pos = V2(*pygame.mouse.get_pos())
-            mouse_pos_point = (
-                self.point_converter.from_screen_to_game(mouse_pos) + self.offset
-            )
+            mouse_pos_point = self.camera.to_world(*mouse_pos) // self.level.tile_size
 
             if not self.screen_config.is_in_game_area(mouse_pos.x, mouse_pos.y):
                 logger.debug(f"Clicked outside of the game area: {mouse_pos_point}")
                 return
 
+            # the selection and its highlights may change
+            self.invalidate_board()
             if self.game_state.is_ship_selected():
                 logger.debug("Ship is selected")
                 if self.game_state.selection_mode == SelectionMode.ATTACK:
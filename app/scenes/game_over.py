@@ -24,7 +24,11 @@ class GameOver(Scene):
     def update(self):
         pass
 
-    def draw(self):
+    def draw(self) -> list[pygame.Rect]:
+        # nothing changes once drawn
+        dirty = self.take_dirty_rects()
+        if not dirty:
+            return []
         self.screen.fill(BLACK)
         text = f"Game Over!\n{self.winner.name} wins!\nTurns: {self.turns}\nPress Enter to exit."
         x = self.screen_config.game_area.w // 3
@@ -33,3 +37,4 @@ class GameOver(Scene):
         for line in text.split("\n"):
             r = self.font.render_to(self.screen, (x, y + shift), line, (255, 255, 255))
             shift += r.h
+        return dirty
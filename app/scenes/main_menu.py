@@ -1,18 +1,29 @@
+from pathlib import Path
+
 import pygame
 from app.engine.engine import GameEngine
 from app.level.level import Level, load_levels
 from app.scenes.base import Scene
 from app.scenes.game import GameScene
+from app.sprites.ship import SHIP_IMAGES
 from app.ui.menu import Menu, MenuItem
+from app.utils.assets import assets
 from app.utils.config import ScreenConfig
 from app.utils.constants import BLACK
 from app.utils.math import rect_from_center
 
 
 class MainMenu(Scene):
-    def __init__(self, screen_config: ScreenConfig):
+    def __init__(
+        self,
+        screen_config: ScreenConfig,
+        record_dir: Path | None = None,
+        ai_players: tuple[int, ...] = (),
+    ):
         super().__init__()
         self.screen_config = screen_config
+        self.record_dir = record_dir
+        self.ai_players = ai_players
         self.screen = pygame.display.get_surface()
         menu_rect = rect_from_center(
             self.screen_config.window_size // 2,
@@ -36,21 +47,40 @@ class MainMenu(Scene):
             ),
         ]
         self.menu = Menu(menu_rect, self.menu_items)
+        # read while the player is in the menu
+        assets.preload(SHIP_IMAGES)
 
     def handle_event(self, event: pygame.Event):
+        # buttons only change with the mouse
+        if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN):
+            self.invalidate(self.menu.rect)
         self.menu.handle_event(event)
 
     def update(self):
         pass
 
-    def draw(self):
-        self.screen.fill(BLACK)
+    def draw(self) -> list[pygame.Rect]:
+        dirty = self.take_dirty_rects()
+        if not dirty:
+            return []
+        for rect in dirty:
+            self.screen.fill(BLACK, rect)
         self.menu.draw(self.screen)
+        return dirty
 
     def new_game_pressed(self):
         level: Level = load_levels()[0]
-        game = GameEngine(level.width, level.height, level.starting_zones)
-        self.next_scene = GameScene(game, self.screen_config, level)
+        game = GameEngine(
+            level.width,
+            level.height,
+            level.starting_zones,
+            ai_players=self.ai_players,
+            terrain=level.data,
+            teams=level.teams,
+        )
+        self.next_scene = GameScene(
+            game, self.screen_config, level, record_dir=self.record_dir
+        )
 
     def about_pressed(self):
         print("About")
@@ -0,0 +1,5 @@
+from .batch import run_batch
+from .match import MatchResult, run_match
+from .policies import POLICIES, GreedyPolicy, IdlePolicy, Policy
+from .replay import Replay
+from .search import SearchPolicy
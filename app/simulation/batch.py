@@ -0,0 +1,39 @@
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from functools import partial
+from pathlib import Path
+
+from app.level.level import Level
+from app.simulation.match import MatchResult, run_match
+
+logger = logging.getLogger(__name__)
+
+
+def run_batch(
+    level: Level,
+    seeds: list[int],
+    workers: int | None = None,
+    output: Path | None = None,
+    **match_kwargs,
+) -> list[MatchResult]:
+    """
+    Run one match per seed over a process pool.
+    Results keep the order of seeds and are written to output as JSON.
+    """
+    workers = workers or os.cpu_count() or 1
+    play = partial(run_match, level, **match_kwargs)
+    if workers == 1:
+        results = [play(seed) for seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(seeds) // (workers * 4))
+            results = list(pool.map(play, seeds, chunksize=chunksize))
+
+    if output is not None:
+        with open(output, "w") as file:
+            json.dump([asdict(r) for r in results], file, indent=2)
+        logger.info(f"{len(results)} match results written to {output}")
+    return results
@@ -0,0 +1,203 @@
+import itertools
+import json
+import logging
+import math
+import platform
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.engine.engine import GameEngine, generate_random_ships
+from app.engine.ship import Ship
+from app.engine.weapons import Laser
+from app.game_state import GameState
+from app.utils.math import V2
+
+logger = logging.getLogger(__name__)
+
+# a case is this many times slower than its baseline and it fails
+MAX_SLOWDOWN = 1.5
+MIN_TIME = 0.05  # seconds of calls per measurement
+REPEAT = 5  # measurements per operation, the fastest one counts
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    size: int  # the level is size x size
+    ships: int  # per player
+    speed: int
+    bitboards: bool = False
+
+    @property
+    def name(self) -> str:
+        name = f"{self.size}x{self.size} {self.ships} ships speed {self.speed}"
+        return name + " bitboards" if self.bitboards else name
+
+
+CASES = [
+    BenchCase(size, ships, speed)
+    for size, ships, speed in itertools.product(
+        (30, 100, 300, 1000), (10, 200), (4, 16)
+    )
+] + [BenchCase(30, ships, speed, True) for ships in (10, 200) for speed in (4, 16)]
+QUICK_CASES = [BenchCase(30, 10, 8), BenchCase(30, 10, 8, True), BenchCase(300, 10, 8)]
+
+
+def create_engine(case: BenchCase, seed: int = 0) -> GameEngine:
+    """Two fleets facing each other from the top and bottom rows"""
+    rows = math.ceil(2 * case.ships / case.size)
+    if 2 * rows > case.size:
+        raise ValueError(f"{case.ships} ships don't fit on {case.size}x{case.size}")
+    last = case.size - 1
+    zones = [[(0, 0), (last, rows - 1)], [(0, case.size - rows), (last, last)]]
+    engine = GameEngine(
+        case.size, case.size, zones, ships_per_player=0, bitboards=case.bitboards
+    )
+    rng = random.Random(seed)
+    for player, (topleft, bottomright) in zip(engine.players, zones):
+        for ship in generate_random_ships(
+            V2(*topleft), V2(*bottomright), limit=case.ships, rng=rng
+        ):
+            ship.speed = ship.active_moves = case.speed
+            engine.add_ship(ship, player)
+    return engine
+
+
+def _reach(engine: GameEngine) -> Callable[[], None]:
+    ships = itertools.cycle(engine.ships[engine.current_player])
+
+    def call():
+        engine.reach_cache.clear()
+        engine.find_reach_by_ship(next(ships))
+
+    return call
+
+
+def _destinations(engine: GameEngine) -> Callable[[], None]:
+    ships = itertools.cycle(engine.ships[engine.current_player])
+
+    def call():
+        engine.reach_cache.clear()
+        engine.find_all_destinations_by_ship(next(ships))
+
+    return call
+
+
+def _attack(engine: GameEngine) -> Callable[[], None]:
+    # an enemy next to the first ship, every attack is undone
+    attacker = engine.ships[engine.current_player][0]
+    enemy = engine.get_enemies(engine.current_player)[0]
+    x, y = attacker.position
+    target = next(
+        p
+        for p in (V2(x + 1, y), V2(x - 1, y), V2(x, y + 1), V2(x, y - 1))
+        if 0 <= p.x < engine.width
+        and 0 <= p.y < engine.height
+        and engine.get_ship_at(p) is None
+    )
+    engine.add_ship(Ship(target, [Laser()]), enemy)
+
+    def call():
+        mark = len(engine.journal)
+        engine.try_attack_ship(attacker, target)
+        while len(engine.journal) > mark:
+            engine.undo()
+
+    return call
+
+
+def _next_turn(engine: GameEngine) -> Callable[[], None]:
+    return engine.next_turn
+
+
+def _getters(engine: GameEngine) -> Callable[[], None]:
+    state = GameState(engine)
+    ships = itertools.cycle(engine.ships[engine.current_player])
+
+    def call():
+        engine.reach_cache.clear()
+        state.selected_ship = next(ships)
+        state.invalidate_selected_ship_destinations()
+        state.invalidate_selected_ship_attack_range()
+        state.get_selected_ship_destinations()
+        state.get_selected_ship_attack_range()
+        state.get_all_allied_positions()
+        state.get_all_enemy_positions()
+
+    return call
+
+
+# operation -> builds the call to time on a fresh engine
+OPERATIONS: dict[str, Callable[[GameEngine], Callable[[], None]]] = {
+    "reach": _reach,
+    "destinations": _destinations,
+    "attack": _attack,
+    "next_turn": _next_turn,
+    "getters": _getters,
+}
+
+
+def measure(call: Callable[[], None], min_time: float = MIN_TIME) -> float:
+    """Seconds per call, the fastest of REPEAT runs of at least min_time"""
+    best = math.inf
+    for _ in range(REPEAT):
+        calls = 0
+        started = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            call()
+            calls += 1
+            elapsed = time.perf_counter() - started
+        best = min(best, elapsed / calls)
+    return best
+
+
+def run_benchmarks(
+    cases: list[BenchCase] = CASES, min_time: float = MIN_TIME
+) -> dict[str, dict[str, float]]:
+    """Case name -> operation -> seconds per call"""
+    results = {}
+    for case in cases:
+        results[case.name] = {}
+        for operation, build in OPERATIONS.items():
+            seconds = measure(build(create_engine(case)), min_time)
+            results[case.name][operation] = seconds
+            logger.info(f"{case.name:<36} {operation:<13} {seconds * 1e6:>12.1f} us")
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    max_slowdown: float = MAX_SLOWDOWN,
+) -> list[str]:
+    """Regressions past max_slowdown, cases missing from either side are skipped"""
+    regressions = []
+    for case, operations in results.items():
+        for operation, seconds in operations.items():
+            reference = baseline.get(case, {}).get(operation)
+            if reference and seconds > reference * max_slowdown:
+                regressions.append(
+                    f"{case} {operation}: {seconds * 1e6:.1f} us, "
+                    f"{seconds / reference:.2f}x the baseline"
+                )
+    return regressions
+
+
+def load_baseline(path: Path) -> dict[str, dict[str, float]]:
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def save_baseline(path: Path, results: dict[str, dict[str, float]]) -> None:
+    # timings only compare on the same machine and interpreter
+    data = {
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+    logger.info(f"Benchmark baseline written to {path}")
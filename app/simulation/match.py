@@ -0,0 +1,70 @@
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.engine.engine import GameEngine
+from app.level.level import Level
+from app.simulation.policies import POLICIES
+from app.simulation.replay import Replay
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MatchResult:
+    seed: int
+    winner: str | None  # None means the turn limit was reached
+    turns: int
+    wall_time: float  # seconds
+    state_hash: int  # of the final state, replays must reach the same
+
+
+def run_match(
+    level: Level,
+    seed: int,
+    policies: tuple[str, ...] = ("greedy", "greedy"),
+    ships_per_player: int = 1,
+    max_turns: int = 1000,
+    array_fleets: bool = False,
+    bitboards: bool = False,
+    record_dir: Path | None = None,
+) -> MatchResult:
+    """
+    Play one match without a display, each player driven by a named policy.
+    With record_dir the replay is saved there as <seed>.replay.
+    """
+    started = time.perf_counter()
+    engine = GameEngine(
+        level.width,
+        level.height,
+        level.starting_zones,
+        ships_per_player=ships_per_player,
+        array_fleets=array_fleets,
+        seed=seed,
+        bitboards=bitboards,
+        terrain=level.data,
+        teams=level.teams,
+    )
+    # with more players than policies, the policies are reused in turn
+    players = {
+        p: POLICIES[policies[i % len(policies)]]() for i, p in enumerate(engine.players)
+    }
+
+    while engine.winner is None and engine.turn <= max_turns:
+        player = engine.current_player
+        players[player].play_turn(engine, player)
+        if engine.winner is None:
+            engine.next_turn()
+
+    result = MatchResult(
+        seed=seed,
+        winner=engine.winner.name if engine.winner else None,
+        turns=engine.turn,
+        wall_time=time.perf_counter() - started,
+        state_hash=engine.state_hash(),
+    )
+    logger.debug(f"Match finished: {result}")
+    if record_dir is not None:
+        Replay.from_engine(engine, level).save(record_dir / f"{seed}.replay")
+    return result
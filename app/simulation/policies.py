@@ -0,0 +1,74 @@
+import logging
+from typing import Protocol
+
+from app.engine.engine import GameEngine
+from app.engine.player import Player
+from app.engine.ship import Ship
+from app.simulation.search import SearchPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class Policy(Protocol):
+    """Plays a whole turn for the current player of the engine"""
+
+    def play_turn(self, engine: GameEngine, player: Player) -> None: ...
+
+
+class IdlePolicy:
+    def play_turn(self, engine: GameEngine, player: Player) -> None:
+        pass
+
+
+class GreedyPolicy:
+    """
+    Scripted player: every ship shoots the weakest enemy in range,
+    otherwise closes in on the nearest enemy and tries again.
+    """
+
+    def play_turn(self, engine: GameEngine, player: Player) -> None:
+        for ship in list(engine.ships[player]):
+            if engine.winner is not None:
+                return
+            self._attack(engine, ship)
+            if ship.attacks_left == 0 or engine.winner is not None:
+                continue
+            self._approach(engine, ship)
+            self._attack(engine, ship)
+
+    @staticmethod
+    def _attack(engine: GameEngine, ship: Ship) -> None:
+        while ship.attacks_left > 0 and engine.winner is None:
+            x, y = ship.position.x, ship.position.y
+            in_range = [
+                e
+                for e in engine.get_all_enemy_ships()
+                if ship.selected_weapon.covers(
+                    ship.facing, e.position.x - x, e.position.y - y
+                )
+                and engine.los.is_visible(ship.position, e.position)
+            ]
+            if not in_range:
+                return
+            target = min(in_range, key=lambda e: e.current_hp)
+            engine.try_attack_ship(ship, target.position)
+
+    @staticmethod
+    def _approach(engine: GameEngine, ship: Ship) -> None:
+        enemies = engine.get_all_enemy_ships()
+        if not enemies or ship.active_moves == 0:
+            return
+        nearest = min(enemies, key=lambda e: ship.position.distance(e.position))
+        destinations = engine.find_all_destinations_by_ship(ship)
+        if not destinations:
+            return
+        best = min(destinations, key=lambda d: d.distance(nearest.position))
+        if best != ship.position:
+            engine.move_ship(ship, best)
+
+
+POLICIES: dict[str, type[Policy]] = {
+    "idle": IdlePolicy,
+    "greedy": GreedyPolicy,
+    "search": SearchPolicy,
+}
@@ -0,0 +1,97 @@
+import json
+import logging
+import struct
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from app.engine.engine import GameEngine
+from app.engine.journal import Action, ActionType
+from app.level.level import Level
+from app.utils.math import V2
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SARP"
+VERSION = 1
+# seed, ships per player, array fleets, level json size
+HEADER = struct.Struct("<qH?I")
+# action type, a.x, a.y, b.x, b.y
+ACTION = struct.Struct("<B4H")
+
+
+@dataclass
+class Replay:
+    """Everything needed to play a match again: seed, level and actions"""
+
+    seed: int
+    level: Level
+    ships_per_player: int = 1
+    array_fleets: bool = False
+    actions: list[Action] = field(default_factory=list)
+
+    @classmethod
+    def from_engine(cls, engine: GameEngine, level: Level) -> "Replay":
+        return cls(
+            seed=engine.seed,
+            level=level,
+            ships_per_player=engine.ships_per_player,
+            array_fleets=engine.array_fleets,
+            actions=engine.journal.actions(),
+        )
+
+    def create_engine(self) -> GameEngine:
+        return GameEngine(
+            self.level.width,
+            self.level.height,
+            self.level.starting_zones,
+            ships_per_player=self.ships_per_player,
+            array_fleets=self.array_fleets,
+            seed=self.seed,
+            terrain=self.level.data,
+            teams=self.level.teams,
+        )
+
+    def play(self, engine: GameEngine | None = None) -> GameEngine:
+        """Plays every action as fast as possible"""
+        engine = engine or self.create_engine()
+        for action in self.actions:
+            engine.apply_action(action)
+        return engine
+
+    def to_bytes(self) -> bytes:
+        level = json.dumps(asdict(self.level)).encode()
+        actions = b"".join(
+            ACTION.pack(a.type, a.a.x, a.a.y, a.b.x, a.b.y) for a in self.actions
+        )
+        payload = (
+            HEADER.pack(self.seed, self.ships_per_player, self.array_fleets, len(level))
+            + level
+            + actions
+        )
+        return MAGIC + bytes([VERSION]) + zlib.compress(payload, 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        if data[:4] != MAGIC:
+            raise ValueError("Not a replay file")
+        if data[4] != VERSION:
+            raise ValueError(f"Unsupported replay version: {data[4]}")
+        payload = zlib.decompress(data[5:])
+        seed, ships_per_player, array_fleets, level_size = HEADER.unpack_from(payload)
+        offset = HEADER.size
+        level = Level(**json.loads(payload[offset : offset + level_size]))
+        offset += level_size
+        actions = [
+            Action(ActionType(t), V2(ax, ay), V2(bx, by))
+            for t, ax, ay, bx, by in ACTION.iter_unpack(payload[offset:])
+        ]
+        return cls(seed, level, ships_per_player, array_fleets, actions)
+
+    def save(self, path: Path) -> None:
+        path.write_bytes(self.to_bytes())
+        logger.info(f"Replay with {len(self.actions)} actions saved to {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> "Replay":
+        return cls.from_bytes(path.read_bytes())
@@ -0,0 +1,292 @@
+import heapq
+import logging
+import math
+import time
+from array import array
+from collections.abc import Callable
+from typing import NamedTuple
+
+from app.engine.cache import LRUCache
+from app.engine.engine import GameEngine
+from app.engine.player import Player
+from app.engine.ship import Ship
+from app.utils.constants import AI_TURN_BUDGET_MS
+from app.utils.math import V2
+
+logger = logging.getLogger(__name__)
+
+SHIP_VALUE = 20  # a kill is worth more than the damage that made it
+WIN_SCORE = 1_000_000
+APPROACH_WEIGHT = 0.1  # per cell between a ship and the enemy fleet center
+THREAT_WEIGHT = 0.25  # per hp a ship could lose during the enemy turn
+
+
+class Order(NamedTuple):
+    """What one ship does this turn: move, then shoot, target first"""
+
+    ship: Ship
+    destination: V2
+    target: V2 | None
+
+
+class _Timeout(Exception):
+    pass
+
+
+class SearchPolicy:
+    """
+    Computer player. A turn is planned one ship order at a time, each order
+    picked by an iterative deepening search over the orders of the next
+    ships within its share of the turn's time budget. Only the most
+    promising ships and orders are searched, ranked by reach and weapon
+    range queries. Positions reached again through another order of the
+    same moves are looked up in a transposition table keyed by the engine
+    state hash.
+    """
+
+    def __init__(
+        self,
+        time_budget: float = AI_TURN_BUDGET_MS / 1000,  # seconds
+        max_depth: int = 3,
+        ships_width: int = 2,
+        orders_width: int = 4,
+        table_size: int = 2**16,
+        clock: Callable[[], float] = time.perf_counter,  # seconds
+    ):
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.ships_width = ships_width
+        self.orders_width = orders_width
+        self.table: LRUCache[float] = LRUCache(maxsize=table_size)
+        self.clock = clock
+        self.nodes = 0
+        # enemy threat at the start of the turn, see _evaluate
+        self._threat: array | None = None
+
+    def play_turn(self, engine: GameEngine, player: Player) -> None:
+        started = self.clock()
+        deadline = started + self.time_budget
+        # values are only comparable within a turn, the player is the same
+        self.table.clear()
+        self.nodes = 0
+        # own moves barely change what the enemy can reach, the map of the
+        # turn start is good enough for the whole turn
+        self._threat = array("i", engine.get_threat_map(player))
+        pending = list(engine.ships[player])
+        while pending and engine.winner is None:
+            now = self.clock()
+            if now >= deadline:
+                # out of time, the remaining ships only shoot what is in range
+                for ship in pending:
+                    self._shoot(engine, ship, None)
+                break
+            order = self._choose(
+                engine, player, pending, now + (deadline - now) / len(pending)
+            )
+            if order is None:
+                break
+            self._play(engine, order)
+            pending = [s for s in pending if s is not order.ship]
+        logger.debug(
+            f"{player} planned its turn in {self.clock() - started:.3f}s, "
+            f"{self.nodes} nodes, table hit rate {self.table.hit_rate:.2f}"
+        )
+
+    def _choose(
+        self, engine: GameEngine, player: Player, pending: list[Ship], deadline: float
+    ) -> Order | None:
+        orders = self._orders(engine, player, pending)
+        if not orders:
+            return None
+        # the best ranked order stands if not even depth 1 fits in time
+        best = orders[0]
+        with engine.events.suspended():
+            for depth in range(1, min(self.max_depth, len(pending)) + 1):
+                try:
+                    best = self._search_root(
+                        engine, player, pending, orders, depth, deadline
+                    )
+                except _Timeout:
+                    break
+        return best
+
+    def _search_root(
+        self,
+        engine: GameEngine,
+        player: Player,
+        pending: list[Ship],
+        orders: list[Order],
+        depth: int,
+        deadline: float,
+    ) -> Order:
+        best_score, best = -math.inf, orders[0]
+        for order in orders:
+            score = self._score_after(engine, player, pending, order, depth, deadline)
+            if score > best_score:
+                best_score, best = score, order
+        return best
+
+    def _score_after(
+        self,
+        engine: GameEngine,
+        player: Player,
+        pending: list[Ship],
+        order: Order,
+        depth: int,
+        deadline: float,
+    ) -> float:
+        if self.clock() > deadline:
+            raise _Timeout
+        self.nodes += 1
+        mark = len(engine.journal)
+        self._play(engine, order)
+        try:
+            rest = [s for s in pending if s is not order.ship]
+            return self._value(engine, player, rest, depth - 1, deadline)
+        finally:
+            while len(engine.journal) > mark:
+                engine.undo()
+
+    def _value(
+        self,
+        engine: GameEngine,
+        player: Player,
+        pending: list[Ship],
+        depth: int,
+        deadline: float,
+    ) -> float:
+        if depth == 0 or not pending or engine.winner is not None:
+            return self._evaluate(engine, player)
+        key = (engine.state_hash(), frozenset(map(id, pending)), depth)
+        # a timeout inside compute leaves nothing in the table
+        return self.table.get_or_compute(
+            key,
+            lambda: max(
+                (
+                    self._score_after(engine, player, pending, o, depth, deadline)
+                    for o in self._orders(engine, player, pending)
+                ),
+                default=self._evaluate(engine, player),
+            ),
+        )
+
+    def _orders(
+        self, engine: GameEngine, player: Player, pending: list[Ship]
+    ) -> list[Order]:
+        """Orders of the most urgent pending ships, best ranked first"""
+        enemies = [s for p in engine.get_enemies(player) for s in engine.ships[p]]
+        if not enemies:
+            return []
+        armed = {
+            id(ship)
+            for ship, targets in engine.find_targets_by_player(player)
+            if targets
+        }
+        # ships that can already shoot come first, then those that still can
+        ships = sorted(
+            pending,
+            key=lambda s: (id(s) not in armed, s.selected_weapon.attacks_left == 0),
+        )
+        orders = []
+        for ship in ships[: self.ships_width]:
+            orders.extend(self._ship_orders(engine, ship, enemies))
+        return orders
+
+    def _ship_orders(
+        self, engine: GameEngine, ship: Ship, enemies: list[Ship]
+    ) -> list[Order]:
+        # destination -> weakest enemy the ship could shoot from there
+        if ship.selected_weapon.attacks_left > 0:
+            firing_cells = engine.find_firing_cells_by_ship(ship, enemies)
+        else:
+            firing_cells = {}
+        nearest = min(enemies, key=lambda e: ship.position.distance(e.position))
+
+        def rank(destination: V2) -> tuple:
+            target = firing_cells.get(destination)
+            approach = destination.distance(nearest.position)
+            if target is None:
+                return (1, 0, approach)
+            return (0, target.current_hp, approach)
+
+        if ship.active_moves > 0:
+            destinations = engine.find_all_destinations_by_ship(ship)
+        else:
+            destinations = [ship.position]
+        orders = []
+        for destination in heapq.nsmallest(self.orders_width, destinations, key=rank):
+            target = firing_cells.get(destination)
+            orders.append(Order(ship, destination, target.position if target else None))
+        return orders
+
+    def _play(self, engine: GameEngine, order: Order) -> None:
+        if order.destination != order.ship.position:
+            engine.move_ship(order.ship, order.destination)
+        self._shoot(engine, order.ship, order.target)
+
+    @staticmethod
+    def _shoot(engine: GameEngine, ship: Ship, target: V2 | None) -> None:
+        weapon = ship.selected_weapon
+        while weapon.attacks_left > 0 and engine.winner is None:
+            if target is None or not SearchPolicy._is_enemy(engine, target):
+                target = SearchPolicy._weakest_target(engine, ship)
+                if target is None:
+                    return
+            attacks_left = weapon.attacks_left
+            engine.try_attack_ship(ship, target)
+            if weapon.attacks_left == attacks_left:
+                return
+
+    @staticmethod
+    def _is_enemy(engine: GameEngine, position: V2) -> bool:
+        ship_player = engine.get_ship_at(position)
+        return ship_player is not None and engine.is_enemy(
+            ship_player[1], engine.current_player
+        )
+
+    @staticmethod
+    def _weakest_target(engine: GameEngine, ship: Ship) -> V2 | None:
+        x, y = ship.position
+        weakest = None
+        for dx, dy in ship.selected_weapon.stencil(ship.facing):
+            ship_player = engine.get_ship_at(V2(x + dx, y + dy))
+            if ship_player is None or not engine.is_enemy(
+                ship_player[1], engine.current_player
+            ):
+                continue
+            if not engine.los.is_visible(ship.position, ship_player[0].position):
+                continue
+            if weakest is None or ship_player[0].current_hp < weakest.current_hp:
+                weakest = ship_player[0]
+        return weakest.position if weakest else None
+
+    def _evaluate(self, engine: GameEngine, player: Player) -> float:
+        if engine.winner is not None:
+            if engine.is_enemy(engine.winner, player):
+                return -WIN_SCORE
+            return WIN_SCORE
+        score = 0.0
+        enemy_x = enemy_y = enemy_count = 0
+        for p, ships in engine.ships.items():
+            if p == player:
+                score += sum(SHIP_VALUE + s.current_hp for s in ships)
+            elif engine.is_enemy(p, player):
+                score -= sum(SHIP_VALUE + s.current_hp for s in ships)
+                for s in ships:
+                    enemy_x += s.position.x
+                    enemy_y += s.position.y
+                enemy_count += len(ships)
+        if enemy_count:
+            cx, cy = enemy_x / enemy_count, enemy_y / enemy_count
+            score -= APPROACH_WEIGHT * sum(
+                abs(s.position.x - cx) + abs(s.position.y - cy)
+                for s in engine.ships[player]
+            )
+        # ships killed during the turn still count as a danger
+        if self._threat is not None:
+            threat, width = self._threat, engine.width
+            score -= THREAT_WEIGHT * sum(
+                min(threat[s.position.y * width + s.position.x], s.current_hp)
+                for s in engine.ships[player]
+            )
+        return score
@@ -0,0 +1,51 @@
+import pygame
+
+from app.utils.constants import SCROLL_SPEED
+from app.utils.math import V2
+
+
+class Camera:
+    """
+    View of the level shown in the game area. Everything drawn keeps its
+    level pixel coordinates, the view is only applied at draw time.
+    Scrolling moves a target the view glides to, a few pixels per frame.
+    """
+
+    def __init__(
+        self,
+        area: pygame.Rect,
+        level_width: int,  # in pixels
+        level_height: int,  # in pixels
+        speed: int = SCROLL_SPEED,
+    ):
+        self.area = area
+        self.speed = speed
+        self.max_view = V2(max(level_width - area.w, 0), max(level_height - area.h, 0))
+        self.view = V2(0, 0)  # level pixel at the top left of the area
+        self.target = V2(0, 0)
+
+    def scroll(self, dx: int, dy: int) -> None:
+        x = min(max(self.target.x + dx, 0), self.max_view.x)
+        y = min(max(self.target.y + dy, 0), self.max_view.y)
+        self.target = V2(x, y)
+
+    def update(self) -> bool:
+        """Moves the view toward the target, True if it moved"""
+        if self.view == self.target:
+            return False
+        dx = min(max(self.target.x - self.view.x, -self.speed), self.speed)
+        dy = min(max(self.target.y - self.view.y, -self.speed), self.speed)
+        self.view = V2(self.view.x + dx, self.view.y + dy)
+        return True
+
+    @property
+    def world_rect(self) -> pygame.Rect:
+        """Level pixels in view"""
+        return pygame.Rect(self.view.x, self.view.y, self.area.w, self.area.h)
+
+    def to_screen(self, rect: pygame.Rect) -> pygame.Rect:
+        return rect.move(self.area.x - self.view.x, self.area.y - self.view.y)
+
+    def to_world(self, x: int, y: int) -> V2:
+        """Level pixel under a screen pixel"""
+        return V2(x - self.area.x + self.view.x, y - self.area.y + self.view.y)
@@ -1,25 +1,88 @@
-from pygame.sprite import Group
+from pygame import Rect
+from pygame.sprite import Group, Sprite
+
+from app.sprites.camera import Camera
+from app.utils.math import V2
+
+BLOCK_TILES = 8  # sprites are indexed by blocks of BLOCK_TILES x BLOCK_TILES cells
 
 
 class CameraGroup(Group):
+    """
+    Sprites at level pixel coordinates, one per cell, drawn through a
+    camera. They are indexed by their cell and its block of the level,
+    drawing only looks at the blocks in view, so its cost follows the
+    number of sprites on screen rather than in the group.
+    """
+
     def __init__(self, *sprites, **kwargs):
+        self.camera: Camera = kwargs.get("camera")
+        self.tile_size: int = kwargs.get("tile_size")
+        # game point -> whether it is visible, everything is by default
+        self.is_visible = kwargs.get("is_visible")
+        self._at: dict[V2, Sprite] = {}
+        self._blocks: dict[tuple[int, int], set[Sprite]] = {}
         super().__init__(*sprites)
-        self.screen_config = kwargs.get("screen_config")
 
-    def draw(self, surface):
-        sprites = [
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._index(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._unindex(sprite)
+
+    def _block(self, point: V2) -> tuple[int, int]:
+        return point.x // BLOCK_TILES, point.y // BLOCK_TILES
+
+    def _index(self, sprite) -> None:
+        self._at[sprite._point] = sprite
+        self._blocks.setdefault(self._block(sprite._point), set()).add(sprite)
+
+    def _unindex(self, sprite) -> None:
+        if self._at.get(sprite._point) is sprite:
+            del self._at[sprite._point]
+        self._blocks.get(self._block(sprite._point), set()).discard(sprite)
+
+    def cell_center(self, point: V2) -> tuple[int, int]:
+        """Level pixel at the center of a cell"""
+        half = self.tile_size // 2
+        return point.x * self.tile_size + half, point.y * self.tile_size + half
+
+    def sprite_at(self, point: V2) -> Sprite | None:
+        return self._at.get(point)
+
+    def move_sprite(self, sprite, point: V2) -> None:
+        self._unindex(sprite)
+        sprite._point = point
+        sprite.rect.center = self.cell_center(point)
+        self._index(sprite)
+
+    def in_view(self) -> list[Sprite]:
+        view = self.camera.world_rect
+        block_size = BLOCK_TILES * self.tile_size
+        # a sprite may stick out of its cell by up to a cell
+        left = max(view.left // block_size - 1, 0)
+        top = max(view.top // block_size - 1, 0)
+        right = (view.right - 1) // block_size + 1
+        bottom = (view.bottom - 1) // block_size + 1
+        blocks = self._blocks
+        return [
             s
-            for s in self.sprites()
-            if self.screen_config.is_in_game_area(*s.rect.center)
+            for bx in range(left, right + 1)
+            for by in range(top, bottom + 1)
+            for s in blocks.get((bx, by), ())
+            if s.rect.colliderect(view)
+            and (self.is_visible is None or self.is_visible(s._point))
         ]
-        if hasattr(surface, "blits"):
-            self.spritedict.update(
-                zip(sprites, surface.blits((spr.image, spr.rect) for spr in sprites))
-            )
-        else:
-            for spr in sprites:
-                self.spritedict[spr] = surface.blit(spr.image, spr.rect)
-        self.lostsprites = []
-        dirty = self.lostsprites
 
-        return dirty
+    def draw(self, surface) -> list[Rect]:
+        sprites = self.in_view()
+        to_screen = self.camera.to_screen
+        clip = surface.get_clip()
+        surface.set_clip(self.camera.area.clip(clip))
+        rects = surface.blits((s.image, to_screen(s.rect)) for s in sprites)
+        surface.set_clip(clip)
+        self.spritedict.update(zip(sprites, rects))
+        self.lostsprites = []
+        return rects
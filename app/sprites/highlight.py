@@ -0,0 +1,55 @@
+from collections.abc import Collection
+
+import pygame
+
+from app.utils.math import V2
+from app.utils.point_converter import PointConverter
+
+
+class Highlight:
+    """
+    Cells filled with one color, rendered once into a translucent surface
+    covering their bounding box. It is rendered again only when given
+    another collection of cells, every frame only blits it.
+    """
+
+    def __init__(self, point_converter: PointConverter, color: tuple[int, int, int]):
+        self.point_converter = point_converter
+        self.color = color
+        self.cells: Collection[V2] | None = None
+        self.surface: pygame.Surface | None = None
+        self.origin = V2(0, 0)  # level pixels of the surface's top left
+
+    def update(self, cells: Collection[V2]) -> None:
+        # the game state hands out the same set until it is recomputed
+        if cells is self.cells:
+            return
+        self.cells = cells
+        if not cells:
+            self.surface = None
+            return
+        left = min(c.x for c in cells)
+        top = min(c.y for c in cells)
+        right = max(c.x for c in cells)
+        bottom = max(c.y for c in cells)
+        size = self.point_converter.cell_size
+        self.surface = pygame.Surface(
+            ((right - left + 1) * size, (bottom - top + 1) * size), pygame.SRCALPHA
+        )
+        # the grid lines on the top and left of each cell stay visible
+        xs, ys = self.point_converter.to_pixels(cells, origin=V2(left, top))
+        for x, y in zip(xs, ys):
+            self.surface.fill(self.color, (x + 1, y + 1, size - 1, size - 1))
+        self.origin = V2(left * size, top * size)
+
+    def draw(self, screen: pygame.Surface, area: pygame.Rect, view: V2) -> None:
+        """Blits the cells seen from view (level pixels) into area"""
+        if self.surface is None:
+            return
+        clip = screen.get_clip()
+        screen.set_clip(area.clip(clip))
+        screen.blit(
+            self.surface,
+            (area.x + self.origin.x - view.x, area.y + self.origin.y - view.y),
+        )
+        screen.set_clip(clip)
@@ -1,13 +1,15 @@
-from pathlib import Path
 import pygame
 
-from app.utils.math import V2
+from app.utils.assets import assets
+from app.utils.math import Direction, V2
+
+# one image per facing, shared by every ship sprite
+SHIP_IMAGES = [f"fighter_{direction.value}.png" for direction in Direction]
 
 
 class ShipSprite(pygame.sprite.Sprite):
-    def __init__(self, point: V2, position: V2, direction: str):
+    def __init__(self, point: V2, position: V2, direction: Direction):
         super().__init__()
-        img_path = Path("app", "assets", "img", f"fighter_{direction}.png")
-        self.image = pygame.image.load(img_path).convert_alpha()
+        self.image = assets.image(f"fighter_{direction.value}.png")
         self.rect = self.image.get_rect(center=position.as_tuple())
         self._point = point
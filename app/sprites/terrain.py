@@ -0,0 +1,83 @@
+import pygame
+
+from app.engine.cache import LRUCache
+from app.level.level import TileType
+from app.utils.constants import ASTEROID_GREY, GREY
+from app.utils.math import V2
+
+CHUNK_TILES = 16  # a chunk is CHUNK_TILES x CHUNK_TILES tiles
+# enough chunks to cover any screen a few times over, the others are
+# rendered again if the camera comes back to them
+CHUNK_CACHE_SIZE = 64
+
+# fill of each tile type, tiles without one only get the grid lines
+TILE_COLORS = {TileType.ASTEROID: ASTEROID_GREY}
+
+
+class TerrainLayer:
+    """
+    Level tiles and grid lines, rendered once into chunk surfaces.
+    A frame only blits the chunks in view, a chunk is rendered again
+    only when one of its tiles changes.
+    """
+
+    def __init__(self, tiles: list[list[str]], tile_size: int):
+        # rows of tiles, copied so they can change with the game
+        self.tiles = [list(row) for row in tiles]
+        self.height = len(self.tiles)
+        self.width = len(self.tiles[0]) if self.tiles else 0
+        self.tile_size = tile_size
+        self.chunks: LRUCache[pygame.Surface] = LRUCache(maxsize=CHUNK_CACHE_SIZE)
+
+    def set_tile(self, point: V2, tile: TileType) -> None:
+        self.tiles[point.y][point.x] = tile
+        self.chunks.discard((point.x // CHUNK_TILES, point.y // CHUNK_TILES))
+
+    def draw(self, screen: pygame.Surface, area: pygame.Rect, view: V2) -> None:
+        """
+        Blits the terrain seen from view (level pixels) into area, only
+        the chunks inside the current clip of the screen.
+        """
+        clip = screen.get_clip()
+        shown = area.clip(clip)
+        if not shown:
+            return
+        chunk_size = CHUNK_TILES * self.tile_size
+        left = view.x + shown.x - area.x
+        top = view.y + shown.y - area.y
+        first_x, first_y = max(left // chunk_size, 0), max(top // chunk_size, 0)
+        last_x = min((left + shown.w - 1) // chunk_size, self._last_chunk(self.width))
+        last_y = min((top + shown.h - 1) // chunk_size, self._last_chunk(self.height))
+        screen.set_clip(shown)
+        screen.blits(
+            (
+                self.chunks.get_or_compute((cx, cy), lambda: self._render(cx, cy)),
+                (
+                    area.x + cx * chunk_size - view.x,
+                    area.y + cy * chunk_size - view.y,
+                ),
+            )
+            for cy in range(first_y, last_y + 1)
+            for cx in range(first_x, last_x + 1)
+        )
+        screen.set_clip(clip)
+
+    @staticmethod
+    def _last_chunk(tiles: int) -> int:
+        return (tiles - 1) // CHUNK_TILES
+
+    def _render(self, cx: int, cy: int) -> pygame.Surface:
+        size = self.tile_size
+        left, top = cx * CHUNK_TILES, cy * CHUNK_TILES
+        right = min(left + CHUNK_TILES, self.width)
+        bottom = min(top + CHUNK_TILES, self.height)
+        surface = pygame.Surface(((right - left) * size, (bottom - top) * size))
+        for y in range(top, bottom):
+            row = self.tiles[y]
+            for x in range(left, right):
+                rect = ((x - left) * size, (y - top) * size, size, size)
+                color = TILE_COLORS.get(row[x])
+                if color is not None:
+                    surface.fill(color, rect)
+                pygame.draw.rect(surface, GREY, rect, width=1)
+        return surface
@@ -7,11 +7,13 @@ class UIElement(ABC):
     """
     Base class for all UI elements
     use build() to initialize the placement of the element
+    update() sets dirty, draw() is then needed to show the change
     """
 
     rect: pygame.Rect
     font: pygame.font.Font | None
     height: int
+    dirty: bool = True  # changed since it was last drawn
 
     def draw(self, screen: pygame.Surface):
         raise NotImplementedError
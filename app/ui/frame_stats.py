@@ -0,0 +1,47 @@
+import pygame
+
+from app.ui.base import UIElement
+from app.utils.constants import BLACK, WHITE
+from app.utils.profiler import FrameProfiler
+
+SECTIONS_SHOWN = 6
+
+
+class FrameStats(UIElement):
+    """Frame time percentiles and the slowest sections, drawn over the game"""
+
+    def __init__(self, profiler: FrameProfiler):
+        self.profiler = profiler
+        self.lines: list[pygame.Surface] = []
+        self.bounds = pygame.Rect(0, 0, 0, 0)  # drawn on, background included
+
+    def build(self, font: pygame.font.Font, rect: pygame.Rect) -> None:
+        self.font = font
+        self.rect = rect
+        self.height = rect.height
+
+    def update(self, fps: float = 0.0, **kwargs) -> None:
+        p = self.profiler.percentiles()
+        texts = [
+            f"{fps:.0f} fps",
+            f"p50 {p[50] * 1000:.1f} p95 {p[95] * 1000:.1f} p99 {p[99] * 1000:.1f} ms",
+        ]
+        sections = list(self.profiler.mean_sections().items())[:SECTIONS_SHOWN]
+        texts.extend(f"{name} {seconds * 1000:.2f} ms" for name, seconds in sections)
+        self.lines = [self.font.render(text, True, WHITE) for text in texts]
+        self.bounds = pygame.Rect(
+            self.rect.topleft,
+            (
+                max(line.get_width() for line in self.lines) + 8,
+                sum(line.get_height() for line in self.lines) + 8,
+            ),
+        )
+        self.dirty = True
+
+    def draw(self, screen: pygame.Surface):
+        # opaque, drawing it again over itself changes nothing
+        screen.fill(BLACK, self.bounds)
+        y = self.rect.top + 4
+        for line in self.lines:
+            screen.blit(line, (self.rect.left + 4, y))
+            y += line.get_height()
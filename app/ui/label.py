@@ -22,6 +22,7 @@ class Label(UIElement):
             text: str
         """
         self.text = kwargs.get("text", self.text)
+        self.dirty = True
         if not self.text:
             return
         self.rendered_text = self.font.render(self.text, True, WHITE)
@@ -105,6 +105,7 @@ class Minimap(UIElement):
         self.offset_y = offset_y
         self.allies = allies
         self.enemies = enemies
+        self.dirty = True
         self._update_camera_rect()
         self._update_ships()
 
@@ -1,7 +1,8 @@
 import pygame
 
 from app.ui.base import UIElement
-from app.utils.constants import WHITE
+from app.utils.constants import BLACK, WHITE
+from app.utils.profiler import frame_profiler
 
 
 class VPanel(UIElement):
@@ -21,6 +22,7 @@ class VPanel(UIElement):
         self.update(data=self.data)
 
     def update(self, data: dict[str, UIElement], **kwargs) -> None:
+        self.dirty = True
         if kwargs.get("clear") is True:
             self.data.clear()
             return
@@ -45,10 +47,17 @@ class VPanel(UIElement):
             )
             shift += item.height
 
+    def is_dirty(self) -> bool:
+        return self.dirty or any(item.dirty for item in self.data.values())
+
     def draw(self, screen: pygame.Surface):
+        screen.fill(BLACK, self.rect)
         pygame.draw.rect(screen, WHITE, self.rect, width=2)
         for k, item in self.data.items():
-            item.draw(screen)
+            with frame_profiler.section(type(item).__name__):
+                item.draw(screen)
+            item.dirty = False
+        self.dirty = False
 
     def handle_event(self, event: pygame.Event):
         pass
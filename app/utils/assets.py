@@ -0,0 +1,81 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+IMAGE_DIR = Path("app", "assets", "img")
+
+
+class AssetManager:
+    """
+    Images loaded from disk once and shared by every sprite using them,
+    sprites must never draw on them.
+    Files can be read ahead on a worker thread, converting them to the
+    display format is left to the main thread on first use. With atlas,
+    the images converted together share one surface.
+    """
+
+    def __init__(self, directory: Path = IMAGE_DIR, atlas: bool = False):
+        self.directory = directory
+        self.atlas = atlas
+        self._images: dict[str, pygame.Surface] = {}
+        # name -> image read by a worker, not converted yet
+        self._loading: dict[str, Future[pygame.Surface]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def image(self, name: str) -> pygame.Surface:
+        image = self._images.get(name)
+        if image is None:
+            self.convert([name])
+            image = self._images[name]
+        return image
+
+    def preload(self, names: list[str]) -> None:
+        """Reads the files on a worker thread, for a scene about to start"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="assets"
+            )
+        for name in names:
+            if name not in self._images and name not in self._loading:
+                self._loading[name] = self._executor.submit(self._read, name)
+
+    def convert(self, names: list[str]) -> None:
+        """Makes the images ready to blit, needs the display mode set"""
+        raw = {}
+        for name in names:
+            if name in self._images:
+                continue
+            future = self._loading.pop(name, None)
+            raw[name] = future.result() if future else self._read(name)
+        if not raw:
+            return
+        converted = {name: image.convert_alpha() for name, image in raw.items()}
+        if self.atlas and len(converted) > 1:
+            converted = self._pack(converted)
+        self._images.update(converted)
+        logger.debug(f"Images ready: {', '.join(converted)}")
+
+    def _read(self, name: str) -> pygame.Surface:
+        return pygame.image.load(self.directory / name)
+
+    @staticmethod
+    def _pack(images: dict[str, pygame.Surface]) -> dict[str, pygame.Surface]:
+        """One surface with the images side by side, each a subsurface of it"""
+        width = sum(image.get_width() for image in images.values())
+        height = max(image.get_height() for image in images.values())
+        atlas = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+        packed = {}
+        x = 0
+        for name, image in images.items():
+            atlas.blit(image, (x, 0))
+            packed[name] = atlas.subsurface((x, 0, *image.get_size()))
+            x += image.get_width()
+        return packed
+
+
+# shared by every scene
+assets = AssetManager()
@@ -11,8 +11,16 @@ BLUE = (0, 0, 255)
 LIGHT_GREEN = (82, 97, 82)
 LIGHT_BLUE = (173, 216, 230)
 LIGHT_RED = (255, 176, 156)
+DANGER_RED = (200, 30, 30)
+ASTEROID_GREY = (90, 80, 70)
 
-PLAYER_COLORS = [RED, GREEN, BLUE]
+YELLOW = (255, 255, 0)
+CYAN = (0, 255, 255)
+MAGENTA = (255, 0, 255)
+ORANGE = (255, 165, 0)
+PURPLE = (128, 0, 128)
+
+PLAYER_COLORS = [RED, BLUE, GREEN, YELLOW, CYAN, MAGENTA, ORANGE, PURPLE]
 
 LASER_DAMAGE = 10
 LASER_RANGE = 5
@@ -20,8 +28,15 @@ MISSILE_DAMAGE = 20
 MISSILE_RANGE = 10
 MISSILE_AMMO = 5
 
+SENSOR_RANGE = 9  # cells a ship sees around itself
+
 BORDER_WIDTH = 3
 
+SCROLL_SPEED = 10  # pixels per frame the camera glides at
+
+REPLAY_STEP_MS = 250  # delay between replayed actions
+AI_TURN_BUDGET_MS = 500  # thinking time of a computer player per turn
+
 SCREEN_RESOLUTIONS = [
     (1280, 720),
     (1366, 768),
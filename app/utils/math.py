@@ -1,4 +1,7 @@
-from dataclasses import dataclass
+from array import array
+from collections.abc import Iterable
+from enum import Enum
+from typing import NamedTuple
 
 from pygame import Vector2, Rect
 
@@ -12,18 +15,26 @@ def rect_from_center(center: Vector2, size: Vector2) -> Rect:
     )
 
 
-@dataclass
-class V2:
+class Direction(str, Enum):
+    UP = "up"
+    DOWN = "down"
+    LEFT = "left"
+    RIGHT = "right"
+
+
+class V2(NamedTuple):
+    """
+    Immutable, hashable grid/screen coordinate.
+    Being a tuple it can be used in sets and as a dict key,
+    and compares equal to the plain (x, y) tuple.
+    """
+
     x: int
     y: int
 
     def get_neighbors(self) -> list["V2"]:
-        return [
-            V2(self.x + 1, self.y),
-            V2(self.x - 1, self.y),
-            V2(self.x, self.y + 1),
-            V2(self.x, self.y - 1),
-        ]
+        x, y = self
+        return [V2(x + 1, y), V2(x - 1, y), V2(x, y + 1), V2(x, y - 1)]
 
     def as_vector2(self) -> Vector2:
         return Vector2(self.x, self.y)
@@ -33,26 +44,49 @@ class V2:
 
     def __sub__(self, other: "V2") -> "V2":
         return V2(self.x - other.x, self.y - other.y)
-    
+
     def __floordiv__(self, other: int) -> "V2":
         return V2(self.x // other, self.y // other)
 
+    def __mul__(self, other: "int | V2") -> "V2":
+        if isinstance(other, V2):
+            return V2(self.x * other.x, self.y * other.y)
+        if isinstance(other, int):
+            return V2(self.x * other, self.y * other)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
     def in_range(self, min: "V2", max: "V2") -> bool:
         return min.x <= self.x < max.x and min.y <= self.y < max.y
 
     def distance(self, other: "V2") -> int:
         return abs(self.x - other.x) + abs(self.y - other.y)
 
-    def __eq__(self, other: "V2") -> bool:
-        return self.x == other.x and self.y == other.y
-    
-    def __mul__(self, other):
-        if type(other) == int:
-            return V2(self.x*other, self.y*other)
-        elif type(other) == V2:
-            V2(self.x * other.x, self.y * other.y)
-        else:
-            return self
-
     def as_tuple(self) -> tuple[int, int]:
-        return self.x, self.y
\ No newline at end of file
+        return self.x, self.y
+
+    @staticmethod
+    def interned(x: int, y: int) -> "V2":
+        """Shared instance for coordinates inside the interning table"""
+        if 0 <= x < INTERN_SIZE and 0 <= y < INTERN_SIZE:
+            return _INTERNED[y * INTERN_SIZE + x]
+        return V2(x, y)
+
+    @staticmethod
+    def from_arrays(xs: Iterable[int], ys: Iterable[int]) -> list["V2"]:
+        return list(map(V2, xs, ys))
+
+    @staticmethod
+    def to_arrays(points: Iterable["V2"]) -> tuple[array, array]:
+        xs = array("i")
+        ys = array("i")
+        for x, y in points:
+            xs.append(x)
+            ys.append(y)
+        return xs, ys
+
+
+# covers the cells of the bundled levels, bigger coordinates are allocated
+INTERN_SIZE = 64
+_INTERNED = [V2(x, y) for y in range(INTERN_SIZE) for x in range(INTERN_SIZE)]
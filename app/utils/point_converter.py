@@ -1,4 +1,6 @@
 import logging
+from array import array
+from collections.abc import Iterable
 
 from app.utils.math import V2
 from app.utils.config import ScreenConfig
@@ -11,25 +13,22 @@ class PointConverter:
         self.config = config
         self.cell_size = cell_size
 
-    def from_screen_to_game(self, screen_point: V2) -> V2:
-        r = screen_point - V2(*self.config.game_area.topleft)
-        r //= self.cell_size
-        return V2(r.x, r.y)
-
-    def from_game_to_screen(
-        self, game_point: V2, center: bool = True
-    ) -> V2:
-        v = game_point * self.cell_size + V2(*self.config.game_area.topleft)
-        if center:
-            v.x += self.cell_size // 2
-            v.y += self.cell_size // 2
-
-        return v
+    def to_pixels(
+        self, points: Iterable[V2], origin: V2 = V2(0, 0), center: bool = False
+    ) -> tuple[array, array]:
+        """Pixel coordinates of many cells at once, relative to origin's cell"""
+        size = self.cell_size
+        shift = size // 2 if center else 0
+        ox, oy = origin
+        xs = array("i")
+        ys = array("i")
+        for x, y in points:
+            xs.append((x - ox) * size + shift)
+            ys.append((y - oy) * size + shift)
+        return xs, ys
 
     @staticmethod
-    def from_game_to_minimap(
-        x: int, y: int, cell_size: int, game_point: V2
-    ) -> V2:
+    def from_game_to_minimap(x: int, y: int, cell_size: int, game_point: V2) -> V2:
         s_x = cell_size * game_point.x + x + cell_size // 2
         s_y = cell_size * game_point.y + y + cell_size // 2
         return V2(s_x, s_y)
@@ -0,0 +1,78 @@
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+FRAME_HISTORY = 600  # frames kept, 10 seconds at 60 fps
+
+
+class FrameProfiler:
+    """
+    Time spent per frame in named sections (runner phases, UI elements),
+    kept for the last frames in a ring buffer. Sections may nest, each
+    one counts its own time and that of the sections inside it.
+    """
+
+    def __init__(self, capacity: int = FRAME_HISTORY):
+        # {"scene", "start", "time", "sections": {name: seconds}} per frame
+        self.frames: deque[dict] = deque(maxlen=capacity)
+        self._scene = ""
+        self._started = 0.0
+        self._sections: dict[str, float] = {}
+
+    def start_frame(self, scene: str) -> None:
+        self._scene = scene
+        self._sections = {}
+        self._started = time.perf_counter()
+
+    def end_frame(self) -> None:
+        self.frames.append(
+            {
+                "scene": self._scene,
+                "start": self._started,
+                "time": time.perf_counter() - self._started,
+                "sections": self._sections,
+            }
+        )
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            sections = self._sections
+            sections[name] = sections.get(name, 0.0) + time.perf_counter() - started
+
+    def percentiles(self, ranks: tuple[int, ...] = (50, 95, 99)) -> dict[int, float]:
+        """Frame time (seconds) below which each rank percent of frames fall"""
+        times = sorted(frame["time"] for frame in self.frames)
+        if not times:
+            return dict.fromkeys(ranks, 0.0)
+        return {r: times[min(len(times) * r // 100, len(times) - 1)] for r in ranks}
+
+    def mean_sections(self) -> dict[str, float]:
+        """Mean seconds per frame of each section, slowest first"""
+        totals: dict[str, float] = {}
+        for frame in self.frames:
+            for name, seconds in frame["sections"].items():
+                totals[name] = totals.get(name, 0.0) + seconds
+        count = len(self.frames) or 1
+        return {
+            name: total / count
+            for name, total in sorted(totals.items(), key=lambda t: -t[1])
+        }
+
+    def dump(self, path: Path) -> None:
+        with open(path, "w") as file:
+            json.dump(list(self.frames), file, indent=2)
+        logger.info(f"{len(self.frames)} frame timings written to {path}")
+
+
+# shared by the runner, the scenes and their UI elements
+frame_profiler = FrameProfiler()
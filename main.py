@@ -1,5 +1,9 @@
 import argparse
-from app.run import run_game
+import sys
+from pathlib import Path
+
+from app.run import run_benchmark, run_game, run_headless, run_replay_headless
+from app.simulation.benchmark import MAX_SLOWDOWN
 
 
 if __name__ == "__main__":
@@ -11,9 +15,93 @@ if __name__ == "__main__":
         help="Enable debug logging",
     )
     parser.add_argument("-r", help="Format is 1024x768")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Simulate matches without a display",
+    )
+    parser.add_argument("--matches", type=int, default=1, help="Headless only")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first match")
+    parser.add_argument("--workers", type=int, help="Default is the CPU count")
+    parser.add_argument("--output", type=Path, help="JSON file for match results")
+    parser.add_argument(
+        "--policies",
+        nargs=2,
+        default=["greedy", "greedy"],
+        help="Policy of each player: idle, greedy or search",
+    )
+    parser.add_argument("--ships", type=int, default=1, help="Ships per player")
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument(
+        "--array-fleets",
+        action="store_true",
+        help="Store fleets as arrays, for very large battles",
+    )
+    parser.add_argument(
+        "--bitboards",
+        action="store_true",
+        help="Big-int bitboards for moves, faster searches on small levels",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        help="Replay file to play, as fast as possible with --headless",
+    )
+    parser.add_argument(
+        "--record", type=Path, help="Directory to save replays of played matches"
+    )
+    parser.add_argument(
+        "--ai", action="store_true", help="Let the computer play Player 2"
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=Path,
+        metavar="BASELINE",
+        help="Time the engine against a JSON baseline, created if missing",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Benchmark only, overwrite the baseline with the new timings",
+    )
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=MAX_SLOWDOWN,
+        help="Benchmark only, slowest allowed ratio to the baseline",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Benchmark only, a few small cases"
+    )
     args = parser.parse_args()
-    res = None
-    if args.r is not None:
-        sp = args.r.split("x")
-        res = (int(sp[0]), int(sp[1]))
-    run_game(args.debug, res)
+    if args.benchmark:
+        passed = run_benchmark(
+            args.benchmark,
+            args.debug,
+            save=args.save_baseline,
+            max_slowdown=args.max_slowdown,
+            quick=args.quick,
+        )
+        sys.exit(0 if passed else 1)
+    elif args.headless and args.replay:
+        run_replay_headless(args.replay, args.debug)
+    elif args.headless:
+        run_headless(
+            args.debug,
+            matches=args.matches,
+            seed=args.seed,
+            workers=args.workers,
+            output=args.output,
+            policies=tuple(args.policies),
+            ships_per_player=args.ships,
+            max_turns=args.max_turns,
+            array_fleets=args.array_fleets,
+            bitboards=args.bitboards,
+            record_dir=args.record,
+        )
+    else:
+        res = None
+        if args.r is not None:
+            sp = args.r.split("x")
+            res = (int(sp[0]), int(sp[1]))
+        run_game(args.debug, res, args.replay, args.record, (1,) if args.ai else ())
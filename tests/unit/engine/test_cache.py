@@ -0,0 +1,30 @@
+from app.engine.cache import LRUCache
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache: LRUCache[int] = LRUCache(maxsize=2)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value
+
+    assert cache.get_or_compute("a", lambda: compute(1)) == 1
+    assert cache.get_or_compute("a", lambda: compute(2)) == 1
+
+    assert calls == [1]
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate == 0.5
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache: LRUCache[str] = LRUCache(maxsize=2)
+    cache.get_or_compute("a", lambda: "a")
+    cache.get_or_compute("b", lambda: "b")
+    cache.get_or_compute("a", lambda: "a")  # "b" is now the oldest
+    cache.get_or_compute("c", lambda: "c")
+
+    assert len(cache) == 2
+    assert cache.get_or_compute("a", lambda: "new") == "a"
+    assert cache.get_or_compute("b", lambda: "new") == "new"
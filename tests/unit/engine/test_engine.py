@@ -2,6 +2,8 @@ import pytest
 from app.engine.engine import GameEngine, generate_random_ships
 from app.utils.math import V2
 from app.engine.ship import Ship
+from app.engine.weapons import Laser
+from app.simulation.policies import GreedyPolicy
 
 
 def test_generate_random_ships():
@@ -46,3 +48,215 @@ def test_gameengine_create():
     assert engine.max_point == V2(w, h)  # ????
     assert len(engine.players) > 1
     assert len(engine.players) == len(engine.ships.keys())
+
+
+def test_generate_random_ships_unique_positions():
+    ships = generate_random_ships(V2(0, 0), V2(1, 1), 4)
+
+    assert sorted(s.position.as_tuple() for s in ships) == [
+        (0, 0),
+        (0, 1),
+        (1, 0),
+        (1, 1),
+    ]
+
+
+def make_engine() -> GameEngine:
+    engine = GameEngine(5, 5, [[(0, 0), (4, 0)], [(0, 4), (4, 4)]])
+    for ship in engine.get_all_ships():
+        engine.remove_ship(ship)
+    return engine
+
+
+def test_occupancy_lookups():
+    engine = make_engine()
+    p1, p2 = engine.players
+    ally = Ship(position=V2(1, 1), weapons=[Laser()])
+    enemy = Ship(position=V2(3, 3), weapons=[Laser()])
+    engine.add_ship(ally, p1)
+    engine.add_ship(enemy, p2)
+
+    assert engine.find_current_player_ship_by_pos(V2(1, 1)) is ally
+    assert engine.find_current_player_ship_by_pos(V2(3, 3)) is None
+    assert engine.find_enemy_ship_by_pos(V2(3, 3)) == (enemy, p2)
+    assert engine.find_enemy_ship_by_pos(V2(1, 1)) is None
+    assert engine.get_player_by_ship(enemy) == p2
+    stranger = Ship(position=V2(1, 1), weapons=[Laser()])
+    assert engine.get_player_by_ship(stranger) is None
+
+    with pytest.raises(ValueError):
+        engine.add_ship(Ship(position=V2(1, 1), weapons=[Laser()]), p2)
+
+
+def test_occupancy_follows_moves_and_kills():
+    engine = make_engine()
+    p1, p2 = engine.players
+    ally = Ship(position=V2(1, 1), weapons=[Laser()])
+    enemy = Ship(position=V2(1, 3), weapons=[Laser()], current_hp=5)
+    engine.add_ship(ally, p1)
+    engine.add_ship(enemy, p2)
+    engine.add_ship(Ship(position=V2(4, 4), weapons=[Laser()]), p2)
+
+    assert V2(1, 3) not in engine.find_all_destinations_by_ship(ally)
+
+    engine.move_ship(ally, V2(1, 2))
+    assert engine.get_ship_at(V2(1, 1)) is None
+    assert engine.get_ship_at(V2(1, 2)) == (ally, p1)
+
+    engine.try_attack_ship(ally, V2(1, 3))
+    assert engine.get_ship_at(V2(1, 3)) is None
+    assert enemy not in engine.ships[p2]
+
+
+def test_ships_of_other_players_take_no_orders():
+    engine = make_engine()
+    p1, p2 = engine.players
+    ship = Ship(position=V2(1, 1), weapons=[Laser()])
+    ally = Ship(position=V2(1, 2), weapons=[Laser()])
+    engine.add_ship(ship, p1)
+    engine.add_ship(ally, p1)
+    engine.add_ship(Ship(position=V2(4, 4), weapons=[Laser()]), p2)
+    engine.next_turn()
+
+    engine.move_ship(ship, V2(2, 1))
+    # the ally is an enemy of the current player
+    engine.try_attack_ship(ship, ally.position)
+
+    assert ship.position == V2(1, 1)
+    assert ally.current_hp == ally.hp
+    assert len(engine.journal) == 1
+
+
+def test_reach_cache_invalidated_by_moves():
+    engine = make_engine()
+    p1, p2 = engine.players
+    ally = Ship(position=V2(1, 1), weapons=[Laser()])
+    engine.add_ship(ally, p1)
+    engine.add_ship(Ship(position=V2(4, 4), weapons=[Laser()]), p2)
+
+    engine.find_all_destinations_by_ship(ally)
+    assert engine.is_ship_move_possible(ally, V2(1, 2))
+    assert (engine.reach_cache.hits, engine.reach_cache.misses) == (1, 1)
+
+    version = engine.occupancy_version
+    engine.move_ship(ally, V2(1, 2))
+    assert engine.occupancy_version == version + 1
+
+    engine.find_all_destinations_by_ship(ally)
+    assert (engine.reach_cache.hits, engine.reach_cache.misses) == (2, 2)
+
+
+def test_find_targets_by_player():
+    engine = make_engine()
+    p1, p2 = engine.players
+    near = Ship(position=V2(0, 0), weapons=[Laser(range=1)])
+    far = Ship(position=V2(4, 0), weapons=[Laser(range=1)])
+    tired = Ship(position=V2(2, 2), weapons=[Laser(range=4)])
+    tired.selected_weapon.attacks_left = 0
+    target = Ship(position=V2(0, 1), weapons=[Laser(range=1)])
+    for ship in (near, far, tired):
+        engine.add_ship(ship, p1)
+    engine.add_ship(target, p2)
+
+    targets = engine.find_targets_by_player(p1)
+
+    assert targets == [(near, [target]), (far, [])]
+    assert engine.find_targets_by_player(p2) == [(target, [near])]
+
+
+def test_find_path_shares_corridors():
+    engine = make_engine()
+    p1, p2 = engine.players
+    back = Ship(position=V2(0, 0), weapons=[Laser()])
+    front = Ship(position=V2(0, 1), weapons=[Laser()])
+    engine.add_ship(back, p1)
+    engine.add_ship(front, p1)
+    engine.add_ship(Ship(position=V2(1, 0), weapons=[Laser()]), p2)
+    engine.add_ship(Ship(position=V2(1, 1), weapons=[Laser()]), p2)
+
+    path = engine.find_path(back, V2(2, 2))
+
+    # through the ally in front, around the enemies
+    assert path == [V2(0, 0), V2(0, 1), V2(0, 2), V2(1, 2), V2(2, 2)]
+    assert len(path) - 1 == engine.get_move_cost(back, V2(2, 2))
+    assert engine.find_path(back, V2(1, 1)) is None
+
+    misses = engine.path_cache.misses
+    assert engine.find_path(front, V2(2, 2)) == path[1:]
+    assert engine.path_cache.misses == misses
+
+    engine.move_ship(front, V2(0, 3))
+    assert engine.find_path(back, V2(2, 2)) == path
+    assert engine.path_cache.misses == misses + 1
+
+
+FOUR_ZONES = [[(0, 0), (9, 0)], [(0, 9), (9, 9)], [(0, 2), (0, 7)], [(9, 2), (9, 7)]]
+
+
+def test_players_come_from_starting_zones():
+    engine = GameEngine(10, 10, FOUR_ZONES, 2, seed=1)
+
+    assert [p.name for p in engine.players] == [f"Player {i}" for i in range(1, 5)]
+    assert len({p.color for p in engine.players}) == 4
+    facings = [engine.ships[p][0].facing.value for p in engine.players]
+    assert facings == ["down", "up", "right", "left"]
+    assert len(engine.get_all_enemy_ships()) == 6
+
+
+def test_free_for_all_skips_eliminated_players():
+    engine = GameEngine(10, 10, FOUR_ZONES, 2, seed=3)
+    policy = GreedyPolicy()
+
+    while engine.winner is None:
+        assert len(engine.ships[engine.current_player]) > 0
+        policy.play_turn(engine, engine.current_player)
+        if engine.winner is None:
+            engine.next_turn()
+
+    alive = [p for p in engine.players if len(engine.ships[p])]
+    assert alive == [engine.winner]
+
+
+def test_allies_win_together():
+    engine = GameEngine(10, 10, FOUR_ZONES, 1, seed=1, teams=[0, 1, 0, 1])
+    p1, p2, p3, p4 = engine.players
+
+    assert not engine.is_enemy(p1, p3) and engine.is_enemy(p1, p4)
+    assert engine.get_allies(p1) == (p1, p3)
+    ally = engine.ships[p3][0]
+    assert engine.find_enemy_ship_by_pos(ally.position) is None
+
+    for player in (p2, p4):
+        engine.remove_ship(engine.ships[player][0])
+    assert engine.is_game_over()
+    assert engine.winner == p1
+
+    engine.add_ship(Ship(position=V2(5, 5), weapons=[Laser()]), p4)
+    engine.set_winner(None)
+    assert not engine.is_game_over()
+
+
+def test_bitboards_find_the_same_moves():
+    engines = [
+        GameEngine(10, 10, FOUR_ZONES, ships_per_player=3, seed=5, bitboards=b)
+        for b in (False, True)
+    ]
+    for engine in engines:
+        player = engine.players[0]
+        GreedyPolicy().play_turn(engine, player)
+        engine.next_turn()
+
+    for ships, other in zip(*(e.ships.values() for e in engines)):
+        for ship, twin in zip(ships, other):
+            enemies, twin_enemies = (
+                [s for p in e.get_enemies(e.current_player) for s in e.ships[p]]
+                for e in engines
+            )
+            destinations = engines[0].find_all_destinations_by_ship(ship)
+            # same order too, policies break ties by it
+            assert destinations == engines[1].find_all_destinations_by_ship(twin)
+            firing = engines[0].find_firing_cells_by_ship(ship, enemies)
+            twin_firing = engines[1].find_firing_cells_by_ship(twin, twin_enemies)
+            assert {c: t.current_hp for c, t in firing.items()} == {
+                c: t.current_hp for c, t in twin_firing.items()
+            }
@@ -0,0 +1,84 @@
+import gc
+
+from app.engine.events import EventBus
+
+
+class Listener:
+    def __init__(self):
+        self.calls = []
+
+    def on_event(self, *args):
+        self.calls.append(args)
+
+    def on_refresh(self, *args):
+        self.calls.append(("refresh", *args))
+
+
+def test_events_are_delivered_on_flush():
+    bus = EventBus()
+    listener = Listener()
+    bus.subscribe("moved", listener.on_event)
+
+    bus.publish("moved", 1)
+    bus.publish("moved", 2)
+    assert listener.calls == []
+    assert bus.pending() == 2
+
+    bus.flush()
+    assert listener.calls == [(1,), (2,)]
+    assert bus.stats["Listener.on_event"].calls == 2
+
+
+def test_coalescing_handler_is_called_once_per_flush():
+    bus = EventBus()
+    listener = Listener()
+    bus.subscribe("moved", listener.on_refresh, coalesce=True)
+    bus.subscribe("destroyed", listener.on_refresh, coalesce=True)
+
+    bus.publish("moved", 1)
+    bus.publish("destroyed", 2)
+    bus.publish("moved", 3)
+    bus.flush()
+
+    assert listener.calls == [("refresh", 3)]
+
+
+def test_immediate_delivery():
+    bus = EventBus(deferred=False)
+    listener = Listener()
+    bus.subscribe("moved", listener.on_event)
+
+    bus.publish("moved", 1)
+
+    assert listener.calls == [(1,)]
+
+
+def test_subscriptions_are_weak_and_removable():
+    bus = EventBus()
+    kept = Listener()
+    dropped = Listener()
+    bus.subscribe("moved", kept.on_event)
+    bus.subscribe("moved", dropped.on_event)
+    bus.subscribe("moved", kept.on_refresh)
+
+    del dropped
+    gc.collect()
+    bus.unsubscribe("moved", kept.on_refresh)
+    bus.publish("moved", 1)
+    bus.flush()
+
+    assert kept.calls == [(1,)]
+    assert len(bus._subscriptions["moved"]) == 1
+
+
+def test_suspended_bus_drops_events():
+    bus = EventBus()
+    listener = Listener()
+    bus.subscribe("moved", listener.on_event)
+
+    with bus.suspended():
+        bus.publish("moved", 1)
+    bus.publish("moved", 2)
+    bus.flush()
+
+    assert listener.calls == [(2,)]
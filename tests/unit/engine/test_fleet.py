@@ -0,0 +1,65 @@
+import pytest
+
+from app.engine.fleet import Fleet
+from app.engine.ship import Ship
+from app.engine.weapons import Laser
+from app.utils.math import V2
+
+
+def make_fleet(n: int) -> Fleet:
+    fleet = Fleet()
+    for i in range(n):
+        fleet.add(Ship(position=V2(i, 0), weapons=[Laser()], speed=3 + i))
+    return fleet
+
+
+def test_fleet_ship_is_a_view():
+    fleet = make_fleet(2)
+    ship = fleet[1]
+
+    ship.position = V2(5, 6)
+    ship.current_hp -= 30
+    ship.selected_weapon.attacks_left -= 1
+
+    assert fleet.positions() == [V2(0, 0), V2(5, 6)]
+    assert fleet.current_hp[1] == 70
+    assert ship.attacks_left == 0
+    assert "Laser" in ship.infodump()
+
+
+def test_fleet_reset_turn():
+    fleet = make_fleet(3)
+    for ship in fleet:
+        ship.active_moves = 0
+        ship.selected_weapon.attacks_left = 0
+
+    fleet.reset_turn()
+
+    assert [s.active_moves for s in fleet] == [3, 4, 5]
+    assert all(s.attacks_left == 1 for s in fleet)
+
+
+def test_fleet_remove_keeps_views_valid():
+    fleet = make_fleet(3)
+    first, second, last = fleet
+
+    fleet.remove(first)
+
+    assert len(fleet) == 2
+    assert first not in fleet
+    assert first.position == V2(0, 0)  # detached, keeps its last state
+    assert last.position == V2(2, 0)
+    assert [s.speed for s in fleet] == [4, 5]
+    assert second.row == 0
+    with pytest.raises(ValueError):
+        fleet.remove(first)
+
+
+def test_fleet_apply_damage():
+    fleet = make_fleet(2)
+    fleet[0].current_hp = 5
+
+    destroyed = fleet.apply_damage(list(fleet), 10)
+
+    assert destroyed == [fleet[0]]
+    assert fleet[1].current_hp == 90
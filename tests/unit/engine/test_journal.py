@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from app.engine.engine import GameEngine
+from app.simulation.policies import GreedyPolicy
+
+
+def snapshot(engine: GameEngine) -> tuple:
+    return (
+        engine.turn,
+        engine.current_player,
+        engine.winner,
+        tuple(
+            (p, s.position, s.current_hp, s.active_moves, s.attacks_left)
+            for p, ships in engine.ships.items()
+            for s in ships
+        ),
+    )
+
+
+def play(array_fleets: bool) -> tuple[GameEngine, list[tuple]]:
+    """Plays a greedy match, returns the snapshot at the start of every turn"""
+    random.seed(3)
+    engine = GameEngine(
+        8, 8, [[(0, 0), (7, 1)], [(0, 6), (7, 7)]], 4, array_fleets=array_fleets
+    )
+    policy = GreedyPolicy()
+    snapshots = [snapshot(engine)]
+    while engine.winner is None:
+        policy.play_turn(engine, engine.current_player)
+        if engine.winner is None:
+            engine.next_turn()
+            snapshots.append(snapshot(engine))
+    return engine, snapshots
+
+
+@pytest.mark.parametrize("array_fleets", [False, True])
+def test_undo_and_redo_everything(array_fleets):
+    engine, snapshots = play(array_fleets)
+    final = snapshot(engine)
+
+    while engine.undo():
+        pass
+    assert snapshot(engine) == snapshots[0]
+    assert engine.get_ship_at(snapshots[0][3][0][1]) is not None
+
+    while engine.redo():
+        pass
+    assert snapshot(engine) == final
+
+
+@pytest.mark.parametrize("array_fleets", [False, True])
+def test_rewind_to_turn(array_fleets):
+    engine, snapshots = play(array_fleets)
+
+    engine.rewind_to_turn(3)
+    assert snapshot(engine) == snapshots[2]
+    engine.rewind_to_turn(len(snapshots))
+    assert snapshot(engine) == snapshots[-1]
+    engine.rewind_to_turn(1)
+    assert snapshot(engine) == snapshots[0]
+
+
+def test_new_action_discards_redo():
+    engine, _ = play(False)
+    engine.rewind_to_turn(1)
+    assert engine.journal.can_redo()
+
+    engine.next_turn()
+
+    assert not engine.journal.can_redo()
+    assert engine.journal.undo_turn() == 1
+
+
+@pytest.mark.parametrize("array_fleets", [False, True])
+def test_state_hash_follows_every_change(array_fleets):
+    engine, _ = play(array_fleets)
+    hashes = {engine.state_hash()}
+
+    assert engine.state_hash() == engine.compute_state_hash()
+    while engine.undo():
+        assert engine.state_hash() == engine.compute_state_hash()
+        hashes.add(engine.state_hash())
+    # different states along the match, same hash once back at the start
+    assert len(hashes) > 10
+    start = engine.state_hash()
+    while engine.redo():
+        pass
+    engine.rewind_to_turn(1)
+    assert engine.state_hash() == start
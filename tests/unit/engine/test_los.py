@@ -0,0 +1,68 @@
+import itertools
+import random
+
+from app.engine.engine import GameEngine
+from app.engine.los import LineOfSight, ray
+from app.engine.ship import Ship
+from app.engine.weapons import Laser
+from app.level.level import TileType
+from app.utils.math import V2
+
+
+def test_ray_is_symmetric():
+    for dx, dy in itertools.product(range(-6, 7), repeat=2):
+        back = {(x + dx, y + dy) for x, y in ray(-dx, -dy)}
+        assert set(ray(dx, dy)) == back
+    assert ray(3, 1) == ((1, 0), (2, 1))
+    assert ray(2, 2) == ((1, 1),)
+
+
+def test_visibility_is_symmetric_and_cached():
+    los = LineOfSight(12, 12)
+    rng = random.Random(5)
+    for _ in range(20):
+        los.set_blocking(V2(rng.randrange(12), rng.randrange(12)), True)
+
+    for a, b in itertools.combinations(
+        [V2(rng.randrange(12), rng.randrange(12)) for _ in range(30)], 2
+    ):
+        assert los.is_visible(a, b) == los.is_visible(b, a)
+        offsets = los.visible_offsets(a, 11)
+        assert ((b.x - a.x, b.y - a.y) in offsets) == los.is_visible(a, b)
+
+
+def test_terrain_change_drops_only_nearby_origins():
+    los = LineOfSight(30, 30)
+    assert los.visible_offsets(V2(2, 2), 3) is None
+
+    los.set_blocking(V2(3, 2), True)
+    far = los.visible_offsets(V2(20, 20), 3)
+    near = los.visible_offsets(V2(2, 2), 3)
+
+    assert far is None
+    assert (2, 0) not in near and (1, 0) in near
+    los.set_blocking(V2(25, 25), True)
+    assert los.visible_offsets(V2(2, 2), 3) is near
+
+
+def test_asteroids_block_moves_and_attacks():
+    terrain = [[TileType.SPACE.value] * 5 for _ in range(5)]
+    terrain[2][2] = TileType.ASTEROID.value
+    engine = GameEngine(5, 5, [[(0, 0), (4, 0)], [(0, 4), (4, 4)]], terrain=terrain)
+    for ship in engine.get_all_ships():
+        engine.remove_ship(ship)
+    p1, p2 = engine.players
+    attacker = engine.add_ship(Ship(position=V2(2, 1), weapons=[Laser()]), p1)
+    target = engine.add_ship(Ship(position=V2(2, 3), weapons=[Laser()]), p2)
+
+    assert V2(2, 2) not in engine.find_all_destinations_by_ship(attacker)
+    assert V2(2, 3) not in engine.find_attack_range_by_ship(attacker)
+    assert V2(0, 3) in engine.find_attack_range_by_ship(attacker)
+    assert engine.find_targets_by_player(p1) == [(attacker, [])]
+
+    engine.try_attack_ship(attacker, V2(2, 3))
+    assert target.current_hp == target.hp
+
+    engine.set_tile(V2(2, 2), TileType.SPACE)
+    engine.try_attack_ship(attacker, V2(2, 3))
+    assert target.current_hp < target.hp
@@ -0,0 +1,103 @@
+import random
+
+from app.engine.reachability import BitboardGrid, ReachabilityGrid
+from app.utils.math import V2
+
+
+def test_flood_is_a_clipped_diamond_on_empty_grid():
+    grid = ReachabilityGrid(5, 5)
+
+    reach = grid.flood(V2(0, 0), 2)
+
+    assert sorted(c.as_tuple() for c in reach.cells()) == [
+        (0, 0),
+        (0, 1),
+        (0, 2),
+        (1, 0),
+        (1, 1),
+        (2, 0),
+    ]
+    assert V2(-1, 0) not in reach
+    assert V2(2, 1) not in reach
+
+
+def test_flood_goes_around_hostile_cells():
+    grid = ReachabilityGrid(5, 5)
+    grid.occupy(V2(2, 1), 2)  # enemy right above the origin
+    grid.occupy(V2(2, 3), 1)  # ally right below the origin
+
+    reach = grid.flood(V2(2, 2), 4, friendly_slots=(1,))
+
+    assert V2(2, 1) not in reach
+    assert reach.distance(V2(2, 0)) == 4
+    assert reach.distance(V2(2, 4)) == 2
+    assert reach.distance(V2(2, 2)) == 0
+
+
+def test_flood_without_friendly_slots_ignores_ships():
+    grid = ReachabilityGrid(5, 5)
+    grid.occupy(V2(2, 1), 2)
+
+    reach = grid.flood(V2(2, 2), 1)
+
+    assert len(reach) == 5
+    assert reach.distance(V2(2, 1)) == 1
+
+
+def test_find_path_goes_around_hostile_cells():
+    grid = ReachabilityGrid(5, 5)
+    for x in range(4):
+        grid.occupy(V2(x, 2), 2)  # enemy wall with a gap on the right
+    grid.occupy(V2(0, 1), 1)  # ally on the way
+
+    path = grid.find_path(V2(0, 0), V2(0, 4), friendly_slots=(1,))
+
+    assert path[0] == V2(0, 0) and path[-1] == V2(0, 4)
+    assert len(path) - 1 == 12
+    assert all(a.distance(b) == 1 for a, b in zip(path, path[1:]))
+    assert V2(4, 2) in path
+    assert grid.find_path(V2(0, 0), V2(1, 2), friendly_slots=(1,)) is None
+
+
+def test_find_path_without_a_way():
+    grid = ReachabilityGrid(3, 3)
+    for x in range(3):
+        grid.occupy(V2(x, 1), 2)
+
+    assert grid.find_path(V2(0, 0), V2(2, 2), friendly_slots=(1,)) is None
+    assert len(grid.find_path(V2(0, 0), V2(2, 2))) == 5
+
+
+def test_bitboard_flood_matches_byte_flood():
+    rng = random.Random(3)
+    grids = ReachabilityGrid(12, 9), BitboardGrid(12, 9)
+    for _ in range(40):
+        point = V2(rng.randrange(12), rng.randrange(9))
+        slot = rng.choice((1, 2, 255))
+        for grid in grids:
+            grid.occupy(point, slot)
+    for _ in range(5):
+        point = V2(rng.randrange(12), rng.randrange(9))
+        for grid in grids:
+            grid.vacate(point)
+
+    for origin in (V2(0, 0), V2(11, 4), V2(5, 8), V2(6, 3)):
+        for budget in (0, 1, 4, 30):
+            reach, bits = (g.flood(origin, budget, friendly_slots=(1,)) for g in grids)
+            assert set(bits.cells()) == set(reach.cells())
+            assert all(bits.distance(c) == reach.distance(c) for c in reach.cells())
+            assert set(grids[1].free_cells(bits, origin)) == set(
+                grids[0].free_cells(reach, origin)
+            )
+
+
+def test_bitboard_flood_does_not_wrap_rows():
+    grid = BitboardGrid(4, 3)
+    for y in range(3):
+        grid.occupy(V2(1, y), 2)  # wall between the first column and the rest
+
+    reach = grid.flood(V2(3, 0), 10, friendly_slots=(1,))
+
+    assert len(reach) == 6
+    assert V2(0, 1) not in reach
+    assert grid.range_bits(V2(0, 0), frozenset({(-1, 0), (1, 0)})) == 1 << 1
@@ -0,0 +1,31 @@
+import pytest
+
+from app.engine.stencils import RangeShape, get_stencil
+from app.utils.math import Direction
+
+
+@pytest.mark.parametrize(
+    "shape, radius, min_range, size",
+    [
+        (RangeShape.DIAMOND, 2, 0, 13),
+        (RangeShape.SQUARE, 2, 0, 25),
+        (RangeShape.RING, 2, 2, 8),
+        (RangeShape.CONE, 2, 0, 4),
+    ],
+)
+def test_stencil_sizes(shape, radius, min_range, size):
+    assert len(get_stencil(shape, radius, min_range)) == size
+
+
+def test_cone_points_where_the_ship_faces():
+    up = get_stencil(RangeShape.CONE, 3, facing=Direction.UP)
+    right = get_stencil(RangeShape.CONE, 3, facing=Direction.RIGHT)
+
+    assert (0, -3) in up
+    assert (0, 3) not in up
+    assert (0, 0) not in up
+    assert right == {(-dy, dx) for dx, dy in up}
+
+
+def test_stencils_are_shared():
+    assert get_stencil(RangeShape.DIAMOND, 5) is get_stencil(RangeShape.DIAMOND, 5)
@@ -0,0 +1,61 @@
+from app.engine.engine import GameEngine
+from app.engine.reachability import ReachabilityGrid
+from app.engine.stencils import RangeShape, get_stencil
+from app.engine.threat import ThreatMap, cover
+from app.simulation.policies import GreedyPolicy
+from app.utils.math import Direction, V2
+
+
+def test_cover_matches_brute_force():
+    grid = ReachabilityGrid(12, 9)
+    grid.occupy(V2(4, 3), 2)
+    reach = grid.flood(V2(3, 3), 3, friendly_slots=(1,))
+    stencil = get_stencil(RangeShape.CONE, 3, facing=Direction.LEFT)
+
+    expected = {
+        (c.y + dy) * 12 + c.x + dx
+        for c in reach.cells()
+        for dx, dy in stencil
+        if 0 <= c.x + dx < 12 and 0 <= c.y + dy < 9
+    }
+
+    assert sorted(cover(reach, stencil, 12, 9)) == sorted(expected)
+
+
+def rebuilt(engine: GameEngine, player) -> list[int]:
+    threats = engine.threats
+    fresh = ThreatMap(engine.grid, threats._ships, threats._allied_slots)
+    slot = engine._slots[player]
+    return [
+        sum(values)
+        for values in zip(
+            *(fresh.layer(s) for s in engine._slots.values() if s != slot)
+        )
+    ]
+
+
+def test_threat_map_stays_in_sync():
+    engine = GameEngine(10, 10, [[(0, 0), (9, 1)], [(0, 8), (9, 9)]], 6, seed=4)
+    p1, p2 = engine.players
+    policy = GreedyPolicy()
+
+    for _ in range(6):
+        assert list(engine.get_threat_map(p1)) == rebuilt(engine, p1)
+        assert list(engine.get_threat_map(p2)) == rebuilt(engine, p2)
+        policy.play_turn(engine, engine.current_player)
+        engine.next_turn()
+
+    engine.rewind_to_turn(1)
+    assert list(engine.get_threat_map(p2)) == rebuilt(engine, p2)
+
+
+def test_threat_at_counts_every_attack():
+    engine = GameEngine(30, 30, [[(0, 0), (0, 0)], [(29, 29), (29, 29)]], seed=1)
+    p1, p2 = engine.players
+    enemy = engine.ships[p2][0]
+    weapon = enemy.selected_weapon
+    reach = enemy.speed + weapon.range
+
+    assert engine.get_threat_at(p1, V2(29, 29 - reach)) == weapon.damage
+    assert engine.get_threat_at(p1, V2(29, 28 - reach)) == 0
+    assert engine.get_threat_at(p2, V2(29, 29 - reach)) == 0
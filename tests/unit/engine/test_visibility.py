@@ -0,0 +1,48 @@
+import pytest
+
+from app.engine.engine import GameEngine
+from app.engine.ship import Ship
+from app.engine.weapons import Laser
+from app.simulation.policies import GreedyPolicy
+from app.utils.math import V2
+
+
+def seen_cells(engine: GameEngine, player) -> set[V2]:
+    return {
+        V2(x, y)
+        for ship in engine.ships[player]
+        for x in range(engine.width)
+        for y in range(engine.height)
+        if ship.position.distance(V2(x, y)) <= ship.sensor_range
+    }
+
+
+@pytest.mark.parametrize("array_fleets", [False, True])
+def test_visibility_follows_moves_and_kills(array_fleets):
+    engine = GameEngine(
+        20, 20, [[(0, 0), (19, 1)], [(0, 18), (19, 19)]], 5, array_fleets, seed=2
+    )
+    policy = GreedyPolicy()
+
+    while engine.winner is None and engine.turn < 12:
+        for player in engine.players:
+            seen = seen_cells(engine, player)
+            assert all(
+                engine.is_visible(player, V2(x, y)) == (V2(x, y) in seen)
+                for x in range(20)
+                for y in range(20)
+            )
+        policy.play_turn(engine, engine.current_player)
+        engine.next_turn()
+
+
+def test_only_visible_enemies_are_listed():
+    engine = GameEngine(30, 30, [[(0, 0), (0, 0)], [(29, 29), (29, 29)]], seed=1)
+    p1, p2 = engine.players
+    scout = Ship(position=V2(29, 20), weapons=[Laser()], sensor_range=9)
+    engine.add_ship(scout, p1)
+
+    assert engine.get_visible_enemy_positions(p1) == [V2(29, 29)]
+    engine.remove_ship(scout)
+    assert engine.get_visible_enemy_positions(p1) == []
+    assert not engine.is_visible(p1, V2(29, 20))
@@ -0,0 +1,52 @@
+import os
+
+import pygame
+import pytest
+
+from app.engine.engine import GameEngine
+from app.level.level import Level, TileType
+from app.scenes.game import GameScene
+from app.utils.config import ScreenConfig
+from app.utils.constants import CELL_SIZE
+
+SIZE = 30
+
+
+@pytest.fixture(scope="session")
+def screen_config() -> ScreenConfig:
+    # scenes draw on the display surface, no window is needed for that
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.init()
+    config = ScreenConfig(1280, 720)
+    pygame.display.set_mode(config.window_size)
+    return config
+
+
+@pytest.fixture
+def level() -> Level:
+    data = [[TileType.SPACE for _ in range(SIZE)] for _ in range(SIZE)]
+    for x in range(10, 14):
+        data[15][x] = TileType.ASTEROID
+    return Level(
+        tile_size=CELL_SIZE,
+        height=SIZE,
+        width=SIZE,
+        starting_zones=[[(0, 0), (SIZE - 1, 2)], [(0, SIZE - 3), (SIZE - 1, SIZE - 1)]],
+        data=data,
+    )
+
+
+@pytest.fixture
+def make_scene(screen_config, level):
+    def make(ships_per_player: int = 4) -> GameScene:
+        engine = GameEngine(
+            level.width,
+            level.height,
+            level.starting_zones,
+            ships_per_player=ships_per_player,
+            seed=0,
+            terrain=level.data,
+        )
+        return GameScene(engine, screen_config, level)
+
+    return make
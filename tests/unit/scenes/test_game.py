@@ -0,0 +1,95 @@
+import pygame
+
+from app.engine.ship import Ship
+from app.engine.weapons import Laser
+from app.utils.math import V2
+
+
+# one tile down and right, then back
+SCROLLS = ((pygame.K_DOWN, pygame.K_RIGHT), (pygame.K_UP, pygame.K_LEFT))
+
+
+def click(scene, monkeypatch, point: V2) -> None:
+    pos = scene.cell_rect(point).center
+    monkeypatch.setattr(pygame.mouse, "get_pos", lambda: pos)
+    scene.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+
+def press(scene, key: int) -> None:
+    scene.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+
+def test_next_turn_drops_the_selection_before_the_events_flush(make_scene, monkeypatch):
+    scene = make_scene(ships_per_player=0)
+    engine = scene.game_engine
+    p1, p2 = engine.players
+    ship = Ship(position=V2(8, 0), weapons=[Laser()])
+    engine.add_ship(ship, p1)
+    engine.add_ship(Ship(position=V2(20, 20), weapons=[Laser()]), p2)
+    scene.update()
+
+    click(scene, monkeypatch, ship.position)
+    assert scene.game_state.selected_ship is ship
+    # space and a click in the same frame, NEXT_TURN isn't delivered yet
+    press(scene, pygame.K_SPACE)
+    click(scene, monkeypatch, V2(8, 1))
+
+    assert engine.current_player == p2
+    assert not scene.game_state.is_ship_selected()
+    assert ship.position == V2(8, 0)
+    assert ship.active_moves == ship.speed
+
+
+def redraw(scene) -> bytes:
+    """Frames until the camera stops, the screen they leave"""
+    scene.update()
+    scene.draw()
+    while scene.camera.view != scene.camera.target:
+        scene.update()
+        scene.draw()
+    return pygame.image.tobytes(scene.screen, "RGB")
+
+
+def test_incremental_redraw_matches_a_full_one(make_scene, monkeypatch):
+    scene = make_scene(ships_per_player=0)
+    engine = scene.game_engine
+    p1, p2 = engine.players
+    fleets = {p1: (V2(2, 2), V2(6, 3)), p2: (V2(3, 9), V2(9, 11))}
+    for player, points in fleets.items():
+        for point in points:
+            engine.add_ship(Ship(position=point, weapons=[Laser()]), player)
+    area = scene.screen_config.game_area
+    scene.draw()
+
+    def assert_matches_full_redraw():
+        incremental = redraw(scene)
+        scene.invalidate(None)
+        scene.draw()
+        assert pygame.image.tobytes(scene.screen, "RGB") == incremental
+
+    for turn in range(4):
+        ship = engine.get_all_allied_ships()[0]
+        click(scene, monkeypatch, ship.position)
+        assert_matches_full_redraw()
+        destination = max(
+            p
+            for p in scene.game_state.get_selected_ship_destinations()
+            if area.contains(scene.cell_rect(p))
+        )
+        click(scene, monkeypatch, destination)
+        assert ship.position == destination
+        assert_matches_full_redraw()
+        for key in SCROLLS[turn % 2]:
+            press(scene, key)
+        assert_matches_full_redraw()
+        press(scene, pygame.K_SPACE)
+        assert_matches_full_redraw()
+        # as a computer player would, nothing selected
+        ship = engine.get_all_allied_ships()[-1]
+        engine.move_ship(ship, max(engine.find_all_destinations_by_ship(ship)))
+        assert_matches_full_redraw()
+    press(scene, pygame.K_t)
+    assert_matches_full_redraw()
+
+    # nothing changed, nothing is drawn
+    assert scene.draw() == []
@@ -0,0 +1,14 @@
+import pytest
+
+from app.level.level import Level, TileType
+
+
+@pytest.fixture
+def level() -> Level:
+    return Level(
+        tile_size=50,
+        height=8,
+        width=8,
+        starting_zones=[[(0, 0), (7, 1)], [(0, 6), (7, 7)]],
+        data=[[TileType.SPACE for _ in range(8)] for _ in range(8)],
+    )
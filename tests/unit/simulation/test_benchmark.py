@@ -0,0 +1,29 @@
+from app.simulation.benchmark import (
+    OPERATIONS,
+    BenchCase,
+    compare,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+def test_benchmarks_time_every_operation(tmp_path):
+    case = BenchCase(20, 12, 4, bitboards=True)
+
+    results = run_benchmarks([case], min_time=0.001)
+    save_baseline(tmp_path / "baseline.json", results)
+
+    assert set(results[case.name]) == set(OPERATIONS)
+    assert all(seconds > 0 for seconds in results[case.name].values())
+    assert load_baseline(tmp_path / "baseline.json") == results
+
+
+def test_compare_reports_slowdowns_past_the_threshold():
+    baseline = {"case": {"reach": 1.0, "attack": 1.0}}
+    results = {"case": {"reach": 1.4, "attack": 1.6, "getters": 9.0}}
+
+    regressions = compare(results, baseline, max_slowdown=1.5)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("case attack")
@@ -0,0 +1,41 @@
+from dataclasses import replace
+
+from app.simulation import run_batch, run_match
+
+
+def test_run_match_finishes_with_a_winner(level):
+    result = run_match(level, seed=1, ships_per_player=3)
+
+    assert result.winner in ("Player 1", "Player 2")
+    assert result.turns > 1
+
+
+def test_run_match_respects_turn_limit(level):
+    result = run_match(level, seed=1, policies=("idle", "idle"), max_turns=5)
+
+    assert result.winner is None
+    assert result.turns == 6
+
+
+def test_run_batch_keeps_seed_order(level, tmp_path):
+    output = tmp_path / "results.json"
+
+    results = run_batch(level, seeds=[3, 1, 2], workers=2, output=output)
+
+    assert [r.seed for r in results] == [3, 1, 2]
+    assert output.exists()
+
+
+def test_run_match_with_array_fleets(level):
+    lists = run_match(level, seed=4, ships_per_player=3)
+    arrays = run_match(level, seed=4, ships_per_player=3, array_fleets=True)
+
+    assert (arrays.winner, arrays.turns) == (lists.winner, lists.turns)
+
+
+def test_run_match_with_bitboards(level):
+    grid = run_match(level, seed=11, ships_per_player=8)
+    bitboards = run_match(level, seed=11, ships_per_player=8, bitboards=True)
+
+    # a pure speedup, every move picked is the same
+    assert replace(bitboards, wall_time=grid.wall_time) == grid
@@ -0,0 +1,49 @@
+from app.engine.engine import GameEngine
+from app.engine.journal import Action, ActionType
+from app.simulation import Replay, run_match
+from app.utils.math import V2
+
+
+def ship_states(engine: GameEngine) -> list:
+    return [
+        (s.position, s.current_hp, s.active_moves)
+        for ships in engine.ships.values()
+        for s in ships
+    ]
+
+
+def test_engine_seed_is_deterministic(level):
+    a = GameEngine(level.width, level.height, level.starting_zones, 4, seed=7)
+    b = GameEngine(level.width, level.height, level.starting_zones, 4, seed=7)
+
+    assert ship_states(a) == ship_states(b)
+    assert a.seed == 7
+
+
+def test_replay_roundtrip(level):
+    replay = Replay(
+        seed=2**40,
+        level=level,
+        ships_per_player=3,
+        actions=[
+            Action(ActionType.MOVE, V2(1, 2), V2(3, 4)),
+            Action(ActionType.END_TURN),
+        ],
+    )
+
+    loaded = Replay.from_bytes(replay.to_bytes())
+
+    assert (loaded.seed, loaded.ships_per_player) == (2**40, 3)
+    assert loaded.actions == replay.actions
+    assert loaded.level.width == replay.level.width
+
+
+def test_recorded_match_replays_identically(level, tmp_path):
+    result = run_match(level, seed=5, ships_per_player=3, record_dir=tmp_path)
+
+    replay = Replay.load(tmp_path / "5.replay")
+    engine = replay.play()
+
+    assert engine.winner.name == result.winner
+    assert engine.turn == result.turns
+    assert engine.state_hash() == result.state_hash
@@ -0,0 +1,63 @@
+from app.engine.engine import Event, GameEngine
+from app.engine.journal import ActionType
+from app.simulation import SearchPolicy, run_match
+
+
+def test_search_policy_beats_idle_player(level):
+    result = run_match(level, seed=2, policies=("search", "idle"), ships_per_player=3)
+
+    assert result.winner == "Player 1"
+
+
+class FakeClock:
+    """Moves step seconds forward every time it is read"""
+
+    def __init__(self, step: float):
+        self.step = step
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def test_search_policy_keeps_to_time_budget(level):
+    engine = GameEngine(level.width, level.height, level.starting_zones, 16, seed=1)
+    policy = SearchPolicy(time_budget=0.05, clock=FakeClock(0.001))
+
+    policy.play_turn(engine, engine.current_player)
+
+    # every node reads the clock, the search stops at the deadline
+    assert 0 < policy.nodes < 50
+    assert any(a.type == ActionType.MOVE for a in engine.journal.actions())
+
+
+def test_search_policy_out_of_time_only_shoots(level):
+    engine = GameEngine(level.width, level.height, level.starting_zones, 16, seed=1)
+    policy = SearchPolicy(time_budget=0.05, clock=FakeClock(1.0))
+
+    policy.play_turn(engine, engine.current_player)
+
+    assert policy.nodes == 0
+    assert not any(a.type == ActionType.MOVE for a in engine.journal.actions())
+
+
+def test_search_leaves_only_played_actions(level):
+    engine = GameEngine(level.width, level.height, level.starting_zones, 4, seed=3)
+    moves = []
+
+    def on_moved(*args):
+        moves.append(args)
+
+    engine.subscribe(Event.SHIP_MOVED, on_moved)
+
+    SearchPolicy(time_budget=0.05).play_turn(engine, engine.current_player)
+    engine.events.flush()
+
+    # the search undoes what it tried, only the chosen orders remain
+    actions = engine.journal.actions()
+    assert len(moves) == sum(a.type == ActionType.MOVE for a in actions)
+    replayed = GameEngine(level.width, level.height, level.starting_zones, 4, seed=3)
+    for action in actions:
+        replayed.apply_action(action)
+    assert replayed.state_hash() == engine.state_hash()
@@ -0,0 +1,51 @@
+import pygame
+
+from app.sprites.camera import Camera
+from app.sprites.groups import CameraGroup
+from app.utils.math import V2
+
+
+def make_sprite(point: V2, tile_size: int) -> pygame.sprite.Sprite:
+    sprite = pygame.sprite.Sprite()
+    sprite.image = pygame.Surface((tile_size, tile_size))
+    sprite.rect = sprite.image.get_rect(
+        topleft=(point.x * tile_size, point.y * tile_size)
+    )
+    sprite._point = point
+    return sprite
+
+
+def test_camera_glides_to_its_clamped_target():
+    camera = Camera(pygame.Rect(100, 0, 200, 200), 1000, 300, speed=30)
+
+    camera.scroll(50, 500)
+    assert camera.target == V2(50, 100)
+    assert camera.update() and camera.view == V2(30, 30)
+    assert camera.update() and camera.view == V2(50, 60)
+    while camera.update():
+        pass
+    assert camera.view == V2(50, 100)
+    assert camera.to_screen(pygame.Rect(50, 100, 10, 10)).topleft == (100, 0)
+    assert camera.to_world(100, 0) == V2(50, 100)
+
+
+def test_group_draws_only_sprites_in_view():
+    camera = Camera(pygame.Rect(0, 0, 100, 100), 10_000, 10_000)
+    group = CameraGroup(camera=camera, tile_size=10)
+    for x in range(0, 1000, 3):
+        group.add(make_sprite(V2(x, x), 10))
+
+    assert len(group.in_view()) == 4  # (0, 0) to (9, 9)
+    sprite = group.sprite_at(V2(3, 3))
+    group.move_sprite(sprite, V2(500, 4))
+    assert group.sprite_at(V2(3, 3)) is None
+    assert group.sprite_at(V2(500, 4)) is sprite
+    assert sprite.rect.center == (5005, 45)
+    assert sprite not in group.in_view()
+
+    camera.scroll(4950, 0)
+    while camera.update():
+        pass
+    assert group.in_view() == [sprite]
+    screen = pygame.Surface((100, 100))
+    assert group.draw(screen) == [pygame.Rect(50, 40, 10, 10)]
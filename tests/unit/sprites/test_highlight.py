@@ -0,0 +1,29 @@
+import pygame
+
+from app.sprites.highlight import Highlight
+from app.utils.config import ScreenConfig
+from app.utils.constants import LIGHT_GREEN
+from app.utils.math import V2
+from app.utils.point_converter import PointConverter
+
+
+def test_highlight_renders_once_per_set_of_cells():
+    highlight = Highlight(PointConverter(ScreenConfig(1920, 1080), 10), LIGHT_GREEN)
+    cells = {V2(2, 3), V2(4, 3)}
+
+    highlight.update(cells)
+    surface = highlight.surface
+    highlight.update(cells)
+
+    assert highlight.surface is surface
+    assert surface.get_size() == (30, 10)
+    assert highlight.origin == V2(20, 30)
+
+    screen = pygame.Surface((100, 100))
+    highlight.draw(screen, pygame.Rect(0, 0, 100, 100), V2(10, 10))
+    assert screen.get_at((15, 25))[:3] == LIGHT_GREEN  # cell (2, 3)
+    assert screen.get_at((25, 25))[:3] == (0, 0, 0)  # cell (3, 3)
+    assert screen.get_at((35, 25))[:3] == LIGHT_GREEN  # cell (4, 3)
+
+    highlight.update(set())
+    assert highlight.surface is None
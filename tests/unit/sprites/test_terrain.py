@@ -0,0 +1,42 @@
+import pygame
+
+from app.level.level import TileType
+from app.sprites.terrain import CHUNK_TILES, TILE_COLORS, TerrainLayer
+from app.utils.constants import BLACK
+from app.utils.math import V2
+
+
+def make_terrain(size: int = 40) -> TerrainLayer:
+    tiles = [[TileType.SPACE] * size for _ in range(size)]
+    tiles[1][2] = TileType.ASTEROID
+    return TerrainLayer(tiles, tile_size=4)
+
+
+def test_only_chunks_in_view_are_rendered():
+    terrain = make_terrain()
+    screen = pygame.Surface((100, 100))
+    area = pygame.Rect(10, 10, 60, 60)  # 15 tiles
+
+    terrain.draw(screen, area, V2(0, 0))
+    assert len(terrain.chunks) == 1
+    # asteroid at (2, 1), past the top left grid line
+    assert screen.get_at((10 + 2 * 4 + 1, 10 + 4 + 1))[:3] == TILE_COLORS["A"]
+    assert screen.get_at((5, 5))[:3] == BLACK
+
+    terrain.draw(screen, area, V2(8, 8) * 4)
+    assert len(terrain.chunks) == 4
+    assert terrain.chunks.misses == 4
+
+
+def test_changed_tiles_render_their_chunk_again():
+    terrain = make_terrain()
+    screen = pygame.Surface((200, 200))
+    area = screen.get_rect()
+    terrain.draw(screen, area, V2(0, 0))
+    assert terrain.chunks.misses == 9
+
+    terrain.set_tile(V2(CHUNK_TILES + 1, 0), TileType.ASTEROID)
+    terrain.draw(screen, area, V2(0, 0))
+
+    assert terrain.chunks.misses == 10
+    assert screen.get_at(((CHUNK_TILES + 1) * 4 + 1, 1))[:3] == TILE_COLORS["A"]
@@ -0,0 +1,39 @@
+import os
+
+import pygame
+import pytest
+
+from app.sprites.ship import SHIP_IMAGES
+from app.utils.assets import AssetManager
+
+
+@pytest.fixture
+def display():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+def test_images_are_loaded_once_and_shared(display):
+    assets = AssetManager()
+    assets.preload(SHIP_IMAGES)
+
+    image = assets.image(SHIP_IMAGES[0])
+
+    assert assets.image(SHIP_IMAGES[0]) is image
+    assert image.get_flags() & pygame.SRCALPHA
+
+
+def test_atlas_images_share_one_surface(display):
+    assets = AssetManager(atlas=True)
+    assets.convert(SHIP_IMAGES)
+
+    images = [assets.image(name) for name in SHIP_IMAGES]
+
+    parents = {image.get_parent() for image in images}
+    assert len(parents) == 1 and None not in parents
+    raw = pygame.image.load(assets.directory / SHIP_IMAGES[1])
+    assert images[1].get_size() == raw.get_size()
+    assert images[1].get_at((10, 10)) == raw.convert_alpha().get_at((10, 10))
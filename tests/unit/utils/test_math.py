@@ -0,0 +1,37 @@
+import pytest
+
+from app.utils.math import V2
+
+
+def test_v2_is_hashable_and_immutable():
+    a = V2(1, 2)
+
+    assert {a, V2(1, 2)} == {a}
+    assert {a: "ship"}[(1, 2)] == "ship"
+    with pytest.raises(AttributeError):
+        a.x = 5
+
+
+def test_v2_arithmetic():
+    a = V2(2, 3)
+
+    assert a + V2(1, 1) == V2(3, 4)
+    assert a - V2(1, 1) == V2(1, 2)
+    assert a * 2 == 2 * a == V2(4, 6)
+    assert a * V2(2, 3) == V2(4, 9)
+    assert a // 2 == V2(1, 1)
+    assert a.distance(V2(0, 0)) == 5
+
+
+def test_v2_interned():
+    assert V2.interned(3, 4) is V2.interned(3, 4)
+    assert V2.interned(-1, 4) == V2(-1, 4)
+
+
+def test_v2_array_conversion():
+    points = [V2(1, 2), V2(3, 4)]
+
+    xs, ys = V2.to_arrays(points)
+
+    assert list(xs) == [1, 3]
+    assert V2.from_arrays(xs, ys) == points
@@ -0,0 +1,14 @@
+from app.utils.config import ScreenConfig
+from app.utils.math import V2
+from app.utils.point_converter import PointConverter
+
+
+def test_to_pixels_is_relative_to_the_origin_cell():
+    converter = PointConverter(ScreenConfig(1920, 1080), 50)
+    points = [V2(0, 0), V2(3, 7), V2(29, 1)]
+
+    xs, ys = converter.to_pixels(points, origin=V2(3, 1))
+    assert (list(xs), list(ys)) == ([-150, 0, 1300], [-50, 300, 0])
+
+    xs, ys = converter.to_pixels(points, center=True)
+    assert (list(xs), list(ys)) == ([25, 175, 1475], [25, 375, 75])
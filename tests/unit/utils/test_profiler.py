@@ -0,0 +1,35 @@
+import json
+
+from app.utils.profiler import FrameProfiler
+
+
+def test_frames_keep_section_times_in_a_ring_buffer():
+    profiler = FrameProfiler(capacity=3)
+    for _ in range(5):
+        profiler.start_frame("GameScene")
+        with profiler.section("draw"):
+            with profiler.section("Minimap"):
+                pass
+        with profiler.section("draw"):
+            pass
+        profiler.end_frame()
+
+    assert len(profiler.frames) == 3
+    frame = profiler.frames[-1]
+    assert frame["scene"] == "GameScene"
+    assert set(frame["sections"]) == {"draw", "Minimap"}
+    assert frame["sections"]["draw"] >= frame["sections"]["Minimap"]
+    assert list(profiler.mean_sections()) == ["draw", "Minimap"]
+
+
+def test_percentiles_and_dump(tmp_path):
+    profiler = FrameProfiler()
+    assert profiler.percentiles() == {50: 0.0, 95: 0.0, 99: 0.0}
+    for seconds in range(1, 101):
+        profiler.frames.append(
+            {"scene": "", "start": 0.0, "time": seconds / 1000, "sections": {}}
+        )
+
+    assert profiler.percentiles((50, 99)) == {50: 0.051, 99: 0.1}
+    profiler.dump(tmp_path / "frames.json")
+    assert len(json.loads((tmp_path / "frames.json").read_text())) == 100